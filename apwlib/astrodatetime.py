@@ -32,6 +32,9 @@ __author__ = 'Adrian Price-Whelan <adrn@astro.columbia.edu>'
 #from datetime import datetime, tzinfo, timedelta
 import datetime as py_datetime
 
+# Third-party
+import numpy as np
+
 class GMT0(py_datetime.tzinfo):
     """ This is a tzinfo subclass that represents the timezone in Greenwich,
         or Greenwich Mean Time (GMT+0). 
@@ -47,6 +50,9 @@ class GMT0(py_datetime.tzinfo):
 
 gmt = GMT0()
 
+# The int64 value of NaT (not a time) in a datetime64 array
+_notATime = np.datetime64("NaT", "ns").view(np.int64)
+
 class astrodatetime(py_datetime.datetime):
     """
         astrodatetime is a subclass of Python's datetime.datetime() object that
@@ -64,6 +70,13 @@ class astrodatetime(py_datetime.datetime):
         """ Calculate the Julian Date (JD) using the datetime object """
         return convert.datetimeToJD(self)
     
+    @property
+    def twoPartJD(self):
+        """ Calculate the two-part Julian Date (jd1, jd2) using the datetime object,
+            see: convert.twoPartJD
+        """
+        return convert.datetimeToTwoPartJD(self)
+    
     def lst(self, longitude, longitudeDirection="w", longitudeUnits="degrees", outputHMS=False):
         """ Compute the Local Sidereal Time for the datetime object 
             given the a longitude.
@@ -86,8 +99,10 @@ class astrodatetime(py_datetime.datetime):
         except ValueError:
             raise ValueError("In order to calculate the Local Sidereal Time, you must specify the timezone of the datetime object.\nYou must create a tzinfo() object, and do datetimeObject = datetimeObject.replace(tzinfo=someTimeZone)")
         
-        gmst = convert.datetimeToGMST(utcSelf)
-        return convert.gmstToLST(convert.datetimeToDecimalTime(gmst), longitude, longitudeDirection=longitudeDirection, longitudeUnits=longitudeUnits, outputHMS=outputHMS)
+        lst = convert.jdToLST(convert.datetimeToTwoPartJD(utcSelf), longitude, longitudeDirection=longitudeDirection, longitudeUnits=longitudeUnits)
+        if outputHMS:
+            return convert.hoursToHMS(lst)
+        return lst
     
     @staticmethod
     def fromMJD(mjd):
@@ -140,6 +155,179 @@ class astrodatetime(py_datetime.datetime):
         """ Create an astrodatetime object from a Python datetime object"""
         return astrodatetime(datetimeObj.year, datetimeObj.month, datetimeObj.day, datetimeObj.hour, datetimeObj.minute, datetimeObj.second, datetimeObj.microsecond, tzinfo=datetimeObj.tzinfo)
 
+class AstroTimeArray(object):
+    """
+        AstroTimeArray is an array of UTC times stored as int64 nanoseconds since 
+        1970-01-01 (i.e. a numpy datetime64[ns] array), with the same astronomical
+        properties as astrodatetime computed for the whole array at once. 
+        
+        Indexing with an integer returns an astrodatetime (in GMT), or None for a
+        missing time (NaT), and slicing returns an AstroTimeArray.
+    """
+    
+    def __init__(self, times, timezone=None):
+        """ Create an AstroTimeArray from a numpy datetime64 array (or anything
+            that can be converted to one), taken to be in UTC, or from a sequence
+            of datetime objects, see: AstroTimeArray.fromDatetime.
+        """
+        if isinstance(times, AstroTimeArray):
+            self._ns = times._ns.copy()
+            return
+        
+        if isinstance(times, py_datetime.datetime):
+            times = [times]
+        times = np.asarray(times)
+        if times.dtype == object:
+            times = np.array([_utcDatetime(dt, timezone) for dt in times.flat], dtype="M8[us]").reshape(times.shape)
+        elif timezone is not None:
+            raise ValueError("AstroTimeArray: datetime64 values are in UTC, so a timezone can only be given with datetime objects.")
+        
+        self._ns = times.astype("M8[ns]").view(np.int64)
+    
+    @staticmethod
+    def _fromNanoseconds(ns):
+        """ Create an AstroTimeArray from an int64 array of nanoseconds since 
+            1970-01-01, without copying it.
+        """
+        times = AstroTimeArray.__new__(AstroTimeArray)
+        times._ns = ns
+        return times
+    
+    def __repr__(self):
+        return "<AstroTimeArray {0}>".format(self.datetime64)
+    
+    def __len__(self):
+        return len(self._ns)
+    
+    def __getitem__(self, index):
+        ns = self._ns[index]
+        if np.ndim(ns) == 0:
+            if ns == _notATime:
+                return None
+            dt = np.datetime64(int(ns), "ns").astype("M8[us]").astype(object)
+            return astrodatetime.fromDatetime(dt.replace(tzinfo=gmt))
+        return AstroTimeArray._fromNanoseconds(ns)
+    
+    @property
+    def shape(self):
+        return self._ns.shape
+    
+    @property
+    def datetime64(self):
+        """ The times as a numpy datetime64[ns] array in UTC """
+        return self._ns.view("M8[ns]")
+    
+    def _dayParts(self):
+        """ Returns the days since 1970-01-01 and the nanoseconds since midnight. """
+        return np.divmod(self._ns, 86400 * 10**9)
+    
+    @property
+    def decimalTime(self):
+        """ Return the decimal UTC time of day in hours """
+        nsOfDay = self._dayParts()[1]
+        (h, nsOfHour) = np.divmod(nsOfDay, 3600 * 10**9)
+        (m, nsOfMinute) = np.divmod(nsOfHour, 60 * 10**9)
+        (s, nsOfSecond) = np.divmod(nsOfMinute, 10**9)
+        
+        # The same operations as convert.datetimeToDecimalTime
+        return h + m/60. + (s + (nsOfSecond / 1.E3) / 1.E6)/3600.
+    
+    @property
+    def twoPartJD(self):
+        """ Calculate the two-part Julian Dates (jd1, jd2) of the times, see: 
+            convert.twoPartJD. Both parts are NaN for missing times (NaT).
+        """
+        days = self._dayParts()[0]
+        (jd1, jd2) = (days + 2440587.5, self.decimalTime / 24.0)
+        missing = self._ns == _notATime
+        if missing.any():
+            jd1[missing] = np.nan
+            jd2[missing] = np.nan
+        return (jd1, jd2)
+    
+    @property
+    def jd(self):
+        """ Calculate the Julian Dates (JD) of the times """
+        (jd1, jd2) = self.twoPartJD
+        return jd1 + jd2
+    
+    @property
+    def mjd(self):
+        """ Calculate the Modified Julian Dates (MJD) of the times """
+        return self.jd - 2400000.5
+    
+    def lst(self, longitude, longitudeDirection="w", longitudeUnits="degrees", out=None):
+        """ Compute the Local Sidereal Times in hours at a longitude, see: 
+            astrodatetime.lst and convert.jdToLST
+            
+            Parameters
+            ----------
+            longitude : float, int, `Angle`, str, array_like
+                The longitude in the specified units, or an array of longitudes 
+                that is broadcast against the times.
+            longitudeDirection : str, {'W', 'E'}
+                The direction from Greenwich that the longitude is measured in. 
+                Can be "E" or "W" (east or west), but by default is WEST ("W")
+            longitudeUnits : str 
+                Can be 'degrees', 'radians', or 'hours', default is "degrees"
+            out : `numpy.ndarray`
+                An optional float64 array to write the result into
+        """
+        return convert.jdToLST(self.twoPartJD, longitude, longitudeDirection=longitudeDirection, longitudeUnits=longitudeUnits, out=out)
+    
+    @staticmethod
+    def fromJD(jd):
+        """ Create an AstroTimeArray from an array of Julian Dates (JD), see: 
+            convert.jdToDatetimeArray, or from a two-part JD tuple (jd1, jd2), 
+            which keeps the time to the nanosecond. NaN two-part JDs become
+            missing times (NaT).
+        """
+        if isinstance(jd, tuple):
+            with np.errstate(invalid="ignore"):
+                (jd1, jd2) = [np.atleast_1d(x) for x in convert.twoPartJD(jd)]
+                missing = np.isnan(jd1) | np.isnan(jd2)
+                ns = (jd1 - 2440587.5).astype(np.int64) * (86400 * 10**9)
+                ns += np.round(jd2 * (86400 * 10**9)).astype(np.int64)
+            ns[missing] = _notATime
+            return AstroTimeArray._fromNanoseconds(ns)
+        return AstroTimeArray._fromNanoseconds(convert.jdToDatetimeArray(jd).astype("M8[ns]").view(np.int64))
+    
+    @staticmethod
+    def fromMJD(mjd):
+        """ Create an AstroTimeArray from an array of Modified Julian Dates (MJD) """
+        return AstroTimeArray.fromJD(convert.mjdToJD(np.asarray(mjd, dtype=np.float64)))
+    
+    @staticmethod
+    def fromDatetime(datetimes, timezone=None):
+        """ Create an AstroTimeArray from a sequence of Python datetime objects, 
+            or a numpy datetime64 array in UTC.
+            
+            Parameters
+            ----------
+            datetimes : sequence of `datetime.datetime`, `numpy.ndarray`
+                The times. Datetime objects that don't know their timezone are in 
+                `timezone`.
+            timezone : int, `datetime.tzinfo`
+                Either an integer specifying the offset from UTC of the datetime 
+                objects, or a `tzinfo` object.
+        """
+        return AstroTimeArray(datetimes, timezone=timezone)
+
+def _utcDatetime(datetimeObj, timezone):
+    """ Converts a datetime object to a naive datetime in UTC, using `timezone` if 
+        it doesn't know its own timezone, see: convert.datetimeToJD
+    """
+    if datetimeObj.utcoffset() is None:
+        if timezone is None:
+            raise ValueError("Either the input datetime object must know it's timezone (see: datetime.tzinfo), or you must supply a timezone!")
+        if isinstance(timezone, int):
+            timezone = convert.intTimezoneToTzinfo(timezone)
+        elif not isinstance(timezone, py_datetime.tzinfo):
+            raise ValueError("Invalid timezone! You entered: {0}".format(timezone))
+        datetimeObj = datetimeObj.replace(tzinfo=timezone)
+    
+    return datetimeObj.astimezone(gmt).replace(tzinfo=None)
+
 # Have to put this here to deal with circular imports
 import convert
 
@@ -179,5 +367,84 @@ if __name__ == "__main__":
         def test_lst(self):
             dt = astrodatetime.fromJD(2455893.66045)
             self.assertAlmostEqual(dt.lst(172.235, longitudeDirection="e"), convert.hmsToHours(19,46,48.8), 5)
+
+        def test_jdArrays(self):
+            years = [1582, 1582, 1582, 2011, -44, 2000]
+            months = [10, 10, 11, 11, 3, 1]
+            days = [4.25, 15.5, 20., 28.68753, 15., 1.5]
+            jds = convert.ymdToJDArray(years, months, days)
+            for ii in range(len(years)):
+                self.assertEqual(jds[ii], convert.ymdToJD(years[ii], months[ii], days[ii]))
+
+            (years, months, days) = convert.jdToYMDArray([jd, 2299160.5, 2451545.])
+            self.assertEqual((years[0], months[0], int(days[0])), (y, m, d))
+            self.assertEqual((years[1], months[1], days[1]), (1582, 10, 15.))
+            self.assertEqual(days[2], 1.5)
+
+            times = convert.jdToDatetimeArray([jd, mjd + 2400000.5])
+            dt = astrodatetime.fromJD(jd)
+            self.assertTrue(np.all(times == np.datetime64(dt.replace(tzinfo=None), "us")))
+
+
+    class TestAstroTimeArray(unittest.TestCase):
+        def test_properties(self):
+            times = AstroTimeArray.fromJD([jd, 2455893.66045, 2451545.])
+            self.assertEqual(len(times), 3)
+            for ii in range(len(times)):
+                dt = times[ii]
+                self.assertTrue(isinstance(dt, astrodatetime))
+                self.assertEqual(dt, astrodatetime.fromJD(times.jd[ii]))
+                self.assertEqual(times.jd[ii], dt.jd)
+                self.assertEqual(times.mjd[ii], dt.mjd)
+                self.assertEqual(times.decimalTime[ii], dt.decimalTime)
+            
+            dt = astrodatetime.fromJD(jd)
+            self.assertEqual(times[0], dt)
+            self.assertEqual(times[1:].shape, (2,))
+            self.assertTrue(np.all(AstroTimeArray.fromMJD(times.mjd).datetime64 == times.datetime64))
+            
+            lst = times.lst(172.235, longitudeDirection="e")
+            self.assertEqual(lst[1], times[1].lst(172.235, longitudeDirection="e"))
+            self.assertEqual(lst[1], convert.gmstToLST(convert.datetimeToGMST(times[1]), 172.235, longitudeDirection="e"))
+            
+            lst = times.lst(np.array([[-70.5], [172.235]]), longitudeUnits="degrees")
+            self.assertEqual(lst.shape, (2, 3))
+            self.assertEqual(lst[0,2], times[2].lst(-70.5))
+            
+            gmst = convert.jdToGMST(times.twoPartJD)
+            self.assertTrue(np.all(gmst == [convert.datetimeToGMST(dt) for dt in times]))
+            self.assertTrue(np.all(np.abs(convert.jdToGAST(times.twoPartJD) - gmst) < 1.5 / 3600))
+            self.assertTrue(np.all(np.abs(convert.jdToGMST(times.jd) - gmst) < 1E-4 / 3600))
         
+        def test_twoPartJD(self):
+            (jd1, jd2) = convert.twoPartJD(jd)
+            self.assertEqual(jd1, 2455893.5)
+            self.assertEqual(jd1 + jd2, jd)
+            
+            dt = astrodatetime(2011, 11, 28, 23, 59, 59, 999999, tzinfo=gmt)
+            (jd1, jd2) = dt.twoPartJD
+            self.assertEqual(jd1 + jd2, dt.jd)
+            self.assertTrue(0 <= jd2 < 1)
+            
+            # A nanosecond survives a round trip, but not a float JD
+            times = AstroTimeArray(np.array(["2011-11-28T04:30:02.600000001"], dtype="M8[ns]"))
+            self.assertEqual(AstroTimeArray.fromJD(times.twoPartJD).datetime64[0], times.datetime64[0])
+            self.assertEqual(AstroTimeArray.fromJD(convert.addToJD(times.twoPartJD, 1E-9 / 86400)).datetime64[0], 
+                             times.datetime64[0] + np.timedelta64(1, "ns"))
+            
+            later = convert.addToJD(times.twoPartJD, [1E-6 / 86400, 365.25])
+            self.assertTrue(np.allclose(convert.jdDifference(later, times.twoPartJD) * 86400, [1E-6, 365.25 * 86400], rtol=0., atol=1E-12))
+            self.assertEqual(convert.twoPartJD(2455893.5, -1E-20), (2455893.5, 0.))
+            self.assertEqual(convert.twoPartJD((2455893.5, -0.25))[0], 2455892.5)
+        
+        def test_fromDatetime(self):
+            dt = py_datetime.datetime(2011, 11, 28, 4, 30, 2, 600000)
+            times = AstroTimeArray.fromDatetime([dt, dt.replace(tzinfo=gmt)], timezone=-5)
+            self.assertEqual(times[0], dt.replace(hour=9, tzinfo=gmt))
+            self.assertEqual(times[1], dt.replace(tzinfo=gmt))
+            self.assertRaises(ValueError, AstroTimeArray.fromDatetime, [dt])
+            
+            times = AstroTimeArray(np.array(["2011-11-28T04:30:02.6"], dtype="M8[ns]"))
+            self.assertEqual(times[0], dt.replace(tzinfo=gmt))
+
     unittest.main()
\ No newline at end of file
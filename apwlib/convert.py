@@ -40,14 +40,13 @@ import math
 import re
 import os.path
 import calendar
-from inspect import stack
 import datetime as py_datetime
 
 # Third-party libraries
 import numpy as np
 
 # Project Dependencies
-from astrodatetime import astrodatetime, gmt
+from astrodatetime import astrodatetime, AstroTimeArray, gmt
 import geometry as g
 from custom_errors import *
 
@@ -55,6 +54,11 @@ from custom_errors import *
 epochOffsetT = 0.0
 ee = 23.0 + 26.0/60.0 + 21.45/3600.0 - 46.815/3600.0*epochOffsetT - 0.0006/3600.0*epochOffsetT**2 + 0.00181/3600.0*epochOffsetT**3
 
+# Rotation matrix from J2000 to Galactic, applied as np.dot(xyz, j2000ToGalacticMatrix)
+j2000ToGalacticMatrix = np.array([[-0.054875539, 0.494109454, -0.867666136],\
+                                  [-0.873437105, -0.444829594, -0.198076390],\
+                                  [-0.483834992, 0.746982249, 0.455983795]])
+
 def intTimezoneToTzinfo(timezone):
     class TZ(py_datetime.tzinfo):
         def utcoffset(self, dt):
@@ -84,7 +88,297 @@ def checkHMSRanges(h, m, s):
     _checkMinuteRange(m)
     _checkSecondRange(s)
     return None
+
+# Sexagesimal string parsing engine used by parseHours and parseDegrees. The grammars
+#   are compiled once, the common shapes (HH:MM:SS.sss / DD:MM:SS.sss and plain 
+#   numbers) are matched first with a single pattern, and failures are signaled by 
+#   returning None. Only the fields matched by the general grammars (which allow 
+#   e.g. '1.2.3' as seconds) can fail to convert, and that is caught as ValueError.
+
+# The fast path, one match for the common shapes: colon separated with the seconds at 
+#   least two characters long (groups 1-3), or a plain decimal number (group 4)
+_decimalNumber = '([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)'
+_hoursFastPattern = re.compile('^(?:([+-]?\d\d?):(\d\d?):(\d\d(?:\.\d*)?|\d\.\d*)|' + _decimalNumber + ')$')
+_degreesFastPattern = re.compile('^(?:([+-]?\d{1,3}):(\d\d?):(\d\d(?:\.\d*)?|\d\.\d*)|' + _decimalNumber + ')$')
+
+# The other strings float() accepts
+_specialFloatPattern = re.compile('^[+-]?(?:inf(?:inity)?|nan)$', re.IGNORECASE)
+
+# The full grammars: h,m,s or d,m,s, then h,m or d,m
+_hoursDiv = '[:|/|\t|\-|\sHhMmSs]{1,2}' # accept these as (one or more repeated) delimiters: :, whitespace, /
+_hmsPattern = re.compile('^([+-]{0,1}\d{1,2})' + _hoursDiv + '(\d{1,2})' + _hoursDiv + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$')
+_hmPattern = re.compile('^([+-]{0,1}\d{1,2})' + _hoursDiv + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$')
+
+_degreesDiv = '[:|/|\t|\-|\sDdMmSs]{1,2}'
+_dmsPattern = re.compile('^([+-]{0,1}\d{1,3})' + _degreesDiv + '(\d{1,2})' + _degreesDiv + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$')
+_dmPattern = re.compile('^([+-]{0,1}\d{1,3})' + _degreesDiv + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$')
+
+def _parseHoursString(x):
+    """ Parses a stripped string into decimal hours. 
+        
+        Returns a tuple (hours, hms), where hms is the (hour, minute, second) tuple
+        or None if the string is a plain number, or returns None if the string 
+        can't be parsed (including strings with the shape of the general grammars 
+        but malformed fields, e.g. '12:30:1.2.3').
+    """
+    match = _hoursFastPattern.match(x)
+    if match is not None:
+        (h, m, s, number) = match.groups()
+        if number is not None:
+            return (float(number), None)
+        # The sign applies to the whole value, and is read from the string as int()
+        #   drops it from e.g. '-0'
+        negative = h.startswith("-")
+        (h, m, s) = (int(h), int(m), float(s))
+        hours = abs(h) + m/60. + s/3600.
+        if negative:
+            hours = -hours
+        return (hours, (h, m, s))
+    
+    if _specialFloatPattern.match(x) is not None:
+        return (float(x), None)
+    
+    match = _hmsPattern.match(x)
+    if match is not None:
+        elems = match.groups()
+        try:
+            hms = (int(elems[0]), int(elems[1]), float(elems[2]))
+        except ValueError:
+            return None
+        hours = abs(hms[0]) + hms[1]/60. + hms[2]/3600.
+        if elems[0].startswith("-"):
+            hours = -hours
+        return (hours, hms)
+    
+    match = _hmPattern.match(x)
+    if match is not None:
+        elems = match.groups()
+        try:
+            m = float(elems[1])
+        except ValueError:
+            return None
+        s = 60.0 * (int(m) - m)
+        return (hmsToHours(elems[0], int(m), s), (int(elems[0]), int(m), s))
+    
+    return None
+
+def _parseDegreesString(x):
+    """ Parses a stripped string into decimal degrees. 
+        
+        Returns a tuple (degrees, dms), where dms is the (degree, arcminute, arcsecond)
+        tuple or None if the string is a plain number, or returns None if the string
+        can't be parsed (including strings with the shape of the general grammars 
+        but malformed fields, e.g. '-10 20 3.4.5').
+    """
+    match = _degreesFastPattern.match(x)
+    if match is not None:
+        (d, m, s, number) = match.groups()
+        if number is not None:
+            return (float(number), None)
+        # The sign is read from the string, as int() drops it from e.g. '-00'
+        negative = d.startswith("-")
+        (d, m, s) = (int(d), int(m), float(s))
+        degrees = abs(d) + m/60. + s/3600.
+        if negative:
+            degrees = -degrees
+        return (degrees, (d, m, s))
+    
+    if _specialFloatPattern.match(x) is not None:
+        return (float(x), None)
+    
+    match = _dmsPattern.match(x)
+    if match is not None:
+        elems = match.groups()
+        try:
+            dms = (int(elems[0]), int(elems[1]), float(elems[2]))
+        except ValueError:
+            return None
+        degrees = dmsToDegrees(*dms)
+        if elems[0].startswith("-") and dms[0] == 0:
+            degrees = -degrees
+        return (degrees, dms)
+    
+    match = _dmPattern.match(x)
+    if match is not None:
+        elems = match.groups()
+        try:
+            m = float(elems[1])
+        except ValueError:
+            return None
+        s = 60.0 * (int(m) - m)
+        degrees = dmsToDegrees(int(elems[0]), int(m), s)
+        if elems[0].startswith("-") and int(elems[0]) == 0:
+            degrees = -degrees
+        return (degrees, (int(elems[0]), int(m), s))
+    
+    return None
+
+# The number of rows decoded at a time by the array parsers, which bounds the size
+#   of their (rows, characters) temporary arrays
+_parseChunkSize = 65536
+
+def _digitsValue(chars):
+    """ Returns the integer values of a (N, k) uint8 array of decimal digit characters """
+    value = np.zeros(len(chars), dtype=np.int64)
+    for k in range(chars.shape[1]):
+        value = 10*value + (chars[:,k] - ord("0"))
+    return value
+
+def _decodeSexagesimalStrings(strings, wholeDigits):
+    """ Decodes a 1D string array with array operations, for the shapes handled by
+        the fast path of the scalar parsers: colon separated [+-]W:MM:SS.sss strings 
+        with at most `wholeDigits` digits in W, and plain decimal numbers.
+        
+        The colon separated strings are decoded in groups with the same layout, so 
+        each field is a fixed range of columns. 
+        
+        Returns (negative, whole, minutes, seconds, isSexagesimal, isNumber). The
+        components are only defined for the rows where isSexagesimal is True; the 
+        plain numbers are left to the caller.
+    """
+    N = len(strings)
+    W = strings.dtype.itemsize
+    chars = strings.view(np.uint8).reshape(N, W)
+    
+    length = np.sum(chars != 0, axis=1)
+    isColon = chars == ord(":")
+    isDot = chars == ord(".")
+    nColons = np.sum(isColon, axis=1)
+    nDots = np.sum(isDot, axis=1)
+    hasSign = (chars[:,0] == ord("+")) | (chars[:,0] == ord("-"))
+    negative = chars[:,0] == ord("-")
+    
+    whole = np.zeros(N, dtype=np.int64)
+    minutes = np.zeros(N, dtype=np.int64)
+    seconds = np.zeros(N, dtype=np.float64)
+    isSexagesimal = np.zeros(N, dtype=bool)
+    
+    # Group the colon separated strings by the columns of their sign, colons, 
+    # decimal point and end
+    rows = np.flatnonzero((nColons == 2) & (nDots <= 1))
+    colon1 = np.argmax(isColon[rows], axis=1)
+    colon2 = W - 1 - np.argmax(isColon[rows,::-1], axis=1)
+    dot = np.where(nDots[rows] > 0, np.argmax(isDot[rows], axis=1), -1)
+    layout = (((hasSign[rows]*W + colon1)*W + colon2)*(W+1) + dot+1)*(W+1) + length[rows]
+    (layouts, group) = np.unique(layout, return_inverse=True)
+    
+    for k, key in enumerate(layouts):
+        groupRows = rows[group == k]
+        (key, end) = divmod(int(key), W+1)
+        (key, dot) = divmod(key, W+1)
+        (sign, key) = divmod(key, W*W)
+        (colon1, colon2) = divmod(key, W)
+        dot -= 1
+        
+        # The same rules as _hoursFastPattern / _degreesFastPattern
+        secondsEnd = dot if dot >= 0 else end
+        if not (1 <= colon1 - sign <= wholeDigits and 1 <= colon2 - colon1 - 1 <= 2 and (dot < 0 or dot > colon2) and \
+                (secondsEnd - colon2 - 1 == 2 or (secondsEnd - colon2 - 1 == 1 and dot >= 0))):
+            continue
+        
+        digitColumns = [column for column in range(sign, end) if column not in (colon1, colon2, dot)]
+        groupRows = groupRows[np.all(chars[groupRows][:,digitColumns] - ord("0") < 10, axis=1) & \
+                              np.all(chars[groupRows,end:] == 0, axis=1)]
+        
+        whole[groupRows] = _digitsValue(chars[groupRows,sign:colon1])
+        minutes[groupRows] = _digitsValue(chars[groupRows,colon1+1:colon2])
+        # Same value as float() of the seconds string: with up to 15 digits, an 
+        # exact integer divided by an exact power of ten is correctly rounded
+        secondColumns = [column for column in digitColumns if column > colon2]
+        if len(secondColumns) <= 15:
+            seconds[groupRows] = _digitsValue(chars[groupRows][:,secondColumns]) / 10.**(end - secondsEnd - 1 if dot >= 0 else 0)
+        else:
+            secondChars = np.ascontiguousarray(chars[groupRows,colon2+1:end])
+            seconds[groupRows] = secondChars.view("S{0}".format(end - colon2 - 1)).ravel().astype(np.float64)
+        isSexagesimal[groupRows] = True
+    
+    # Plain numbers: digits, at most one decimal point and a leading sign
+    rows = np.flatnonzero((nColons == 0) & (nDots <= 1) & (length > hasSign + nDots))
+    block = chars[rows]
+    known = np.where(np.arange(W) < length[rows,np.newaxis], (block - ord("0") < 10) | (block == ord(".")), block == 0)
+    known[:,0] |= hasSign[rows]
+    isNumber = np.zeros(N, dtype=bool)
+    isNumber[rows[np.all(known, axis=1)]] = True
+    
+    return (negative, whole, minutes, seconds, isSexagesimal, isNumber)
+
+def _parseSexagesimalArray(x, isHours):
+    """ Parses an array or other iterable of hour (`isHours` True) or degree values 
+        with array operations where possible, see: parseHoursArray. 
+        
+        Returns (values, valid, inputs), where values is NaN where valid is False 
+        and inputs is a flat array of the values as they were parsed (strings or 
+        numbers).
+    """
+    if not isinstance(x, np.ndarray):
+        x = list(x)
+    x = np.asarray(x)
+    shape = x.shape
+    
+    if x.dtype.kind in "biuf":
+        values = np.array(x, dtype=np.float64).ravel()
+        inputs = values.copy()
+        isNumber = np.ones(len(values), dtype=bool)
+        fallback = []
+    
+    else:
+        (strings, shape) = _asStringArray(x)
+        inputs = strings
+        values = np.empty(len(strings), dtype=np.float64)
+        isNumber = np.zeros(len(strings), dtype=bool)
+        fallback = []
+        
+        for start in range(0, len(strings), _parseChunkSize):
+            chunk = slice(start, start + _parseChunkSize)
+            (negative, whole, minutes, seconds, isSexagesimal, isNumber[chunk]) = _decodeSexagesimalStrings(strings[chunk], 2 if isHours else 3)
+            
+            # Same operations as the scalar parsers, so the values are identical
+            if isHours:
+                hours = whole + minutes/60. + seconds/3600.
+                values[chunk] = np.where(negative, -hours, hours)
+            else:
+                degrees = whole + minutes/60. + seconds/3600.
+                values[chunk] = np.where(negative, -degrees, degrees)
+            
+            numbers = np.flatnonzero(isNumber[chunk]) + start
+            values[numbers] = strings[numbers].astype(np.float64)
+            fallback.append(np.flatnonzero(~isSexagesimal & ~isNumber[chunk]) + start)
+        
+        if len(fallback) > 0:
+            fallback = np.concatenate(fallback)
+    
+    # Plain numbers are range-checked as in parseHours / parseDegrees
+    valid = np.ones(len(values), dtype=bool)
+    if isHours:
+        valid[isNumber] = np.abs(values[isNumber]) < 24
+    else:
+        valid[isNumber] = np.isfinite(values[isNumber])
     
+    # Everything else goes through the scalar parser engine, and any row it can't
+    #   convert is invalid rather than an error
+    for ii in fallback:
+        try:
+            if isHours:
+                parsed = _parseHoursString(strings[ii].strip())
+            else:
+                parsed = _parseDegreesString(strings[ii].strip())
+        except (ValueError, TypeError):
+            parsed = None
+        
+        if parsed is None:
+            valid[ii] = False
+            continue
+        
+        values[ii] = parsed[0]
+        if parsed[1] is None:
+            if isHours:
+                valid[ii] = -24 < values[ii] < 24
+            else:
+                valid[ii] = not (math.isinf(values[ii]) or math.isnan(values[ii]))
+    
+    values[~valid] = np.nan
+    return (values.reshape(shape), valid.reshape(shape), inputs)
+
 def parseHours(hours, outputHMS=False):
     """ Parses an input "hour" value to decimal hours or an hour, minute, second tuple.
         
@@ -107,51 +401,26 @@ def parseHours(hours, outputHMS=False):
     # either a string or a float
     x = hours
 
-    if isinstance(x, float) or isinstance(x, int):
-        parsedHours = x
-        parsedHMS = hoursToHMS(parsedHours)
-    
-    elif isinstance(x, str):
-        x = x.strip()
+    if isinstance(x, str):
+        parsed = _parseHoursString(x.strip())
+        if parsed is None:
+            raise ValueError("convert.parseHours: Invalid input string, can't parse to HMS. ({0})".format(x.strip()))
         
-        try:
-            parsedHours = float(x)
-            parsedHMS = hoursToHMS(parsedHours)
-        except ValueError:
-
-            string_parsed = False
-            div = '[:|/|\t|\-|\sHhMmSs]{1,2}' # accept these as (one or more repeated) delimiters: :, whitespace, /
-            
-            # First look for a pattern where h,m,s is specified
-            pattr = '^([+-]{0,1}\d{1,2})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$'
-
-            try:
-                elems = re.search(pattr, x).groups()
-                string_parsed = True
-            except:
-                pass # try again below
-                #raise ValueError("convert.parseHours: Invalid input string, can't parse to HMS. ({0})".format(x))
-            
-            if string_parsed:
-                parsedHours = hmsToHours(elems[0], elems[1], elems[2])
-                parsedHMS = (int(elems[0]), int(elems[1]), float(elems[2]))
-            
-            else:
-                
-                # look for a pattern where only d,m is specified
-                pattr = '^([+-]{0,1}\d{1,2})' + div + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$'
-                
-                try:
-                    elems = re.search(pattr, x).groups()
-                    string_parsed = True
-                except:
-                    raise ValueError("convert.parseHours: Invalid input string, can't parse to HMS. ({0})".format(x))
-                
-                m = float(elems[1])
-                s = 60.0 * (int(m) - m)
-                parsedHours = hmsToHours(elems[0], int(m), s)
-                parsedHMS = (int(elems[0]), int(m), s)
+        (parsedHours, parsedHMS) = parsed
+        if parsedHMS is None:
+            # a plain number: only split it into h,m,s if asked to, but check the range
+            if not -24 < parsedHours < 24:
+                _checkHourRange(parsedHours)
+            if outputHMS:
+                parsedHMS = hoursToHMS(parsedHours)
 
+    elif isinstance(x, float) or isinstance(x, int):
+        parsedHours = x
+        if outputHMS:
+            parsedHMS = hoursToHMS(parsedHours)
+        elif not -24 < parsedHours < 24:
+            _checkHourRange(parsedHours)
+    
     elif isinstance(x, g.Angle):
         parsedHours = x.hours
         parsedHMS = hoursToHMS(parsedHours)
@@ -165,7 +434,7 @@ def parseHours(hours, outputHMS=False):
             parsedHours = hmsToHours(*x)
             parsedHMS = x
         else:
-            raise ValueError("{0}.{1}: Incorrect number of values given, expected (h,m,s), got: {2}".format(os.path.basename(__file__), stack()[0][3], x))
+            raise ValueError("convert.parseHours: Incorrect number of values given, expected (h,m,s), got: {0}".format(x))
 
     elif isinstance(x, list):
         if len(x) == 3:
@@ -174,7 +443,7 @@ def parseHours(hours, outputHMS=False):
                 m = float(x[1])
                 s = float(x[2])
             except ValueError:
-                raise ValueError("{0}.{1}: Array values ([h,m,s] expected) could not be coerced into floats. {2}".format(os.path.basename(__file__), stack()[0][3], x))
+                raise ValueError("convert.parseHours: Array values ([h,m,s] expected) could not be coerced into floats. {0}".format(x))
 
             parsedHours = hmsToHours(h, m, s)
             parsedHMS = (h, m, s)
@@ -184,7 +453,7 @@ def parseHours(hours, outputHMS=False):
                 return hmsToHours(h, m, s)
 
         else:
-            raise ValueError("{0}.{1}: Array given must contain exactly three elements ([h,m,s]), provided: {2}".format(os.path.basename(__file__), stack()[0][3], x)) # current filename/method should be made into a convenience method
+            raise ValueError("convert.parseHours: Array given must contain exactly three elements ([h,m,s]), provided: {0}".format(x))
     
     else:
         raise ValueError("parseHours: could not parse value of type {0}.".format(type(x).__name__))
@@ -194,6 +463,34 @@ def parseHours(hours, outputHMS=False):
     else:
         return parsedHours
     
+def parseHoursArray(hours, returnMask=False):
+    """ Parses an array (or pandas column, or other iterable) of hour values into 
+        a float64 array of decimal hours, equivalent to calling `parseHours` on each 
+        value.
+        
+        Strings in the HH:MM:SS.sss format and plain numbers are decoded with array
+        operations, and any other strings are passed to the scalar parser.
+        
+        Parameters
+        ----------
+        hours : array_like
+            Strings (see: parseHours) or numbers
+        returnMask : bool
+            If False (default), the error `parseHours` raises for the first invalid 
+            value is raised. If True, invalid values are set to NaN instead and a 
+            tuple (hours, valid) is returned, where valid is a boolean array that 
+            is True for the values that were parsed.
+    """
+    (values, valid, inputs) = _parseSexagesimalArray(hours, True)
+    if returnMask:
+        return (values, valid)
+    
+    if not np.all(valid):
+        bad = inputs[np.argmin(valid.ravel())]
+        parseHours(bad)
+        raise ValueError("convert.parseHoursArray: Invalid input value. ({0})".format(bad))
+    return values
+
 def hoursToHMS(h):
     """ Convert any parseable hour value (see: parseHours) into an hour,minute,second tuple """
     sign = math.copysign(1.0, h)
@@ -206,6 +503,50 @@ def hoursToHMS(h):
     
     return (int(sign*h), int(m), s)
 
+def _sexagesimalComponents(x, wholeName):
+    """ Splits an array of decimal hour or degree values into a structured array with
+        fields 'sign', `wholeName`, 'm' and 's', using the same operations as
+        hoursToHMS and degreesToDMS so the components are identical.
+        
+        Returns (components, m, s), where m and s are the float minutes and seconds 
+        for range checking.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    sign = np.copysign(1.0, x)
+    
+    (xf, whole) = np.modf(np.abs(x)) # (fraction, whole)
+    (mf, m) = np.modf(xf * 60.) # (minute fraction, minute)
+    s = mf * 60.
+    
+    if np.any(np.isinf(x)):
+        raise OverflowError("cannot convert an infinite value to an integer.")
+    
+    components = np.empty(x.shape, dtype=[("sign", np.int8), (wholeName, np.int64), ("m", np.int64), ("s", np.float64)])
+    components["sign"] = sign
+    components[wholeName] = sign * whole
+    components["m"] = m
+    components["s"] = s
+    return (components, m, s)
+
+def hoursToHMSArray(h):
+    """ Convert an array of decimal hour values into hour, minute, second components, 
+        equivalent to calling `hoursToHMS` on each value.
+        
+        Returns a structured array with the same shape as `h` and the fields 'sign' 
+        (+1 or -1), 'h', 'm' and 's'. The 'h', 'm' and 's' fields are identical to
+        the tuples returned by `hoursToHMS`, and 'sign' keeps the sign of values 
+        between -1 and 0 (including -0.0), whose 'h' is 0.
+        
+        Parameters
+        ----------
+        h : array_like
+            The decimal hour values, must be in the range (-24,24).
+    """
+    h = np.asarray(h, dtype=np.float64)
+    if not np.all(np.abs(h) < 24):
+        raise IllegalHourError("Error: hours not in range (-24,24).")
+    return _sexagesimalComponents(h, "h")[0]
+
 def hoursToDecimal(h):
     """ Convert any parseable hour value (see: parseHours) into a float value """
     return parseHours(h, outputHMS=False)
@@ -236,27 +577,186 @@ def hoursToRadians(h):
     """ Convert an angle in Hours to Radians """
     return math.radians(h*15.)
 
-def hoursToString(h, precision=5, pad=False, sep=("h", "m", "s")):
-    """ Takes a decimal hour value and returns a string formatted as hms with separator
-        specified by the 'sep' parameter. 
-        
-        More detailed description here!
+def _separators(sep):
+    """ Returns the (first, second, trailing) separators of a sexagesimal string
+        from a `sep` specification of length 0, 1, 2 or 3 (see: hoursToString).
     """
-    if pad:
-        hPad = ":02"
-    else:
-        hPad = ""
-        
     if len(sep) == 1 or len(sep) == 0:
-        literal = "{0[0]" + hPad + "}"+ str(sep) + "{0[1]:02d}" + str(sep) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}"
+        return (str(sep), str(sep), "")
     elif len(sep) == 2:
-        literal = "{0[0]" + hPad + "}"+ str(sep[0]) + "{0[1]:02d}" + str(sep[1]) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}"
+        return (str(sep[0]), str(sep[1]), "")
     elif len(sep) == 3:
-        literal = "{0[0]" + hPad + "}"+ str(sep[0]) + "{0[1]:02d}" + str(sep[1]) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}" + str(sep[2])
+        return (str(sep[0]), str(sep[1]), str(sep[2]))
     else:
         raise ValueError("Invalid separator specification for converting angle to string.")
+
+def _sexagesimalString(x, precision, pad, sep):
+    """ Formats a decimal hour or degree value as a sexagesimal string. Seconds that 
+        round up to 60 are carried over into the minutes (and the minutes into the 
+        hours or degrees), and the sign is kept for values between -1 and 0.
+    """
+    (sep1, sep2, sep3) = _separators(sep)
+    
+    if x < 0:
+        sign = "-"
+    else:
+        sign = ""
+    
+    (xf, x) = math.modf(abs(x)) # (fraction, whole)
+    (mf, m) = math.modf(xf * 60.) # (minute fraction, minute)
+    s = mf * 60.
+    
+    seconds = "{0:0{1}.{2}f}".format(s, precision+3, precision)
+    if float(seconds) >= 60.:
+        seconds = "{0:0{1}.{2}f}".format(0., precision+3, precision)
+        m += 1
+        if m == 60:
+            m = 0
+            x += 1
+    
+    if pad:
+        whole = "{0:02d}".format(int(x))
+    else:
+        whole = str(int(x))
+    
+    return sign + whole + sep1 + "{0:02d}".format(int(m)) + sep2 + seconds + sep3
+
+def _writeDigits(chars, values, ndigits):
+    """ Writes the zero-padded decimal digits of an array of non-negative integers 
+        into the last `ndigits` columns of a (N, ndigits) uint8 character array.
+    """
+    for k in range(ndigits):
+        chars[:, ndigits-1-k] = 48 + (values // 10**k) % 10
+
+def _sexagesimalStringArray(x, precision, pad, sep, out=None):
+    """ Formats an array of decimal hour or degree values as sexagesimal strings.
         
-    return literal.format(hoursToHMS(h))
+        The output is identical to calling `_sexagesimalString` on each value, but
+        the components are computed with array operations and the digits are written
+        directly into a character buffer, which is then viewed as a fixed-width 
+        string array.
+    """
+    (sep1, sep2, sep3) = _separators(sep)
+    
+    x = np.asarray(x, dtype=np.float64)
+    shape = x.shape
+    x = x.ravel()
+    N = len(x)
+    
+    negative = x < 0
+    (xf, whole) = np.modf(np.abs(x)) # (fraction, whole)
+    (mf, m) = np.modf(xf * 60.) # (minute fraction, minute)
+    s = mf * 60.
+    whole = whole.astype(np.int64)
+    m = m.astype(np.int64)
+    
+    # Round the seconds to `precision` decimal places as integer multiples of
+    # 10**-precision. Values too close to a rounding tie to decide from the 
+    # product are rounded by the scalar string formatting instead.
+    scale = 10**precision
+    scaled = s * scale
+    q = np.floor(scaled + 0.5)
+    tolerance = max(1E-6, 4*np.spacing(60.*scale))
+    for ii in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < tolerance):
+        q[ii] = int("{0:.{1}f}".format(s[ii], precision).replace(".", ""))
+    q = q.astype(np.int64)
+    
+    # Carry seconds that rounded up to 60 into the minutes, then the minutes
+    carry = q >= 60*scale
+    q[carry] -= 60*scale
+    m[carry] += 1
+    carry = m >= 60
+    m[carry] -= 60
+    whole[carry] += 1
+    
+    # Everything after the hours/degrees has a fixed width
+    if precision > 0:
+        secondDigits = 2
+    else:
+        secondDigits = 3
+    
+    pieces = [np.tile(np.frombuffer(sep1, dtype=np.uint8), (N,1)), np.empty((N,2), dtype=np.uint8), 
+              np.tile(np.frombuffer(sep2, dtype=np.uint8), (N,1)), np.empty((N,secondDigits), dtype=np.uint8)]
+    _writeDigits(pieces[1], m, 2)
+    _writeDigits(pieces[3], q // scale, secondDigits)
+    if precision > 0:
+        pieces.append(np.empty((N,precision+1), dtype=np.uint8))
+        pieces[-1][:,0] = ord(".")
+        _writeDigits(pieces[-1][:,1:], q % scale, precision)
+    pieces.append(np.tile(np.frombuffer(sep3, dtype=np.uint8), (N,1)))
+    rest = np.hstack(pieces)
+    
+    # The hours/degrees have a variable width, so the rows are written in groups
+    # with the same sign and number of digits
+    ndigits = np.ones(N, dtype=np.int64)
+    if N > 0:
+        for k in range(1, len(str(whole.max()))):
+            ndigits += whole >= 10**k
+    if pad:
+        ndigits = np.maximum(ndigits, 2)
+    width = negative + ndigits
+    
+    W = max(1, width.max() + rest.shape[1]) if N > 0 else 1
+    chars = np.zeros((N, W), dtype=np.uint8)
+    for w in np.unique(width):
+        for isNegative in (False, True):
+            rows = np.flatnonzero((width == w) & (negative == isNegative))
+            if len(rows) == 0:
+                continue
+            block = np.zeros((len(rows), W), dtype=np.uint8)
+            block[:,0] = ord("-")
+            _writeDigits(block[:,int(isNegative):w], whole[rows], w - int(isNegative))
+            block[:,w:w+rest.shape[1]] = rest[rows]
+            chars[rows] = block
+    
+    strings = chars.view("S{0}".format(W)).reshape(shape)
+    if out is None:
+        return strings
+    out[...] = strings
+    return out
+
+def hoursToString(h, precision=5, pad=False, sep=("h", "m", "s")):
+    """ Takes a decimal hour value and returns a string formatted as hms with separator
+        specified by the 'sep' parameter. 
+        
+        Parameters
+        ----------
+        h : float
+            The decimal hour value, must be in the range (-24,24).
+        precision : int
+            The number of decimal places of the seconds.
+        pad : bool
+            If True, the hours are zero-padded to two digits.
+        sep : str, tuple, list
+            The separator between the hours, minutes and seconds. Accepts 1, 2 
+            or 3 separators, e.g. ":", ":-" or ("h","m","s").
+    """
+    _checkHourRange(h)
+    return _sexagesimalString(h, precision, pad, sep)
+
+def hoursToStringArray(h, precision=5, pad=False, sep=("h", "m", "s"), out=None):
+    """ Formats an array of decimal hour values as hms strings, equivalent to 
+        calling `hoursToString` on each value but without a Python-level loop.
+        
+        Returns a fixed-width NumPy string array with the same shape as `h`. If an 
+        `out` string array is given (e.g. a column of a record array), the strings
+        are written into it instead; its itemsize must be large enough to hold them.
+        
+        Parameters
+        ----------
+        h : array_like
+            The decimal hour values, must be in the range (-24,24).
+        precision : int
+        pad : bool
+        sep : str, tuple, list
+            See: hoursToString
+        out : `numpy.ndarray` (optional)
+            A string array to write the result into.
+    """
+    h = np.asarray(h, dtype=np.float64)
+    if np.any(np.abs(h) >= 24):
+        raise IllegalHourError("Error: hours not in range (-24,24).")
+    return _sexagesimalStringArray(h, precision, pad, sep, out=out)
 
 # DEGREES
 def parseDegrees(degrees, outputDMS=False):
@@ -285,51 +785,23 @@ def parseDegrees(degrees, outputDMS=False):
     # either a string or a float
     x = degrees
     
-    if isinstance(x, float) or isinstance(x, int):
-        parsedDegrees = x
-        parsedDMS = degreesToDMS(parsedDegrees)
-    
-    elif isinstance(x, str):
-        x = x.strip()
+    if isinstance(x, str):
+        parsed = _parseDegreesString(x.strip())
+        if parsed is None:
+            raise ValueError("convert.parseDegrees: Invalid input string! ('{0}')".format(x.strip()))
         
-        try:
-            parsedDegrees = float(x)
-            parsedDMS = degreesToDMS(parsedDegrees)
-        except ValueError:
-        
-            string_parsed = False
-            div = '[:|/|\t|\-|\sDdMmSs]{1,2}' # accept these as (one or more repeated) delimiters: :, whitespace, /
+        (parsedDegrees, parsedDMS) = parsed
+        if parsedDMS is None:
+            # a plain number: only split it into d,m,s if asked to, but still
+            # reject values that aren't finite as degreesToDMS does
+            if outputDMS or math.isinf(parsedDegrees) or math.isnan(parsedDegrees):
+                parsedDMS = degreesToDMS(parsedDegrees)
 
-            # First look for a pattern where d,m,s is specified
-            pattr = '^([+-]{0,1}\d{1,3})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$'
+    elif isinstance(x, float) or isinstance(x, int):
+        parsedDegrees = x
+        if outputDMS or math.isinf(parsedDegrees) or math.isnan(parsedDegrees):
+            parsedDMS = degreesToDMS(parsedDegrees)
     
-            try:
-                elems = re.search(pattr, x).groups()
-                string_parsed = True
-            except:
-                pass # try again below
-                #raise ValueError("convert.parseDegrees: Invalid input string! ('{0}')".format(x))
-            
-            if string_parsed:
-                parsedDMS = (int(elems[0]), int(elems[1]), float(elems[2]))
-                parsedDegrees = dmsToDegrees(int(elems[0]), int(elems[1]), float(elems[2]))
-
-            else:
-
-                # look for a pattern where only d,m is specified
-                pattr = '^([+-]{0,1}\d{1,3})' + div + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$'
-
-                try:
-                    elems = re.search(pattr, x).groups()
-                    string_parsed = True
-                except:
-                    raise ValueError("convert.parseDegrees: Invalid input string! ('{0}')".format(x))
-                
-                m = float(elems[1])
-                s = 60.0 * (int(m) - m)
-                parsedDMS = (int(elems[0]), int(m), s)
-                parsedDegrees = dmsToDegrees(int(elems[0]), int(m), s)
-
     elif isinstance(x, g.Angle):
         parsedDegrees = x.degrees
         parsedDMS = degreesToDMS(parsedDegrees)
@@ -347,6 +819,21 @@ def parseDegrees(degrees, outputDMS=False):
         return parsedDegrees
 
 
+def parseDegreesArray(degrees, returnMask=False):
+    """ Parses an array (or pandas column, or other iterable) of degree values into
+        a float64 array of decimal degrees, equivalent to calling `parseDegrees` on 
+        each value. See: parseHoursArray
+    """
+    (values, valid, inputs) = _parseSexagesimalArray(degrees, False)
+    if returnMask:
+        return (values, valid)
+    
+    if not np.all(valid):
+        bad = inputs[np.argmin(valid.ravel())]
+        parseDegrees(bad)
+        raise ValueError("convert.parseDegreesArray: Invalid input value. ({0})".format(bad))
+    return values
+
 def degreesToDMS(d):
     """ Convert any parseable degree value (see: parseDegrees) into a 
         degree,arcminute,arcsecond tuple 
@@ -362,6 +849,27 @@ def degreesToDMS(d):
 
     return (int(sign * d), int(m), s)
 
+def degreesToDMSArray(d):
+    """ Convert an array of decimal degree values into degree, arcminute, arcsecond 
+        components, equivalent to calling `degreesToDMS` on each value.
+        
+        Returns a structured array with the same shape as `d` and the fields 'sign' 
+        (+1 or -1), 'd', 'm' and 's'. The 'd', 'm' and 's' fields are identical to
+        the tuples returned by `degreesToDMS`, and 'sign' keeps the sign of values
+        between -1 and 0, e.g. -00:12:00 has a 'sign' of -1 and a 'd' of 0.
+        
+        Parameters
+        ----------
+        d : array_like
+            The decimal degree values
+    """
+    (components, m, s) = _sexagesimalComponents(d, "d")
+    if not np.all((0 <= m) & (m < 60)):
+        raise IllegalMinuteError("Error: minutes not in range [0,60).")
+    if not np.all((0 <= s) & (s < 60)):
+        raise IllegalSecondError("Error: seconds not in range [0,60).")
+    return components
+
 def degreesToDecimal(d):
     """ Convert any parseable degrees value (see: parseDegrees) into a float value """
     return parseDegrees(d, outputDMS=False)
@@ -398,24 +906,17 @@ def degreesToRadians(d):
     return math.radians(d)
 
 def degreesToString(d, precision=5, pad=False, sep=":"):
-    """ Takes a decimal hour value and returns a string formatted as dms with separator
-        specified by the 'sep' parameter. 
+    """ Takes a decimal degree value and returns a string formatted as dms with separator
+        specified by the 'sep' parameter. See: hoursToString
     """
-    if pad:
-        dPad = ":02"
-    else:
-        dPad = ""
-        
-    if len(sep) == 1 or len(sep) == 0:
-        literal = "{0[0]" + dPad + "}" + str(sep) + "{0[1]:02d}" + str(sep) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}"
-    elif len(sep) == 2:
-        literal = "{0[0]" + dPad + "}"+ str(sep[0]) + "{0[1]:02d}" + str(sep[1]) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}"
-    elif len(sep) == 3:
-        literal = "{0[0]" + dPad + "}"+ str(sep[0]) + "{0[1]:02d}" + str(sep[1]) + "{0[2]:0" + str(precision+3) + "." + str(precision) + "f}" + str(sep[2])
-    else:
-        raise ValueError("Invalid separator specification for converting angle to string.")
-        
-    return literal.format(degreesToDMS(d))
+    return _sexagesimalString(d, precision, pad, sep)
+
+def degreesToStringArray(d, precision=5, pad=False, sep=":", out=None):
+    """ Formats an array of decimal degree values as dms strings, equivalent to 
+        calling `degreesToString` on each value but without a Python-level loop.
+        See: hoursToStringArray
+    """
+    return _sexagesimalStringArray(d, precision, pad, sep, out=out)
 
 # RADIANS
 def parseRadians(radians):
@@ -465,7 +966,189 @@ def radiansToDMS(r):
     degrees = math.degrees(r)
     return degreesToDMS(degrees)  
 
+def radiansToHMSArray(r):
+    """ Convert an array of angles in Radians to hour, minute, second components, 
+        equivalent to calling `radiansToHMS` on each value. See: hoursToHMSArray
+    """
+    # Same operations as radiansToHours
+    return hoursToHMSArray(np.degrees(np.asarray(r, dtype=np.float64)) / 15.)
+
+def radiansToDMSArray(r):
+    """ Convert an array of angles in Radians to degree, arcminute, arcsecond 
+        components, equivalent to calling `radiansToDMS` on each value. See: 
+        degreesToDMSArray
+    """
+    return degreesToDMSArray(np.degrees(np.asarray(r, dtype=np.float64)))
+
+# UNITS
+class Unit(object):
+    """ A resolved angular unit, with the functions that parse values in the unit
+        and convert them to and from radians looked up once. 
+        
+        `resolveUnits` returns the `Unit` for a units string. Every function or class
+        that takes a `units` string also accepts a `Unit` (e.g. `convert.DEGREES`), 
+        which skips the string lookup -- use one in loops that convert many values.
+        
+        Attributes
+        ----------
+        name : str
+            The name of the unit, one of globals.VALIDUNITS
+        radiansPerUnit : float
+            The size of the unit in radians
+        parse : callable
+            Parses a scalar value in this unit (e.g. parseDegrees) to a float
+        parseArray : callable, None
+            Parses an array of strings in this unit (e.g. parseDegreesArray), or 
+            None if the values must be parsed one at a time
+        toRadians : callable
+            Converts a float in this unit to radians
+        toRadiansArray : callable
+            Converts an array in this unit to a new float64 array of radians
+        fromRadians : callable
+            Converts a float in radians to this unit
+    """
+    
+    __slots__ = ("name", "radiansPerUnit", "parse", "parseArray", "toRadians", "toRadiansArray", "fromRadians")
+    
+    def __init__(self, name, radiansPerUnit, parse, parseArray, toRadians, toRadiansArray, fromRadians):
+        self.name = name
+        self.radiansPerUnit = radiansPerUnit
+        self.parse = parse
+        self.parseArray = parseArray
+        self.toRadians = toRadians
+        self.toRadiansArray = toRadiansArray
+        self.fromRadians = fromRadians
+    
+    def __repr__(self):
+        return "<Unit: {0}>".format(self.name)
+
+# The conversions use the same operations as the scalar functions (e.g. hoursToRadians),
+#   so the values don't depend on which path they took
+DEGREES = Unit("degrees", math.pi/180., parseDegrees, parseDegreesArray, math.radians, 
+               lambda x: np.radians(np.asarray(x, dtype=np.float64)), math.degrees)
+HOURS = Unit("hours", math.pi/12., parseHours, parseHoursArray, hoursToRadians, 
+             lambda x: np.radians(np.asarray(x, dtype=np.float64) * 15.), radiansToHours)
+RADIANS = Unit("radians", 1., float, None, float, 
+               lambda x: np.array(x, dtype=np.float64), float)
+
+# units string or Unit -> Unit, so resolving is a single lookup. Other spellings of the
+#   names (e.g. 'Degrees') are added as they are resolved.
+_unitRegistry = dict()
+for _unit in (DEGREES, HOURS, RADIANS):
+    _unitRegistry[_unit] = _unit
+    _unitRegistry[_unit.name] = _unit
+
+def resolveUnits(units):
+    """ Returns the `Unit` object for a units string, e.g. 'degrees' or 'HOURS'.
+        
+        Parameters
+        ----------
+        units : str, `Unit`
+            One of 'degrees', 'hours' or 'radians' in any case, or one of the 
+            `Unit` objects DEGREES, HOURS or RADIANS, which is returned as is.
+    """
+    unit = _unitRegistry.get(units)
+    if unit is None:
+        if not isinstance(units, basestring):
+            raise IllegalUnitsError(units)
+        
+        unit = _unitRegistry.get(units.lower())
+        if unit is None:
+            raise IllegalUnitsError(units)
+        _unitRegistry[units] = unit
+    
+    return unit
+
+def resolveBounds(bounds, units):
+    """ Converts a (low, high) pair of bounds in any parseable format into radians.
+        
+        The result can be passed straight to `wrapRadians` (or to `normalize` with 
+        units="radians"), so bounds that are reused for many angles are only parsed once.
+        
+        Parameters
+        ----------
+        bounds : tuple
+            A tuple with 2 values (low, hi).
+        units : str, `Unit`, {'degrees', 'radians', 'hours'}
+            The units of the bounds.
+    """
+    unit = resolveUnits(units)
+    return (unit.toRadians(unit.parse(bounds[0])), unit.toRadians(unit.parse(bounds[1])))
+
+def wrapRadians(radians, bounds, out=None):
+    """ Wraps angles in radians into the half-open range [low, high).
+        
+        Scalars inside the range are returned untouched. Arrays are wrapped with
+        in-place ufunc calls, so no temporary arrays are created: pass `out=radians`
+        to wrap an array in place. For example, to wrap RA values into [0, 360) degrees:
+        
+            wrapRadians(ra, (0., 2*math.pi), out=ra)
+        
+        Parameters
+        ----------
+        radians : float, `numpy.ndarray`
+            The angle(s) in radians.
+        bounds : tuple
+            A tuple with 2 values (low, hi) in radians, see `resolveBounds`.
+        out : `numpy.ndarray` (optional)
+            An array to store the result in, may be `radians` itself.
+    """
+    (low, high) = bounds
+    width = high - low
+    if not width > 0:
+        raise ValueError("convert.wrapRadians: the upper bound must be larger than the lower bound ({0}).".format(bounds))
+    
+    # The remainder of a tiny negative angle rounds to the full width, so results 
+    #   that land on `high` are folded back to `low`
+    if out is None and np.isscalar(radians):
+        if low <= radians < high:
+            return radians
+        r = low + (radians - low) % width
+        if r >= high:
+            r = low
+        return r
+    
+    if low == 0:
+        out = np.mod(radians, width, out=out)
+    else:
+        out = np.subtract(radians, low, out=out)
+        np.mod(out, width, out=out)
+        np.add(out, low, out=out)
+    
+    if isinstance(out, np.ndarray):
+        out[out >= high] = low
+    elif out >= high:
+        out = out.dtype.type(low)
+    return out
+
 # Combinations
+# accept these as (one or more repeated) delimiters: :, whitespace, /
+_raDecDiv = '[:/\t\shdms°\'\"]{0,2}'
+_raDecPattern = re.compile('^[J]{0,1}([+-]{0,1}\d{1,2})' + _raDecDiv + '(\d{1,2})' + _raDecDiv + '(\d{1,2}[\.0-9]+)' + _raDecDiv + \
+                           "[\s|_]*" + \
+                           '([+-]{0,1}\d{1,2})' + _raDecDiv + '(\d{1,2})' + _raDecDiv + '(\d{1,2}[\.0-9]+)' + _raDecDiv + '$')
+
+def _matchRADecString(radec):
+    """ Returns the (h, m, s, d, m, s) strings of an RA and Dec string, or None if
+        the string can't be parsed. See: parseRADecString
+    """
+    if not isinstance(radec, basestring):
+        return None
+    match = _raDecPattern.search(radec)
+    if match is None:
+        return None
+    return match.groups()
+
+def _parseRADecString(radec):
+    """ Parses a string representing both an RA and Dec into a tuple of
+        decimal (hours, degrees). See: parseRADecString
+    """
+    elems = _matchRADecString(radec)
+    if elems is None:
+        raise ValueError("parseRADecString: Invalid input string! ('{0}')".format(radec))
+    
+    return (hmsToHours(*map(float,elems[:3])), dmsToDegrees(*map(float,elems[3:])))
+
 def parseRADecString(radec, ra_units="hours", dec_units="degrees"):
     """ Parses a string representing both an RA and Dec, for 
         example a Jstring such as J141213.23+161252.12 or
@@ -477,20 +1160,154 @@ def parseRADecString(radec, ra_units="hours", dec_units="degrees"):
             The string representing an RA and Dec
     
     """
+    (ra, dec) = _parseRADecString(radec)
+    return (g.RA(ra, units=ra_units), g.Dec(dec, units=dec_units))
+
+def raDecToJstringArray(ra, dec):
+    """ Converts arrays of RA and Dec into strings formatted in the J2000 IAU 
+        standard, JHHMMSS.ss+DDMMSS.s. 
+        
+        The result is identical to calling `RADec.Jstring` for each position.
+        
+        Parameters
+        ----------
+        ra : array_like
+            Right Ascensions in decimal hours
+        dec : array_like
+            Declinations in decimal degrees
+    """
+    dec = np.asarray(dec, dtype=np.float64)
+    raStrings = hoursToStringArray(ra, precision=2, sep="", pad=True)
+    decStrings = degreesToStringArray(np.abs(dec), precision=1, sep="", pad=True)
+    
+    if raStrings.dtype.itemsize != 9 or decStrings.dtype.itemsize != 8:
+        # Only values outside of the usual RA/Dec ranges get here
+        signs = np.where(dec < 0, "-", "+")
+        return np.char.add(np.char.add(np.char.add("J", raStrings), signs), decStrings)
+    
+    N = raStrings.size
+    chars = np.empty((N, 19), dtype=np.uint8)
+    chars[:,0] = ord("J")
+    chars[:,1:10] = raStrings.view(np.uint8).reshape(N, 9)
+    chars[:,10] = np.where(dec.ravel() < 0, ord("-"), ord("+"))
+    chars[:,11:] = decStrings.view(np.uint8).reshape(N, 8)
+    
+    return chars.view("S19").reshape(raStrings.shape)
+
+def _asStringArray(strings):
+    """ Returns a flattened byte string array of the input, and its original shape """
+    strings = np.asarray(strings)
+    if strings.dtype.kind != "S":
+        try:
+            strings = strings.astype("S")
+        except UnicodeEncodeError:
+            # Non-ASCII characters become '?', so those rows are invalid rather than 
+            #   an error for the whole array
+            strings = np.array([x.encode("ascii", "replace") if isinstance(x, unicode) else str(x) for x in strings.flat], 
+                               dtype="S").reshape(strings.shape)
+    return (strings.ravel(), strings.shape)
+
+def _decodeJstrings(jstrings):
+    """ Decodes a 1D string array of J2000 IAU designations (JHHMMSS.ss+DDMMSS.s) 
+        into arrays of RA (in hours) and Dec (in degrees) with array operations.
+        
+        Returns (ra, dec, valid), where valid is False for strings that aren't in
+        exactly that layout. Their RA and Dec values are undefined.
+    """
+    N = len(jstrings)
+    ra = np.empty(N, dtype=np.float64)
+    dec = np.empty(N, dtype=np.float64)
     
-    div = '[:/\t\shdms°\'\"]{0,2}' # accept these as (one or more repeated) delimiters: :, whitespace, /
-    ra_pattr = '^[J]{0,1}([+-]{0,1}\d{1,2})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + div
-    dec_pattr = '([+-]{0,1}\d{1,3})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + div + '$'
-    pattr = ra_pattr + "[\s|_]*" + dec_pattr
-    try:
-        elems = re.search(pattr, radec).groups()
-    except:
-        raise ValueError("parseRADecString: Invalid input string! ('{0}')".format(radec))
+    if jstrings.dtype.itemsize != 19:
+        return (ra, dec, np.zeros(N, dtype=bool))
+    
+    chars = jstrings.view(np.uint8).reshape(N, 19)
+    digits = chars.astype(np.int64) - ord("0")
+    isDigit = (digits >= 0) & (digits <= 9)
+    
+    valid = (chars[:,0] == ord("J")) & (chars[:,7] == ord(".")) & (chars[:,17] == ord(".")) & \
+            ((chars[:,10] == ord("+")) | (chars[:,10] == ord("-"))) & \
+            np.all(isDigit[:,[1,2,3,4,5,6,8,9,11,12,13,14,15,16,18]], axis=1)
+    
+    # Same operations as hmsToHours and dmsToDegrees, so the values are identical
+    h = 10*digits[:,1] + digits[:,2]
+    m = 10*digits[:,3] + digits[:,4]
+    s = (1000*digits[:,5] + 100*digits[:,6] + 10*digits[:,8] + digits[:,9]) / 100.
+    ra[:] = h + m/60. + s/3600.
+    
+    d = 10*digits[:,11] + digits[:,12]
+    m = 10*digits[:,13] + digits[:,14]
+    s = (100*digits[:,15] + 10*digits[:,16] + digits[:,18]) / 10.
+    sign = np.where(chars[:,10] == ord("-"), -1., 1.)
+    dec[:] = sign * (d + m/60. + s/3600.)
+    
+    return (ra, dec, valid)
 
-    ra = g.RA(hmsToHours(*map(float,elems[:3])), units=ra_units)
-    dec = g.Dec(dmsToDegrees(*map(float,elems[3:])), units=dec_units)
+def parseJstringArray(jstrings):
+    """ Parses an array of strings formatted in the J2000 IAU standard, 
+        JHHMMSS.ss+DDMMSS.s, into arrays of RA (in hours) and Dec (in degrees).
+        
+        Strings in exactly that layout are decoded with array operations. Anything
+        else is passed to `parseRADecString`, which raises a ValueError if it can't 
+        be parsed. Either way the values are identical to those parsed by 
+        `parseRADecString`.
+        
+        Parameters
+        ----------
+        jstrings : array_like
+            The J2000 designations
+    """
+    (jstrings, shape) = _asStringArray(jstrings)
+    (ra, dec, valid) = _decodeJstrings(jstrings)
+    
+    for ii in np.flatnonzero(~valid):
+        (ra[ii], dec[ii]) = _parseRADecString(jstrings[ii])
     
-    return (ra,dec)
+    return (ra.reshape(shape), dec.reshape(shape))
+
+def parseRADecStringArray(radecs, returnMask=False):
+    """ Parses an array or other iterable of strings that each represent an RA 
+        and Dec (see: parseRADecString) into arrays of RA and Dec in radians.
+        
+        J2000 IAU designations are decoded with array operations, and all other 
+        strings are matched against a precompiled pattern. The values are identical
+        to the `radians` of the `RA` and `Dec` objects returned by `parseRADecString`.
+        
+        Parameters
+        ----------
+        radecs : iterable
+            The strings representing an RA and Dec
+        returnMask : bool
+            If False (default), a ValueError is raised for the first string that 
+            can't be parsed. If True, those rows are set to NaN instead and a 
+            boolean array that is True for the rows that were parsed is returned 
+            as a third element.
+    """
+    if not isinstance(radecs, np.ndarray):
+        radecs = list(radecs)
+    (radecs, shape) = _asStringArray(radecs)
+    (ra, dec, valid) = _decodeJstrings(radecs)
+    
+    for ii in np.flatnonzero(~valid):
+        elems = _matchRADecString(radecs[ii])
+        if elems is None:
+            if not returnMask:
+                raise ValueError("parseRADecString: Invalid input string! ('{0}')".format(radecs[ii]))
+            ra[ii] = dec[ii] = np.nan
+            continue
+        
+        ra[ii] = hmsToHours(*map(float,elems[:3]))
+        dec[ii] = dmsToDegrees(*map(float,elems[3:]))
+        valid[ii] = True
+    
+    # Same operations as hoursToRadians and math.radians
+    ra *= 15.
+    np.radians(ra, out=ra)
+    np.radians(dec, out=dec)
+    
+    if returnMask:
+        return (ra.reshape(shape), dec.reshape(shape), valid.reshape(shape))
+    return (ra.reshape(shape), dec.reshape(shape))
     
 # Time Conversions:
 def datetimeToDecimalTime(datetimeObj=None):
@@ -588,6 +1405,42 @@ def ymdToJD(year, month, day):
     
     return B + C + D + day + 1720994.5
 
+def ymdToJDArray(year, month, day):
+    """ Converts arrays of years, months, and (possibly fractional) days to Julian 
+        Dates, equivalent to calling `ymdToJD` on each element, including its 
+        switch from the Julian to the Gregorian calendar.
+        
+        Parameters
+        ----------
+        year : array_like
+            Integer Gregorian years
+        month : array_like
+            Integer Gregorian months
+        day : array_like
+            Gregorian days, which may have a fractional part for the time of day
+        
+        The inputs are broadcast against each other. Returns a float64 array.
+    """
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.float64)
+    
+    januaryOrFebruary = (month == 1) | (month == 2)
+    yprime = np.where(januaryOrFebruary, year - 1, year)
+    mprime = np.where(januaryOrFebruary, month + 12, month)
+    
+    gregorian = (year > 1582) | ((year == 1582) & (month >= 10) & (day >= 15))
+    A = yprime // 100
+    B = np.where(gregorian, 2 - A + A // 4, 0)
+    
+    C = 365.25 * yprime
+    C = np.where(yprime < 0, C - 0.75, C)
+    C = np.trunc(C).astype(np.int64)
+    
+    D = np.trunc(30.6001 * (mprime + 1)).astype(np.int64)
+    
+    return B + C + D + day + 1720994.5
+
 def ymdToMJD(year, month, day):
     """ Converts a year, month, and day to a Modified Julian Date.
     
@@ -628,6 +1481,73 @@ def jdToMJD(jd):
     """
     return float(jd - 2400000.5)
 
+# Two-part Julian Dates
+#   A float64 Julian Date only resolves about 20 microseconds around JD 2.45e6, so
+#   a JD can also be held as a tuple (jd1, jd2) of floats (or arrays) whose sum is 
+#   the date. The functions below return normalized pairs, with jd1 at midnight 
+#   (an integer + 0.5) and 0 <= jd2 < 1 the fraction of the day, which keeps the
+#   time of day to about 10 picoseconds. Functions that accept a two-part JD also
+#   accept a plain float or array.
+
+def _twoSum(a, b):
+    """ Returns (s, e) where s is the float sum of a and b and e is its rounding 
+        error, so s + e == a + b exactly (Knuth's TwoSum).
+    """
+    s = a + b
+    bb = s - a
+    e = (a - (s - bb)) + (b - bb)
+    return (s, e)
+
+def twoPartJD(jd, jd2=0.):
+    """ Normalizes a Julian Date into a two-part JD (jd1, jd2), with jd1 at midnight 
+        and 0 <= jd2 < 1, without losing precision.
+        
+        Parameters
+        ----------
+        jd : float, array_like, tuple
+            A Julian Date (or an array of them), or a two-part JD tuple
+        jd2 : float, array_like
+            An optional second part that is added to `jd`, if it isn't a tuple
+        
+        Returns a tuple (jd1, jd2) of floats (or float64 arrays).
+    """
+    if isinstance(jd, tuple):
+        (jd, jd2) = jd
+    
+    jd = np.asarray(jd, dtype=np.float64)
+    jd2 = np.asarray(jd2, dtype=np.float64)
+    
+    (s, e) = _twoSum(jd, jd2)
+    jd1 = np.floor(s - 0.5) + 0.5
+    jd2 = (s - jd1) + e # s - jd1 is exact
+    
+    carry = np.floor(jd2)
+    jd1 = jd1 + carry
+    jd2 = jd2 - carry
+    
+    # A tiny negative fraction can round up to 1 when the carry is added
+    wrap = jd2 >= 1.
+    jd1 = np.where(wrap, jd1 + 1., jd1)[()]
+    jd2 = np.where(wrap, 0., jd2)[()]
+    return (jd1, jd2)
+
+def addToJD(jd, days):
+    """ Adds a number of days (or an array of them) to a Julian Date or two-part JD,
+        returning a normalized two-part JD (see: twoPartJD).
+    """
+    (jd1, jd2) = twoPartJD(jd)
+    days = np.asarray(days, dtype=np.float64)
+    wholeDays = np.floor(days)
+    return twoPartJD(jd1 + wholeDays, jd2 + (days - wholeDays))
+
+def jdDifference(jdA, jdB):
+    """ Returns the difference jdA - jdB in days between two Julian Dates or 
+        two-part JDs (or arrays of them), to the precision of the parts.
+    """
+    (a1, a2) = twoPartJD(jdA)
+    (b1, b2) = twoPartJD(jdB)
+    return (a1 - b1) + (a2 - b2)
+
 def jdToDatetime(fracJD, timezone=gmt):
     """ Converts a Julian Date to a Python datetime object. The resulting time is in UTC, unless a
         time zone is supplied.
@@ -695,6 +1615,65 @@ def jdToDatetime(fracJD, timezone=gmt):
     
     dtObj = astrodatetime(year, month, day, int(hour), int(min), int(sec), int(ms), tzinfo=gmt)
     return dtObj.astimezone(tz)
+
+def jdToYMDArray(jd):
+    """ Converts an array of Julian Dates to arrays of calendar years, months and
+        fractional days, using the same algorithm and calendar switch as 
+        `jdToDatetime`, so the inverse of `ymdToJDArray`.
+        
+        Parameters
+        ----------
+        jd : array_like
+            Julian Dates
+        
+        Returns a tuple (year, month, day) of int64, int64 and float64 arrays, where
+        the fractional part of the day is the time of day in UTC.
+    """
+    jdTmp = np.asarray(jd, dtype=np.float64) + 0.5
+    I = np.trunc(jdTmp).astype(np.int64)
+    F = jdTmp - I
+    
+    A = np.trunc((I - 1867216.25) / 36524.25).astype(np.int64)
+    B = np.where(I > 2299160, I + 1 + A - A // 4, I)
+    
+    C = B + 1524
+    D = np.trunc((C - 122.1) / 365.25).astype(np.int64)
+    E = np.trunc(365.25 * D).astype(np.int64)
+    G = np.trunc((C - E) / 30.6001).astype(np.int64)
+    
+    day = C - E + F - np.trunc(30.6001 * G).astype(np.int64)
+    month = np.where(G < 13.5, G - 1, G - 13)
+    year = np.where(month > 2.5, D - 4716, D - 4715)
+    
+    return (year, month, day)
+
+def jdToDatetimeArray(jd):
+    """ Converts an array of Julian Dates to an array of `numpy.datetime64` UTC times
+        with microsecond resolution, equivalent to calling `jdToDatetime` on each 
+        element but without creating a datetime object for each one.
+        
+        Parameters
+        ----------
+        jd : array_like
+            Julian Dates
+        
+        Returns a datetime64[us] array with the same shape as `jd`.
+    """
+    (year, month, day) = jdToYMDArray(jd)
+    wholeDay = np.trunc(day)
+    
+    # Split the time of day the way jdToDatetime does, truncating to microseconds
+    hms = hoursToHMSArray((day - wholeDay) * 24.)
+    (sf, s) = np.modf(hms["s"])
+    
+    times = (year - 1970).astype("M8[Y]").astype("M8[M]") + (month - 1).astype("m8[M]")
+    times = times.astype("M8[D]") + (wholeDay.astype(np.int64) - 1).astype("m8[D]")
+    times = times.astype("M8[us]")
+    times += hms["h"].astype("m8[h]")
+    times += hms["m"].astype("m8[m]")
+    times += s.astype(np.int64).astype("m8[s]")
+    times += np.trunc(sf * 1.E6).astype(np.int64).astype("m8[us]")
+    return times
     
 def mjdToDatetime(mjd, timezone=gmt):
     """ Converts a Modified Julian Date to a Python datetime object. 
@@ -730,21 +1709,28 @@ def datetimeToJD(datetimeObj, timezone=None):
             the datetime object, or a `tzinfo` object.
     
     """
+    (A, B) = datetimeToTwoPartJD(datetimeObj, timezone=timezone)
+    return A + B
 
+def datetimeToTwoPartJD(datetimeObj, timezone=None):
+    """ Converts a Python datetime object to a two-part Julian Date (jd1, jd2), 
+        where jd1 is the JD of midnight and jd2 the fraction of the day, see: 
+        datetimeToJD and twoPartJD.
+        
+        Parameters
+        ----------
+        datetimeObj : datetime.datetime
+            A Python datetime.datetime object
+        timezone : int, `datetime.tzinfo`
+            Either an integer specifying the offset from UTC of
+            the datetime object, or a `tzinfo` object.
+    
+    """
     if datetimeObj.utcoffset() == None and timezone == None:
         raise ValueError("Either the input datetime object must know it's timezone (see: datetime.tzinfo), or you must supply a timezone!")
     elif datetimeObj.utcoffset() == None and timezone != None:
         if isinstance(timezone, int):
-            class TZ(py_datetime.tzinfo):
-                def utcoffset(self, dt):
-                    return py_datetime.timedelta(hours=int(timezone))
-                def tzname(self,dt): 
-                    return "GMT {0}".format(int(tz)) 
-                def dst(self,dt): 
-                    return py_datetime.timedelta(0)
-            tz = TZ()
-            datetimeObj = datetimeObj.replace(tzinfo=tz)
-            
+            datetimeObj = datetimeObj.replace(tzinfo=intTimezoneToTzinfo(timezone))
         elif isinstance(timezone, py_datetime.tzinfo):
             datetimeObj = datetimeObj.replace(tzinfo=timezone)
         else:
@@ -754,7 +1740,7 @@ def datetimeToJD(datetimeObj, timezone=None):
     
     A = ymdToJD(utcDatetime.year, utcDatetime.month, utcDatetime.day)
     B = datetimeToDecimalTime(utcDatetime.time()) / 24.0
-    return A + B
+    return (A, B)
 
 def datetimeToMJD(datetimeObj, timezone=None):
     """ Converts a Python datetime object to a float Modified Julian Date (MJD).
@@ -795,24 +1781,171 @@ def datetimeToGMST(datetimeObj, timezone=None):
     
     """
     
-    jd = datetimeToJD(datetimeObj, timezone=timezone)
-    
+    return jdToGMST(datetimeToTwoPartJD(datetimeObj, timezone=timezone))
+
+def _siderealTime(jd, out, apparent):
+    """ Converts Julian Dates to Greenwich mean (or apparent, including the 
+        nutation in longitude) sidereal time in hours, see: jdToGMST.
+    """
     # algorithm described on USNO web site http://aa.usno.navy.mil/faq/docs/GAST.php
-    jd0 = np.round(jd-.5)+.5
-    h = (jd - jd0) * 24.0
-    d = jd - 2451545.0
-    d0 = jd0 - 2451545.0
-    t = d/36525
+    #   evaluated in place in a few buffers, in the same order as the operations in
+    #   the formulae so the results match a scalar calculation
+    if isinstance(jd, tuple):
+        # The fraction of a two-part JD gives the time of day at full precision
+        (jd0, h) = twoPartJD(jd)
+        shape = np.shape(jd0)
+        jd0 = np.array(jd0, dtype=np.float64).reshape(-1)
+        h = np.array(h, dtype=np.float64).reshape(-1)
+        d = jd0 - 2451545.0
+        d += h
+        h *= 24.0
+    else:
+        jd = np.asarray(jd, dtype=np.float64)
+        shape = jd.shape
+        jd = jd.reshape(-1)
+        if out is not None and np.may_share_memory(out, jd):
+            jd = jd.copy()
+        
+        jd0 = np.round(jd - .5)
+        jd0 += .5
+        h = np.subtract(jd, jd0)
+        h *= 24.0
+        d = jd - 2451545.0
     
     #mean sidereal time @ greenwich
-    gmst = 6.697374558 + 0.06570982441908*d0 + 0.000026*t**2 + 1.00273790935*h
-    #- 1.72e-9*t**3 #left off as precision to t^3 is unneeded
+    #   gmst = 6.697374558 + 0.06570982441908*d0 + 0.000026*t**2 + 1.00273790935*h
+    #   - 1.72e-9*t**3 #left off as precision to t^3 is unneeded
+    gmst = jd0
+    gmst -= 2451545.0
+    gmst *= 0.06570982441908
+    gmst += 6.697374558
+    t = np.divide(d, 36525)
+    np.square(t, out=t)
+    t *= 0.000026
+    gmst += t
+    h *= 1.00273790935
+    gmst += h
+    
+    if apparent:
+        cosEps = t
+        np.multiply(d, -0.0000004, out=cosEps)
+        cosEps += 23.4393
+        np.cos(np.radians(cosEps, out=cosEps), out=cosEps) #obliquity
+        
+        sin2L = h
+        np.multiply(d, 0.98565, out=sin2L)
+        sin2L += 280.47
+        np.radians(sin2L, out=sin2L) #mean longitude of the sun
+        sin2L *= 2
+        np.sin(sin2L, out=sin2L)
+        
+        dpsi = d
+        dpsi *= -0.052954
+        dpsi += 125.04
+        np.sin(np.radians(dpsi, out=dpsi), out=dpsi) #longitude of ascending node of moon
+        dpsi *= -0.000319
+        sin2L *= -0.000024
+        dpsi += sin2L #nutation longitude
+        
+        # the equation of the equinoxes
+        dpsi *= cosEps
+        gmst += dpsi
+    
+    if out is None:
+        gmst %= 24.0
+        return gmst.reshape(shape) if len(shape) > 0 else gmst[0]
+    return np.remainder(gmst.reshape(shape), 24.0, out=out)
+
+def jdToGMST(jd, out=None):
+    """ Converts Julian Dates to Greenwich Mean Sidereal Time in hours.
+        
+        Parameters
+        ----------
+        jd : float, array_like, tuple
+            Julian Dates, or a two-part JD (see: twoPartJD) for full precision in
+            the time of day
+        out : `numpy.ndarray`
+            An optional float64 array with the same shape as `jd` to write the
+            result into, which may be `jd` itself.
+        
+        Returns a float (or a float64 array with the shape of `jd`).
+    """
+    return _siderealTime(jd, out, apparent=False)
+
+def jdToGAST(jd, out=None):
+    """ Converts Julian Dates to Greenwich Apparent Sidereal Time in hours, which is
+        the mean sidereal time corrected for the nutation in longitude (by up to 
+        about a second), see: jdToGMST.
+    """
+    return _siderealTime(jd, out, apparent=True)
+
+def _anglesToHours(angles, units):
+    """ Parses an angle or an array of angles in `units` into float hours. """
+    unit = resolveUnits(units)
+    if np.ndim(angles) == 0:
+        if unit is DEGREES:
+            return parseDegrees(angles) / 15.
+        elif unit is RADIANS:
+            return radiansToHours(parseRadians(angles))
+        return parseHours(angles)
+    
+    if unit.parseArray is None:
+        hours = np.array(angles, dtype=np.float64)
+    else:
+        hours = unit.parseArray(angles)
+    
+    if unit is DEGREES:
+        hours /= 15.
+    elif unit is RADIANS:
+        np.degrees(hours, out=hours)
+        hours /= 15.
+    return hours
+
+def _eastLongitudeHours(longitude, longitudeDirection, longitudeUnits):
+    """ Parses a longitude (or an array of longitudes) into hours east of 
+        Greenwich, see: gmstToLST.
+    """
+    if longitudeDirection.lower() not in ("w", "e"):
+        raise AssertionError("longitudeDirection must be W or E")
     
-    eps =  np.radians(23.4393 - 0.0000004*d) #obliquity
-    L = np.radians(280.47 + 0.98565*d) #mean longitude of the sun
-    omega = np.radians(125.04 - 0.052954*d) #longitude of ascending node of moon
-    dpsi = -0.000319*np.sin(omega) - 0.000024*np.sin(2*L) #nutation longitude
-    return (gmst + dpsi*np.cos(eps)) % 24.0
+    longitudeHours = _anglesToHours(longitude, longitudeUnits)
+    if longitudeDirection.lower() == "w":
+        return np.negative(longitudeHours)
+    return longitudeHours
+
+def jdToLST(jd, longitude, longitudeDirection="w", longitudeUnits="degrees", out=None):
+    """ Converts Julian Dates to Local Sidereal Time in hours at one or more 
+        longitudes, see: jdToGMST and gmstToLST.
+        
+        Parameters
+        ----------
+        jd : float, array_like, tuple
+            Julian Dates, or a two-part JD (see: twoPartJD)
+        longitude : float, int, `Angle`, str, array_like
+            The longitude (or an array of longitudes) in the specified units, which 
+            is broadcast against `jd`, e.g. a column of longitudes and a row of 
+            times give a grid of sidereal times.
+        longitudeDirection : str, {'W', 'E'}
+            The direction from Greenwich that the longitude is measured in. 
+            Can be "E" or "W" (east or west), but by default is WEST ("W")
+        longitudeUnits : str 
+            Can be 'degrees', 'radians', or 'hours', default is "degrees"
+        out : `numpy.ndarray`
+            An optional float64 array with the broadcast shape to write the result
+            into.
+        
+        Returns a float (or a float64 array).
+    """
+    longitudeHours = _eastLongitudeHours(longitude, longitudeDirection, longitudeUnits)
+    
+    jdShape = np.broadcast(*jd).shape if isinstance(jd, tuple) else np.shape(jd)
+    if out is not None and out.shape == jdShape and not np.may_share_memory(out, longitudeHours):
+        gmst = jdToGMST(jd, out=out)
+    else:
+        gmst = jdToGMST(jd)
+    
+    lst = np.add(gmst, longitudeHours, out=out)
+    return np.remainder(lst, 24.0, out=out)
 
 def gmstToDatetime(datetimeObj, timezone=None):
     """ Converts a datetime object representing a Greenwich Mean Sidereal Time 
@@ -848,6 +1981,14 @@ def gmstToDatetime(datetimeObj, timezone=None):
         tz = timezone
     return astrodatetime(year=datetimeObj.year, month=datetimeObj.month, day=datetimeObj.day, hour=h, minute=m, second=int(s), microsecond=int(ms), tzinfo=gmt).astimezone(tz)
 
+def _sphericalRadians(angles, unit):
+    """ Returns a float64 array of radians from an array (or list) of values in 
+        `unit`, or of Angle objects.
+    """
+    if isinstance(angles, np.ndarray) and angles.dtype != object:
+        return unit.toRadiansArray(angles)
+    return np.array([x.radians if hasattr(x, "radians") else unit.toRadians(unit.parse(x)) for x in angles], dtype=np.float64)
+
 def sphericalAnglesToCartesian(a, b, units="radians"):
     """ Converts two angles on the surface of a (unit) sphere into Cartesian 
         coordinates
@@ -868,18 +2009,10 @@ def sphericalAnglesToCartesian(a, b, units="radians"):
         
     """
     
-    if isinstance(a, list) or isinstance(b, list):
-        a = np.array(a)
-        b = np.array(b)
-    
-    if isinstance(a, np.ndarray):
-        if not isinstance(a[0], g.Angle) or not isinstance(b[0], g.Angle):
-            a = np.array([g.Angle(x, units=units) for x in a])
-            b = np.array([g.Angle(x, units=units) for x in b])
-            
-        ar = np.array([x.radians for x in a])
-        br = np.array([x.radians for x in b])
-        #resultVector = np.zeros((3,len(ar)), dtype=float)
+    unit = resolveUnits(units)
+    if isinstance(a, list) or isinstance(b, list) or isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        ar = _sphericalRadians(a, unit)
+        br = _sphericalRadians(b, unit)
     else:
         if not isinstance(a, g.Angle) or not isinstance(b, g.Angle):
             a = g.Angle(a, units=units)
@@ -934,6 +2067,43 @@ def cartesianToSphericalAngles(x, y, z):
     
     return (g.Angle.fromRadians(a), g.Angle.fromRadians(b))
 
+def sphericalToUnitVectors(a, b, out=None):
+    """ Converts two arrays of angles in radians on the surface of a unit sphere
+        (e.g. RA and Dec) into an array of Cartesian unit vectors with shape 
+        a.shape + (3,).
+        
+        Parameters
+        ----------
+        a : float, `numpy.ndarray`
+            The longitude-like angles in radians
+        b : float, `numpy.ndarray`
+            The latitude-like angles in radians
+        out : `numpy.ndarray` (optional)
+            An array with shape a.shape + (3,) to store the result in
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if out is None:
+        out = np.empty(np.broadcast(a, b).shape + (3,), dtype=np.float64)
+    
+    cos_b = np.cos(b)
+    np.multiply(np.cos(a), cos_b, out=out[...,0])
+    np.multiply(np.sin(a), cos_b, out=out[...,1])
+    np.sin(b, out=out[...,2])
+    return out
+
+def unitVectorsToSpherical(xyz):
+    """ Converts an array of Cartesian vectors with shape (..., 3) into two arrays
+        of angles in radians on the surface of a unit sphere, (a, b), with a in 
+        the range [0, 2*pi).
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    (x, y, z) = (xyz[...,0], xyz[...,1], xyz[...,2])
+    
+    a = np.mod(np.arctan2(y, x), 2.*np.pi)
+    b = np.arctan2(z, np.hypot(x, y))
+    return (a, b)
+
 def j2000ToGalactic(ra, dec):
     """ Takes an ra,dec and converts it to Galactic coordinates
         
@@ -947,11 +2117,7 @@ def j2000ToGalactic(ra, dec):
         
     """
     xyz = np.array(sphericalAnglesToCartesian(ra, dec))
-    rotMatrix = np.array([[-0.054875539, 0.494109454, -0.867666136],\
-                          [-0.873437105, -0.444829594, -0.198076390],\
-                          [-0.483834992, 0.746982249, 0.455983795]])
-    
-    newxyz = np.dot(xyz, rotMatrix)
+    newxyz = np.dot(xyz, j2000ToGalacticMatrix)
     return cartesianToSphericalAngles(*newxyz)
 
 # =====================================
@@ -986,32 +2152,15 @@ def gmstToLST(gmst, longitude, gmstUnits="hours", longitudeDirection="w", longit
     
     """
     
-    if gmstUnits.lower() == "degrees":
+    gmstUnit = resolveUnits(gmstUnits)
+    if gmstUnit is DEGREES:
         parsedHour = parseDegrees(gmst) / 15.
-    elif gmstUnits.lower() == "radians":
+    elif gmstUnit is RADIANS:
         parsedHour = radiansToHours(parseRadians(gmst))
-    elif gmstUnits.lower() == "hours":
-        parsedHour = parseHours(gmst)
-    else:
-        raise IllegalUnitsError("{0}".format(gmstUnits))
-    
-    if longitudeUnits.lower() == "degrees":
-        longitudeHours = parseDegrees(longitude) / 15.
-    elif longitudeUnits.lower() == "radians":
-        longitudeHours = radiansToHours(parseRadians(longitude))
-    elif longitudeUnits.lower() == "hours":
-        longitudeHours = parseHours(longitude)
-    else:
-        raise IllegalUnitsError("{0}".format(longitudeUnits))
-        
-    if longitudeDirection.lower() == "w":
-        lst = parsedHour - longitudeHours
-    elif longitudeDirection.lower() == "e":
-        lst = parsedHour + longitudeHours
     else:
-        raise AssertionError("longitudeDirection must be W or E")
+        parsedHour = parseHours(gmst)
     
-    lst = lst % 24.0
+    lst = (parsedHour + _eastLongitudeHours(longitude, longitudeDirection, longitudeUnits)) % 24.0
     
     if outputHMS:
         return hoursToHMS(lst)
@@ -1173,17 +2322,161 @@ def raLSTToHa(ra, hour, minute=None, second=None, raUnits='HOURS'):
     
     return HA
 
-def haLST2ra():
-    pass
+def haLST2ra(ha, hour, minute=None, second=None, raUnits='HOURS'):
+    """ 
+    Converts an Hour Angle to a Right Ascension, given the Local Sidereal Time.
+    
+    Parameters
+    ----------
+    ha : float (any numeric type), array_like
+        An hour angle in HOURS
+    hour : int (or float)
+        If an integer, the function will expect a minute and second. If a float, it
+        will ignore minute and second and convert from decimal hours to hh:mm:ss.
+    minute : int
+        Ignored if hour is a float.
+    second : int (any numeric type, to include microseconds)
+        Ignored if hour is a float.
+    raUnits : string
+        Can be either HOURS or DEGREES, defaults to HOURS.
+    
+    Returns
+    -------
+    ra : float
+        The right ascension in raUnits, in the range [0,24) hours or [0,360) degrees
+    
+    """
+    if minute != None and second != None:
+        hours = hmsToHours(hour, minute, second)
+    elif minute == None and second == None:
+        hours = hour
+    else:
+        raise AssertionError('minute and second must either be both set, or both unset.')
+    
+    ra = np.remainder(np.subtract(hours, ha), 24.0)
+    if raUnits.upper() == 'HOURS':
+        return ra
+    elif raUnits.upper() == 'DEGREES':
+        return ra * 15.0
+    else:
+        raise AssertionError('raUnits must be either HOURS or DEGREES')
 
-def raUTC2ha():
-    pass
+def raUTC2ha(ra, datetimeObj, longitude, longitudeDirection='W', longitudeUnits='DEGREES', raUnits='HOURS'):
+    """ 
+    Converts a Right Ascension to an Hour Angle at a given time and longitude, see: 
+    raLSTToHa and jdToLST. The time can also be a Julian Date or a two-part JD,
+    and the RA an array.
+    """
+    lst = jdToLST(_timeToJD(datetimeObj), longitude, longitudeDirection=longitudeDirection, longitudeUnits=longitudeUnits)
+    return raLSTToHa(ra, lst, raUnits=raUnits)
 
-def haUTC2ra():
-    pass
+def haUTC2ra(ha, datetimeObj, longitude, longitudeDirection='W', longitudeUnits='DEGREES', raUnits='HOURS'):
+    """ 
+    Converts an Hour Angle (in hours) to a Right Ascension at a given time and 
+    longitude, see: haLST2ra and jdToLST. The time can also be a Julian Date or a 
+    two-part JD, and the hour angle an array.
+    """
+    lst = jdToLST(_timeToJD(datetimeObj), longitude, longitudeDirection=longitudeDirection, longitudeUnits=longitudeUnits)
+    return haLST2ra(ha, lst, raUnits=raUnits)
+
+def _timeToJD(time):
+    """ Returns the two-part Julian Dates (see: twoPartJD) of an AstroTimeArray, a 
+        datetime object, a sequence of datetimes, a numpy datetime64 array in UTC, 
+        or a two-part JD. Julian Dates are returned as a float64 array, as 
+        splitting them wouldn't add any precision.
+    """
+    if isinstance(time, AstroTimeArray):
+        return time.twoPartJD
+    if isinstance(time, tuple):
+        return twoPartJD(time)
+    if isinstance(time, py_datetime.datetime):
+        return datetimeToTwoPartJD(time)
+    
+    time = np.asarray(time)
+    if time.dtype == object or time.dtype.kind == "M":
+        return AstroTimeArray(time).twoPartJD
+    return time.astype(np.float64)
+
+def _timeShape(jd):
+    """ Returns the shape of the times returned by _timeToJD. """
+    return np.shape(jd[0]) if isinstance(jd, tuple) else np.shape(jd)
+
+# The rate of mean sidereal time in sidereal hours per hour of UT, see: jdToGMST
+_siderealRate = 1.00273790935
+
+def _nextTransitJD(raHours, jd, eastLongitudeHours):
+    """ Returns the two-part JD of the first transit at or after the Julian Date 
+        (or two-part JD) `jd` of an RA (or an array of them broadcast against `jd`) 
+        in hours, at a longitude in hours east of Greenwich.
+    """
+    lst = jdToLST(jd, eastLongitudeHours, longitudeDirection="e", longitudeUnits="hours")
+    siderealHours = np.remainder(np.subtract(raHours, lst), 24.0)
+    return addToJD(jd, siderealHours / (24.0 * _siderealRate))
+
+def _riseSetHourAngle(dec, latitude, altitude):
+    """ Returns the hour angles in sidereal hours, in [0,12], at which declinations 
+        in radians cross an altitude in radians at a latitude in radians, from
+            cos(ha) = (sin(alt) - sin(lat) sin(dec)) / (cos(lat) cos(dec))
+        and boolean masks of the declinations that are always above the altitude
+        (circumpolar) and never rise above it. The hour angle of those is NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosHA = (math.sin(altitude) - math.sin(latitude) * np.sin(dec)) / (math.cos(latitude) * np.cos(dec))
+        circumpolar = cosHA < -1.
+        neverRises = cosHA > 1.
+        ha = np.degrees(np.arccos(cosHA)) / 15.
+    return (ha, circumpolar, neverRises)
+
+def _riseTransitSetJD(raHours, dec, jd, latitude, eastLongitudeHours, altitude):
+    """ Returns the two-part JDs of the rise, transit and set of RAs in hours and 
+        declinations in radians (broadcast against the Julian Dates or two-part JD 
+        `jd`) around the transit nearest to `jd`, and the circumpolar and never
+        rising masks of the declinations, see: _riseSetHourAngle
+        
+        The rise and set times of circumpolar and never rising targets are NaN.
+    """
+    lst = jdToLST(jd, eastLongitudeHours, longitudeDirection="e", longitudeUnits="hours")
+    ha = np.remainder(lst - raHours + 12.0, 24.0) - 12.0
+    transit = addToJD(jd, ha / (-24.0 * _siderealRate))
+    
+    (setHA, circumpolar, neverRises) = _riseSetHourAngle(dec, latitude, altitude)
+    days = setHA / (24.0 * _siderealRate)
+    with np.errstate(invalid="ignore"):
+        return (addToJD(transit, -days), transit, addToJD(transit, days), circumpolar, neverRises)
 
-def ra2transitTime():
-    pass
+def ra2transitTime(ra, datetimeObj, longitude, longitudeDirection='W', longitudeUnits='DEGREES', raUnits='HOURS'):
+    """ 
+    Finds the first time at or after a given time that a Right Ascension crosses 
+    the meridian at a given longitude.
+    
+    Parameters
+    ----------
+    ra : float (any numeric type), array_like
+        A right ascension (or an array of them) in raUnits
+    datetimeObj : datetime.datetime
+        A Python datetime.datetime object that knows its time zone, or any of the
+        times accepted by raDec2AltAzGrid, which are broadcast against `ra`
+    longitude : float (any numeric type)
+        The longitude of the site, see: gmstToLST
+    longitudeDirection : string
+        Default is longitude WEST, 'W', but you can specify EAST by passing 'E'.
+    longitudeUnits : string
+        Can be 'DEGREES', 'RADIANS' or 'HOURS', defaults to DEGREES.
+    raUnits : string
+        Can be 'HOURS', 'DEGREES' or 'RADIANS', defaults to HOURS.
+    
+    Returns
+    -------
+    transit : astrodatetime, AstroTimeArray
+        The transit time (or times, if `ra` or the times are arrays) in GMT
+    
+    """
+    eastLongitudeHours = _eastLongitudeHours(longitude, longitudeDirection, longitudeUnits)
+    jd = _timeToJD(datetimeObj)
+    transits = AstroTimeArray.fromJD(_nextTransitJD(_anglesToHours(ra, raUnits), jd, eastLongitudeHours))
+    if np.ndim(ra) == 0 and _timeShape(jd) == ():
+        return transits[0]
+    return transits
     
 def raDec2AltAz(ra, dec, latitude, longitude, datetimeObj, longitudeDirection='W'):
     """ 
@@ -1191,16 +2484,17 @@ def raDec2AltAz(ra, dec, latitude, longitude, datetimeObj, longitudeDirection='W
     
     Parameters
     ----------
-    ra : float (any numeric type)
+    ra : float (any numeric type), array_like
         A Right Ascension, default units DEGREES
-    dec : float (any numeric type)
+    dec : float (any numeric type), array_like
         A Declination, default units DEGREES
     latitude : float (any numeric type)
         A latitude in DEGREES
     longitide : float (any numeric type)
         A longitude in DEGREES
     datetimeObj : datetime.datetime
-        A Python datetime.datetime object
+        A Python datetime.datetime object, or any of the times accepted by 
+        raDec2AltAzGrid
     longitudeDirection : string
         Default is longitude WEST, 'W', but you can specify EAST by passing 'E'.
         
@@ -1209,30 +2503,403 @@ def raDec2AltAz(ra, dec, latitude, longitude, datetimeObj, longitudeDirection='W
     alt : float
         Altitude, default units DEGREES
     az : float
-        Azimuth, default units DEGREES
+        Azimuth east of north, default units DEGREES
+    
+    For arrays of positions or times, see: raDec2AltAzGrid
+    """ 
+    (alt, az) = raDec2AltAzGrid(ra, dec, datetimeObj, latitude, longitude, longitudeDirection=longitudeDirection)
+    return (alt[()], az[()])
+
+# The default limit in bytes on the temporary arrays of raDec2AltAzGrid
+_gridMemory = 64 * 2**20
+
+# The airmass formulae of airmass and raDec2AltAzGrid
+_airmassFormulas = ("plane-parallel", "kasten-young")
+
+def _checkAirmassFormula(formula):
+    """ Returns the name of an airmass formula in lower case, see: airmass """
+    name = str(formula).lower()
+    if name not in _airmassFormulas:
+        raise ValueError("Unknown airmass formula '{0}', must be one of {1}.".format(formula, ", ".join(_airmassFormulas)))
+    return name
+
+def _sinAltToAirmass(sinAlt, alt, formula, scratch):
+    """ Computes the airmass from the sines of altitudes in place, given the 
+        altitudes in radians, see: airmass. `scratch` is a temporary array with 
+        the shape of the altitudes.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if formula == "kasten-young":
+            # X = 1 / (sin(alt) + 0.50572 (alt + 6.07995 degrees)^-1.6364)
+            np.degrees(alt, out=scratch)
+            scratch += 6.07995
+            np.power(scratch, -1.6364, out=scratch)
+            scratch *= 0.50572
+            sinAlt += scratch
+        np.divide(1., sinAlt, out=sinAlt)
+        sinAlt[alt < 0.] = np.nan
+
+def airmass(alt, formula="plane-parallel", units='DEGREES'):
+    """ 
+    Computes the airmass at altitudes (elementwise, for an array of them).
+    
+    Parameters
+    ----------
+    alt : float (any numeric type), array_like
+        Altitudes in units
+    formula : string
+        'plane-parallel' (default) for sec(z) of a flat atmosphere, or 
+        'kasten-young' for the Kasten & Young (1989) formula, which stays finite
+        down to the horizon
+    units : string
+        Can be 'DEGREES' (default) or 'RADIANS'.
+    
+    Returns
+    -------
+    airmass : float, `numpy.ndarray`
+        The airmass, NaN below the horizon
     
+    For a grid of targets and times, see: raDec2AltAzGrid
+    """
+    formula = _checkAirmassFormula(formula)
+    unit = resolveUnits(units)
+    if unit is HOURS:
+        raise IllegalUnitsError(units)
+    
+    alt = unit.toRadiansArray(alt)
+    X = np.sin(alt, out=np.empty_like(alt))
+    _sinAltToAirmass(X, alt, formula, np.empty_like(alt))
+    return X[()]
+
+def _altAzGrid(ra, dec, jd, latitude, eastLongitudeHours, alt, az, toDegrees, maxMemory, 
+               airmass=None, parallacticAngle=None, airmassFormula="plane-parallel"):
+    """ Computes the altitudes and azimuths (east of north) in radians, or degrees if 
+        `toDegrees`, of a 1D array of target positions in radians at a 1D array of 
+        (two-part) Julian Dates, writing them into the (targets, times) arrays 
+        `alt` and `az`.
+        
+        The airmass and parallactic angle are written into the arrays `airmass` 
+        and `parallacticAngle` if they are given, from the same sines and cosines.
+        Any of the outputs can be None to skip it.
+        
+        The grid is computed in blocks of cells so the temporary arrays are at 
+        most `maxMemory` bytes.
+    """
+    lst = np.radians(jdToLST(jd, eastLongitudeHours, longitudeDirection="e", longitudeUnits="hours") * 15.)
+    lst = np.atleast_1d(lst)
+    (nTargets, nTimes) = (len(ra), len(lst))
+    
+    # The per-target terms are computed once, in the order of the formulae
+    #   sin(alt) = sin(dec) sin(lat) + cos(dec) cos(lat) cos(ha)
+    #   tan(az) = -cos(dec) sin(ha) / (sin(dec) cos(lat) - cos(dec) sin(lat) cos(ha))
+    #   tan(q) = sin(ha) / (tan(lat) cos(dec) - sin(dec) cos(ha))
+    (sinLat, cosLat) = (np.sin(latitude), np.cos(latitude))
+    (sinDec, cosDec) = (np.sin(dec), np.cos(dec))
+    sinDecSinLat = (sinDec * sinLat)[:,np.newaxis]
+    cosDecCosLat = (cosDec * cosLat)[:,np.newaxis]
+    sinDecCosLat = (sinDec * cosLat)[:,np.newaxis]
+    minusCosDecSinLat = (-cosDec * sinLat)[:,np.newaxis]
+    minusCosDec = (-cosDec)[:,np.newaxis]
+    tanLatCosDec = (np.tan(latitude) * cosDec)[:,np.newaxis]
+    minusSinDec = (-sinDec)[:,np.newaxis]
+    ra = ra[:,np.newaxis]
+    fullCircle = 360. if toDegrees else 2*math.pi
+    
+    # The altitudes go in a temporary block if they aren't wanted
+    temporaries = 3 if alt is None else 2
+    cells = max(1, maxMemory // (8 * temporaries))
+    columns = min(nTimes, cells)
+    rows = max(1, min(nTargets, cells // max(columns, 1)))
+    sinHA = np.empty((rows, columns))
+    cosHA = np.empty((rows, columns))
+    if alt is None:
+        altScratch = np.empty((rows, columns))
+    
+    for r0 in range(0, nTargets, rows):
+        r1 = min(r0 + rows, nTargets)
+        for c0 in range(0, nTimes, columns):
+            c1 = min(c0 + columns, nTimes)
+            sinHABlock = sinHA[:r1-r0,:c1-c0]
+            cosHABlock = cosHA[:r1-r0,:c1-c0]
+            altBlock = altScratch[:r1-r0,:c1-c0] if alt is None else alt[r0:r1,c0:c1]
+            
+            np.subtract(lst[c0:c1], ra[r0:r1], out=sinHABlock)
+            np.cos(sinHABlock, out=cosHABlock)
+            np.sin(sinHABlock, out=sinHABlock)
+            
+            np.multiply(cosDecCosLat[r0:r1], cosHABlock, out=altBlock)
+            altBlock += sinDecSinLat[r0:r1]
+            np.clip(altBlock, -1., 1., out=altBlock)
+            if airmass is not None:
+                airmassBlock = airmass[r0:r1,c0:c1]
+                airmassBlock[...] = altBlock
+            np.arcsin(altBlock, out=altBlock)
+            
+            if parallacticAngle is not None:
+                qBlock = parallacticAngle[r0:r1,c0:c1]
+                np.multiply(minusSinDec[r0:r1], cosHABlock, out=qBlock)
+                qBlock += tanLatCosDec[r0:r1]
+                np.arctan2(sinHABlock, qBlock, out=qBlock)
+                if toDegrees:
+                    np.degrees(qBlock, out=qBlock)
+            
+            if az is not None:
+                azBlock = az[r0:r1,c0:c1]
+                sinHABlock *= minusCosDec[r0:r1]
+                cosHABlock *= minusCosDecSinLat[r0:r1]
+                cosHABlock += sinDecCosLat[r0:r1]
+                np.arctan2(sinHABlock, cosHABlock, out=azBlock)
+                np.remainder(azBlock, 2*math.pi, out=azBlock)
+                if toDegrees:
+                    np.degrees(azBlock, out=azBlock)
+                # The remainder of a tiny negative angle (e.g. at a pole) rounds to
+                #   a full circle
+                azBlock[azBlock >= fullCircle] = 0.
+            
+            # The cosines of the hour angles are no longer needed
+            if airmass is not None:
+                _sinAltToAirmass(airmassBlock, altBlock, airmassFormula, cosHABlock)
+            
+            if toDegrees:
+                np.degrees(altBlock, out=altBlock)
+
+def raDec2AltAzGrid(ra, dec, times, latitude, longitude, longitudeDirection='W', units='DEGREES', out=None, maxMemory=_gridMemory, 
+                    airmassFormula=None, parallacticAngle=False):
     """ 
-    gmst = utcDatetimeToGMST(datetimeObj)
-    h,m,s = gmstToLST(longitude, gmst.hour, gmst.minute, gmst.second)
-    lst = (h + m/60.0 + s/3600.0) * 15.0
-    ha = lst - ra
+    Converts arrays of RA and Dec to Alt Az at an array of times, for every 
+    combination of target and time, and optionally the airmass and parallactic 
+    angle from the same intermediate terms.
     
-    alt_rads = asin(sin(radians(dec))*sin(radians(latitude)) + \
-        cos(radians(dec))*cos(radians(latitude))*cos(radians(ha)))
+    Parameters
+    ----------
+    ra : float, array_like
+        The Right Ascensions of the targets in units
+    dec : float, array_like
+        The Declinations of the targets in units, with the same shape as ra
+    times : AstroTimeArray, datetime.datetime, array_like, tuple
+        The times, as an AstroTimeArray, a datetime object or a sequence of them, 
+        a numpy datetime64 array in UTC, Julian Dates, or a two-part JD (see: 
+        twoPartJD)
+    latitude : float, `Angle`, str
+        The latitude of the site in units
+    longitude : float, `Angle`, str
+        The longitude of the site in units
+    longitudeDirection : string
+        Default is longitude WEST, 'W', but you can specify EAST by passing 'E'.
+    units : string
+        The units of the positions, the site and the results. Can be 'DEGREES' 
+        (default) or 'RADIANS'.
+    out : tuple
+        An optional tuple of C-contiguous float64 arrays, one for each result, 
+        with the shape of the results to write them into
+    maxMemory : int
+        The grid is computed in blocks so its temporary arrays take at most about
+        this many bytes
+    airmassFormula : string
+        If given, also return the airmass from this formula, see: airmass
+    parallacticAngle : bool
+        If True, also return the parallactic angle
     
-    cos_az = (sin(radians(dec)) - sin(alt_rads)*sin(radians(latitude))) / \
-        (cos(alt_rads) * cos(radians(latitude)))
-        
-    alt = degrees(alt_rads)
-    az = degrees(acos(cos_az))
-        
-    if sin(radians(ha)) < 0:
-        return alt, az
-    else:
-        return alt, (360.0 - az)
+    Returns
+    -------
+    alt : `numpy.ndarray`
+        Altitudes in units, with the shape of the targets followed by the shape of
+        the times, e.g. (Ntargets, Ntimes)
+    az : `numpy.ndarray`
+        Azimuths east of north in the range [0,360) degrees (or [0,2pi) radians)
+    airmass : `numpy.ndarray`
+        If airmassFormula is given, the airmass (NaN below the horizon)
+    parallacticAngle : `numpy.ndarray`
+        If parallacticAngle is True, the parallactic angle in units, in the range
+        [-180,180] degrees, positive west of the meridian
     
-def altAz2RaDec():
-    pass
+    """
+    unit = resolveUnits(units)
+    latitude = unit.toRadians(unit.parse(latitude))
+    eastLongitudeHours = _eastLongitudeHours(longitude, longitudeDirection, unit)
+    return _raDec2AltAzGrid(ra, dec, times, latitude, eastLongitudeHours, unit, out, maxMemory, 
+                            airmassFormula=airmassFormula, parallacticAngle=parallacticAngle)
+
+def _raDec2AltAzGrid(ra, dec, times, latitude, eastLongitudeHours, unit, out, maxMemory, 
+                     airmassFormula=None, parallacticAngle=False):
+    """ raDec2AltAzGrid for a site with a latitude in radians and a longitude in 
+        hours east of Greenwich.
+    """
+    quantities = ["alt", "az"]
+    if airmassFormula is not None:
+        quantities.append("airmass")
+    if parallacticAngle:
+        quantities.append("parallacticAngle")
+    return _raDecGrid(ra, dec, times, latitude, eastLongitudeHours, unit, quantities, out, maxMemory, airmassFormula)
+
+def _raDecGrid(ra, dec, times, latitude, eastLongitudeHours, unit, quantities, out, maxMemory, airmassFormula=None):
+    """ Computes the named quantities of _altAzGrid ('alt', 'az', 'airmass' and 
+        'parallacticAngle') on the grid of targets and times, see: raDec2AltAzGrid.
+        Returns a tuple of the results in the order of the names.
+    """
+    if unit is HOURS:
+        raise IllegalUnitsError(unit.name)
+    if airmassFormula is not None:
+        airmassFormula = _checkAirmassFormula(airmassFormula)
+    
+    ra = unit.toRadiansArray(ra)
+    dec = unit.toRadiansArray(dec)
+    if ra.shape != dec.shape:
+        raise ValueError("raDec2AltAzGrid: ra and dec must have the same shape ({0} and {1}).".format(ra.shape, dec.shape))
+    
+    jd = _timeToJD(times)
+    shape = ra.shape + _timeShape(jd)
+    jd = (np.ravel(jd[0]), np.ravel(jd[1])) if isinstance(jd, tuple) else np.ravel(jd)
+    
+    if out is None:
+        out = tuple(np.empty(shape) for name in quantities)
+    if len(out) != len(quantities):
+        raise ValueError("raDec2AltAzGrid: out must be a tuple of {0} arrays.".format(len(quantities)))
+    for array in out:
+        if array.shape != shape or array.dtype != np.float64 or not array.flags.c_contiguous:
+            raise ValueError("raDec2AltAzGrid: out must be C-contiguous float64 arrays with shape {0}.".format(shape))
+    
+    if np.prod(shape) > 0:
+        grids = dict((name, array.reshape(ra.size, -1)) for (name, array) in zip(quantities, out))
+        _altAzGrid(ra.reshape(-1), dec.reshape(-1), jd, latitude, eastLongitudeHours, grids.get("alt"), grids.get("az"), 
+                   unit is DEGREES, maxMemory, airmass=grids.get("airmass"), parallacticAngle=grids.get("parallacticAngle"), 
+                   airmassFormula=airmassFormula)
+    return tuple(out)
+
+def altAz2RaDec(alt, az, latitude, longitude, datetimeObj, longitudeDirection='W', units='DEGREES'):
+    """ 
+    Converts Alt Az to RA and Dec at given times, the inverse of raDec2AltAz.
+    
+    The altitudes, azimuths and times are broadcast against each other, so e.g.
+    a log of telescope positions can be converted with an array of times, one 
+    for each position.
+    
+    Parameters
+    ----------
+    alt : float (any numeric type), array_like
+        Altitudes in units
+    az : float (any numeric type), array_like
+        Azimuths east of north in units
+    latitude : float, `Angle`, str
+        The latitude of the site in units
+    longitude : float, `Angle`, str
+        The longitude of the site in units
+    datetimeObj : datetime.datetime
+        A Python datetime.datetime object, or any of the times accepted by 
+        raDec2AltAzGrid
+    longitudeDirection : string
+        Default is longitude WEST, 'W', but you can specify EAST by passing 'E'.
+    units : string
+        The units of the positions, the site and the results. Can be 'DEGREES' 
+        (default) or 'RADIANS'.
+    
+    Returns
+    -------
+    ra : float, `numpy.ndarray`
+        Right Ascensions in the range [0,360) degrees (or [0,2pi) radians)
+    dec : float, `numpy.ndarray`
+        Declinations in units
+    
+    """
+    unit = resolveUnits(units)
+    if unit is HOURS:
+        raise IllegalUnitsError(units)
+    
+    latitude = unit.toRadians(unit.parse(latitude))
+    (sinLat, cosLat) = (math.sin(latitude), math.cos(latitude))
+    lst = np.radians(jdToLST(_timeToJD(datetimeObj), longitude, longitudeDirection=longitudeDirection, longitudeUnits=unit) * 15.)
+    
+    alt = unit.toRadiansArray(alt)
+    az = unit.toRadiansArray(az)
+    (sinAlt, cosAlt) = (np.sin(alt), np.cos(alt))
+    cosAz = np.cos(az)
+    
+    # The same formulae as the forward transform, with (ha, dec) and (az, alt) swapped
+    #   sin(dec) = sin(alt) sin(lat) + cos(alt) cos(lat) cos(az)
+    #   tan(ha) = -cos(alt) sin(az) / (sin(alt) cos(lat) - cos(alt) sin(lat) cos(az))
+    dec = cosAlt * cosAz
+    dec *= cosLat
+    dec += sinAlt * sinLat
+    dec = np.arcsin(np.clip(dec, -1., 1.))
+    
+    x = cosAlt * cosAz
+    x *= -sinLat
+    x += sinAlt * cosLat
+    y = -np.sin(az)
+    y *= cosAlt
+    ra = np.remainder(lst - np.arctan2(y, x), 2*math.pi)
+    
+    if unit is DEGREES:
+        return (np.degrees(ra), np.degrees(dec))
+    return (ra, dec)
+
+def raDec2RiseTransitSet(ra, dec, times, latitude, longitude, longitudeDirection='W', units='DEGREES', altitude=0.):
+    """ 
+    Finds the times that targets rise above an altitude, transit, and set below 
+    it, around the transit nearest to each of an array of times (e.g. local 
+    midnight on a range of nights), for every combination of target and time.
+    
+    The hour angles of rising and setting are solved in closed form, so the times
+    are exact for fixed positions with no refraction (lower `altitude` by about 
+    0.57 degrees for refraction at the horizon).
+    
+    Parameters
+    ----------
+    ra : float, array_like
+        The Right Ascensions of the targets in units
+    dec : float, array_like
+        The Declinations of the targets in units, with the same shape as ra
+    times : AstroTimeArray, datetime.datetime, array_like, tuple
+        The times, see: raDec2AltAzGrid
+    latitude : float, `Angle`, str
+        The latitude of the site in units
+    longitude : float, `Angle`, str
+        The longitude of the site in units
+    longitudeDirection : string
+        Default is longitude WEST, 'W', but you can specify EAST by passing 'E'.
+    units : string
+        The units of the positions, the site and the altitude. Can be 'DEGREES' 
+        (default) or 'RADIANS'.
+    altitude : float
+        The altitude of the horizon in units, default is 0
+    
+    Returns
+    -------
+    rise, transit, set : AstroTimeArray
+        The times with the shape of the targets followed by the shape of the times.
+        The rise and set times of circumpolar and never rising targets are NaT.
+    circumpolar : `numpy.ndarray`
+        A boolean array with the shape of the targets, True for the targets that 
+        are always above the altitude
+    neverRises : `numpy.ndarray`
+        A boolean array with the shape of the targets, True for the targets that 
+        are always below the altitude
+    
+    """
+    unit = resolveUnits(units)
+    latitude = unit.toRadians(unit.parse(latitude))
+    eastLongitudeHours = _eastLongitudeHours(longitude, longitudeDirection, unit)
+    return _raDec2RiseTransitSet(ra, dec, times, latitude, eastLongitudeHours, unit, altitude)
+
+def _raDec2RiseTransitSet(ra, dec, times, latitude, eastLongitudeHours, unit, altitude):
+    """ raDec2RiseTransitSet for a site with a latitude in radians and a longitude in
+        hours east of Greenwich.
+    """
+    if unit is HOURS:
+        raise IllegalUnitsError(unit.name)
+    
+    ra = unit.toRadiansArray(ra)
+    dec = unit.toRadiansArray(dec)
+    if ra.shape != dec.shape:
+        raise ValueError("raDec2RiseTransitSet: ra and dec must have the same shape ({0} and {1}).".format(ra.shape, dec.shape))
+    
+    jd = _timeToJD(times)
+    grid = ra.shape + (1,) * len(_timeShape(jd))
+    raHours = np.degrees(ra.reshape(grid)) / 15.
+    altitude = unit.toRadians(unit.parse(altitude))
+    results = _riseTransitSetJD(raHours, dec.reshape(grid), jd, latitude, eastLongitudeHours, altitude)
+    (circumpolar, neverRises) = [mask.reshape(ra.shape) for mask in results[3:]]
+    return tuple(AstroTimeArray.fromJD(times) for times in results[:3]) + (circumpolar, neverRises)
 
 def eclipticLatLon2RADec(lat, lon, latLonUnits='DEGREES', raDecUnits='DEGREES'):
     """ 
@@ -1408,7 +3075,7 @@ def raDecToGalactic(ra, dec, latLonUnits='DEGREES', raDecUnits='DEGREES'):
         ra = np.array([float(ra)])
         dec = np.array([float(dec)])
 
-    if raDecUnits.lower() == 'degrees':
+    if resolveUnits(raDecUnits) is DEGREES:
         ra = np.radians(ra)
         dec = np.radians(dec)
 
@@ -1464,7 +3131,7 @@ def galactic2RaDec(gl, gb, latLonUnits='DEGREES', raDecUnits='DEGREES'):
         gl = np.array([float(gl)])
         gb = np.array([float(gb)])
     
-    if latLonUnits.lower() == 'degrees':
+    if resolveUnits(latLonUnits) is DEGREES:
         gl = np.radians(gl)
         gb = np.radians(gb)
     
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+""" apwlib
+    ------
+    
+    Copyright (C) 2012 Adrian Price-Whelan
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+################################################################################
+# frames.py - A registry of celestial coordinate frames related by rotations.
+#
+#   Each registered transform is a 3x3 rotation matrix R that takes a unit vector
+#   in one frame to the other, v_new = R v_old. Conversions between frames that
+#   aren't directly connected follow the shortest path through the registered 
+#   transforms, and the composed matrix is cached for each pair of frames, so 
+#   converting a batch of positions costs one matrix product.
+#
+
+"""
+TODO:
+    - Frames that aren't pure rotations (e.g. precession to other epochs)
+"""
+
+__author__ = 'Adrian Price-Whelan <adrn@astro.columbia.edu>'
+__all__ = ["registerTransform", "transformMatrix", "transform", "frameNames"]
+
+# Standard library dependencies
+import math
+from collections import deque
+
+# Third-party
+import numpy as np
+
+# Project Dependencies
+import convert
+
+# Other names accepted for the registered frames
+_aliases = {"j2000" : "icrs", "equatorial" : "icrs"}
+
+# frame name -> {neighbor frame name : rotation matrix}
+_graph = dict()
+
+# (from frame, to frame) -> composed rotation matrix
+_matrixCache = dict()
+
+def _frameName(frame):
+    """ Returns the registered name of a frame, resolving aliases """
+    name = frame.lower()
+    return _aliases.get(name, name)
+
+def frameNames():
+    """ Returns a list of the names of all registered frames """
+    return sorted(_graph.keys())
+
+def registerTransform(fromFrame, toFrame, matrix):
+    """ Registers a rotation between two frames. The inverse rotation is registered
+        as well, and frames that don't exist yet are created, so this is also how 
+        user-defined frames are added.
+        
+        Parameters
+        ----------
+        fromFrame : str
+            The name of the frame to rotate from
+        toFrame : str
+            The name of the frame to rotate to
+        matrix : array_like
+            A 3x3 rotation matrix R such that a unit vector v in `fromFrame` is 
+            R v in `toFrame`.
+    """
+    matrix = np.array(matrix, dtype=np.float64)
+    if matrix.shape != (3,3):
+        raise ValueError("frames.registerTransform: the rotation matrix must have shape (3,3), not {0}.".format(matrix.shape))
+    
+    (fromFrame, toFrame) = (_frameName(fromFrame), _frameName(toFrame))
+    _graph.setdefault(fromFrame, dict())[toFrame] = matrix
+    # Use the exact inverse rather than the transpose, since published rotation
+    # matrices are only orthogonal to the precision they are quoted to
+    _graph.setdefault(toFrame, dict())[fromFrame] = np.linalg.inv(matrix)
+    
+    # A new edge can shorten existing paths
+    _matrixCache.clear()
+
+def _unregisterFrame(frame):
+    """ Removes a frame and its transforms from the registry. """
+    frame = _frameName(frame)
+    for neighbor in _graph.pop(frame, dict()):
+        del _graph[neighbor][frame]
+    _matrixCache.clear()
+
+def _shortestPath(fromFrame, toFrame):
+    """ Returns the list of frames from `fromFrame` to `toFrame` with the fewest 
+        transforms (a breadth-first search of the frame graph).
+    """
+    previous = {fromFrame : None}
+    queue = deque([fromFrame])
+    while queue:
+        frame = queue.popleft()
+        if frame == toFrame:
+            break
+        for neighbor in _graph[frame]:
+            if neighbor not in previous:
+                previous[neighbor] = frame
+                queue.append(neighbor)
+    else:
+        raise ValueError("frames: there is no transform from the '{0}' frame to the '{1}' frame.".format(fromFrame, toFrame))
+    
+    path = [toFrame]
+    while path[-1] != fromFrame:
+        path.append(previous[path[-1]])
+    return path[::-1]
+
+def transformMatrix(fromFrame, toFrame):
+    """ Returns the 3x3 rotation matrix that takes unit vectors in `fromFrame` to
+        `toFrame`, composed along the shortest path of registered transforms.
+        
+        Parameters
+        ----------
+        fromFrame : str
+        toFrame : str
+            The names of any registered frames, e.g. 'icrs' (or 'j2000'), 
+            'galactic', or 'ecliptic'.
+    """
+    key = (_frameName(fromFrame), _frameName(toFrame))
+    
+    try:
+        return _matrixCache[key]
+    except KeyError:
+        pass
+    
+    for frame in key:
+        if frame not in _graph:
+            raise ValueError("frames: unknown frame '{0}'. Registered frames are: {1}".format(frame, ", ".join(frameNames())))
+    
+    path = _shortestPath(*key)
+    matrix = np.identity(3)
+    for frame1, frame2 in zip(path[:-1], path[1:]):
+        matrix = np.dot(_graph[frame1][frame2], matrix)
+    
+    _matrixCache[key] = matrix
+    return matrix
+
+def transform(lon, lat, fromFrame, toFrame):
+    """ Converts spherical coordinates from one frame to another.
+        
+        Parameters
+        ----------
+        lon : float, `numpy.ndarray`
+            The longitude-like coordinates (e.g. RA) in radians
+        lat : float, `numpy.ndarray`
+            The latitude-like coordinates (e.g. Dec) in radians
+        fromFrame : str
+        toFrame : str
+            The names of any registered frames
+        
+        Returns a tuple (lon, lat) of arrays in radians in the new frame, with 
+        lon in the range [0, 2*pi).
+    """
+    matrix = transformMatrix(fromFrame, toFrame)
+    xyz = convert.sphericalToUnitVectors(lon, lat)
+    return convert.unitVectorsToSpherical(np.dot(xyz, matrix.T))
+
+# The built-in frames
+_eps = math.radians(convert.ee)
+registerTransform("icrs", "galactic", convert.j2000ToGalacticMatrix.T)
+registerTransform("icrs", "ecliptic", [[1., 0., 0.],
+                                       [0., math.cos(_eps), math.sin(_eps)],
+                                       [0., -math.sin(_eps), math.cos(_eps)]])
@@ -27,11 +27,12 @@
 """
 TODO:
     - More unit tests!
-    - Finish CoordinateSystem and subclasses
 """
 
 __author__ = 'Adrian Price-Whelan <adrn@astro.columbia.edu>'
-__all__ = ["Angle", "RA", "Dec", "RADec"]
+__all__ = ["Angle", "RA", "Dec", "RADec", "AngleArray", "RAArray", "DecArray", "RADecCatalog",
+           "SphericalCoordinate", "CartesianCoordinate", "GalacticSphericalCoordinate", 
+           "GalacticCartesianCoordinate"]
 
 # Standard library dependencies (e.g. sys, os)
 #from math import cos, acos, sin, radians, degrees
@@ -47,6 +48,50 @@ import astrodatetime
 from custom_errors import *
 import globals
 
+# ufuncs whose result is still an angle when every operand is an angle
+_additiveUfuncs = frozenset([np.add, np.subtract, np.fmod, np.remainder, np.minimum, np.maximum, np.fmin, np.fmax])
+# ufuncs whose result is still an angle when only the first operand is an angle
+_scalingUfuncs = frozenset([np.divide, np.true_divide])
+# ufuncs of a single angle that return an angle
+_unaryUfuncs = frozenset([np.negative, np.positive, np.absolute, np.rint, np.floor, np.ceil, np.trunc])
+
+def _angleUfunc(self, ufunc, method, inputs, kwargs):
+    """ Implements `__array_ufunc__` for `Angle` and `AngleArray` objects.
+        
+        Angle operands are replaced by their values in radians, so e.g. trig
+        functions act on radians and return plain floats or float arrays. Results
+        that are still angles (sums and differences of angles, an angle scaled by 
+        a number, negation, ...) are returned as the class of the angle operand
+        (the first one, for sums and differences).
+    """
+    isAngle = [isinstance(x, (Angle, AngleArray)) for x in inputs]
+    args = [x.radians if angle else x for x, angle in zip(inputs, isAngle)]
+    
+    out = kwargs.get("out", None)
+    if out is not None:
+        kwargs["out"] = tuple(x.radians if isinstance(x, AngleArray) else x for x in out)
+    
+    result = getattr(ufunc, method)(*args, **kwargs)
+    
+    if out is not None and len(out) == 1 and isinstance(out[0], AngleArray):
+        return out[0]
+    
+    if method != "__call__":
+        return result
+    
+    if ufunc in _additiveUfuncs:
+        if not all(isAngle):
+            return NotImplemented
+        return self._wrap(result)
+    elif ufunc in _scalingUfuncs and isAngle[0] and not isAngle[1]:
+        return inputs[0]._wrap(result)
+    elif ufunc is np.multiply and isAngle[0] != isAngle[1]:
+        return inputs[isAngle.index(True)]._wrap(result)
+    elif ufunc in _unaryUfuncs:
+        return self._wrap(result)
+    
+    return result
+
 class Angle(object):
     """ This class represents an Angle. 
         
@@ -60,71 +105,99 @@ class Angle(object):
         angle : float, int, str
             The angle value
         units : {'degrees', 'radians', 'hours'}
+            Or a `convert.Unit`, e.g. `convert.DEGREES`, which skips looking up the
+            units string when many angles are created.
+        
+        Notes
+        -----
+        Instances have no `__dict__`: the only state is the value in radians plus 
+        the lazily computed degrees, hours, hms and repr values. These are cached 
+        the first time they are requested and cleared whenever `radians` is set.
+        
+        Angles support the NumPy array protocol with their value in radians, so 
+        `np.array` of a list of Angles is a float64 array of radians, and 
+        `float(angle)` is also the angle in radians.
 
     """
     
+    __slots__ = ("_radians", "_degrees", "_hours", "_hms", "_repr")
+    
     def __init__(self, angle, units):
-        # Make the `units` string lower case, and validate the `units`
-        lowUnits = units.lower()
-                
+        # Validate the `units`, and look up the parser and conversion for them
+        unit = convert.resolveUnits(units)
+        
         try:
-            if lowUnits == "degrees":
-                self.radians = math.radians(convert.parseDegrees(angle))
-                
-            elif lowUnits == "radians":
-                self.radians = float(angle)
-                
-            elif lowUnits == "hours":
-                # can accept string or float in any valid format
-                self.radians = convert.hoursToRadians(convert.parseHours(angle))
-            
-            else:
-                raise IllegalUnitsError(units)
+            # can accept string or float in any valid format
+            self.radians = unit.toRadians(unit.parse(angle))
         except ValueError:
             raise ValueError("{1}: the angle value given couldn't be parsed (was of type {0})".format(type(angle).__name__, type(self).__name__))
     
     @classmethod
     def fromDegrees(cls, val): 
         """ Create an `Angle` object with input units of Degrees """
-        return cls(val, units="degrees")
+        return cls(val, units=convert.DEGREES)
         
     @classmethod
     def fromHours(cls, val):
         """ Create an `Angle` object with input units of Hours """
-        return cls(val, units="hours")
+        return cls(val, units=convert.HOURS)
         
     @classmethod
     def fromRadians(cls, val):
         """ Create an `Angle` object with input units of Radians """
-        return cls(val, units="radians")
+        return cls(val, units=convert.RADIANS)
     
     @classmethod
     def fromAngle(cls, angle):
         """ Creates an `Angle` object from an `Angle` object """
-        return cls(angle.radians, units="radians")
+        return cls(angle.radians, units=convert.RADIANS)
         
     @classmethod
     def fromDatetime(cls, dt):
         """ Create an `Angle` object with a Python `datetime.datetime` object """
-        return cls(convert.datetime2decimalTime(dt), units="hours")
+        return cls(convert.datetime2decimalTime(dt), units=convert.HOURS)
 
     def __repr__(self):
-        return "<{2}: {0} degrees ({1})>".format(math.degrees(self.radians), convert.degreesToString(self.degrees), type(self).__name__)
+        if self._repr is None:
+            self._repr = "<{2}: {0} degrees ({1})>".format(self.degrees, convert.degreesToString(self.degrees), type(self).__name__)
+        return self._repr
+    
+    def __getstate__(self):
+        return (self._radians,)
+    
+    def __setstate__(self, state):
+        self.radians = state[0]
+    
+    @property
+    def radians(self):
+        """ Returns the angle's value in radians. Setting it clears the cached values. """
+        return self._radians
+    
+    @radians.setter
+    def radians(self, value):
+        self._radians = value
+        self._degrees = self._hours = self._hms = self._repr = None
     
     @property
     def degrees(self):
         """ Returns the angle's value in degrees (read-only property). """
-        return math.degrees(self.radians) # converts radians to degrees
+        if self._degrees is None:
+            self._degrees = math.degrees(self._radians) # converts radians to degrees
+        return self._degrees
     
     @property
     def hours(self):
         """ Returns the angle's value in hours (read-only property). """
-        return convert.radiansToHours(self.radians)
+        if self._hours is None:
+            self._hours = convert.radiansToHours(self._radians)
+        return self._hours
 
     @property
     def hms(self):
         """ Returns the angle's value in hours, and print as an (h,m,s) tuple (read-only property). """
-        return convert.hoursToHMS(convert.radiansToHours(self.radians))
+        if self._hms is None:
+            self._hms = convert.hoursToHMS(self.hours)
+        return self._hms
 
     def string(self, units="degrees", decimal=False, sep=" ", precision=5, pad=False): 
         """ Returns a string representation of the angle.
@@ -142,24 +215,22 @@ class Angle(object):
                 or 11-21:17.124 would be sep="-:"
         """
         
-        lowUnits = units.lower()
+        unit = convert.resolveUnits(units)
         
-        if lowUnits == "degrees":
+        if unit is convert.DEGREES:
             if decimal:
                 return ("{0:0." + str(precision) + "f}").format(self.degrees)
             else:
                 return convert.degreesToString(self.degrees, precision=precision, sep=sep, pad=pad)
                 
-        elif lowUnits == "radians":
+        elif unit is convert.RADIANS:
             return str(self.radians)
                 
-        elif lowUnits == "hours":
+        else:
             if decimal:
                 return ("{0:0." + str(precision) + "f}").format(self.hours)
             else:
                 return convert.hoursToString(self.hours, precision=precision, sep=sep, pad=pad)
-        else:
-            raise IllegalUnitsError(units)
             
     def normalize(self, bounds, units, inplace=False):
         """ Normalize the angle to be within the bounds specified. If inplace==True, 
@@ -171,93 +242,93 @@ class Angle(object):
                 A tuple with 2 values (low, hi) where this is the range you would like
                 to normalize the angle to. For example, if you have an angle value of 
                 752.1834 but you want it to be within the range -180 -> +180, you can
-                specifiy `Angle.normalize((-180, 180), units="degrees")`.
+                specifiy `Angle.normalize((-180, 180), units="degrees")`. When normalizing
+                many angles to the same range, resolve the bounds once with 
+                `convert.resolveBounds` and pass them with units="radians".
         """
-        
-        # Validate the units
-        lowUnits = units.lower()
-        convert.parseDegrees(bounds[1])
-        if lowUnits == "degrees":
-            radianBounds = (math.radians(convert.parseDegrees(bounds[0])), math.radians(convert.parseDegrees(bounds[1])))
-        elif lowUnits == "radians":
-            radianBounds = (float(bounds[0]), float(bounds[1]))
-        elif lowUnits == "hours":
-            radianBounds = (convert.hoursToRadians(convert.parseHours(bounds[0])), convert.hoursToRadians(convert.parseHours(bounds[1])))
+        radians = convert.wrapRadians(self.radians, convert.resolveBounds(bounds, units))
         
         if inplace:
-            obj = self
-        else:
-            obj = copy.copy(self)
-        
-        if obj.radians < radianBounds[0]:
-            obj.radians = obj.radians % radianBounds[1]
-            
-        elif obj.radians >= radianBounds[1]:
-            if radianBounds[0] == 0:
-                obj.radians = obj.radians % radianBounds[1]
-            else:
-                obj.radians = obj.radians % radianBounds[0]
+            self.radians = radians
+            return self
         
-        return obj
+        return type(self).fromRadians(radians)
     
     def __radians__(self): return self.radians
     def __degrees__(self): return self.degrees
     
+    def __float__(self):
+        return self._radians
+    
+    def __array__(self, dtype=None):
+        return np.array(self._radians, dtype=dtype)
+    
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _angleUfunc(self, ufunc, method, inputs, kwargs)
+    
+    def _wrap(self, radians):
+        """ Returns a value in radians as an object of this class, or of the matching 
+            array class (e.g. `RAArray` for an `RA`) if it is an array.
+        """
+        if np.ndim(radians) == 0:
+            return type(self).fromRadians(radians)
+        return self._arrayClass._wrap(radians)
+    
     # Addition
     def __add__(self, other, option='left'):
-        if not isinstance(otherCopy, Angle): 
-            raise TypeError("Can't add an {1} object and a {0}!".format(otherCopy.__class__, type(self).__name__))
+        if not isinstance(other, (Angle, AngleArray)): 
+            raise TypeError("Can't add an {1} object and a {0}!".format(other.__class__, type(self).__name__))
             
         if option == 'left':
-            return Angle.fromRadians(self.radians + other.radians)
+            return self._wrap(self.radians + other.radians)
         elif option == 'right':
-            return Angle.fromRadians(other.radians + self.radians)
+            return self._wrap(other.radians + self.radians)
     def __radd__(self, other): return self.__add__(other, 'right')
     
     # Subtraction
     def __sub__(self, other, option='left'):
-        if not isinstance(other, Angle): 
+        if not isinstance(other, (Angle, AngleArray)): 
             raise TypeError("Can't subtract an {1} object and a {0}!".format(other.__class__, type(self).__name__))
         
         if option == 'left':
-            return Angle.fromRadians(self.radians - other.radians)
+            return self._wrap(self.radians - other.radians)
         elif option == 'right':
-            return Angle.fromRadians(other.radians - self.radians)
+            return self._wrap(other.radians - self.radians)
     def __rsub__(self, other): return self.__sub__(other, 'right')
     
     # Multiplication
     def __mul__(self, other, option='left'):
-        if isinstance(other, Angle):
+        if isinstance(other, (Angle, AngleArray)):
             raise TypeError("Multiplication is not supported between two {0} objects!".format(type(self).__name__))
         else:
-            return Angle.fromRadians(self.radians * other)
+            return self._wrap(self.radians * other)
     def __rmul__(self, other): return self.__mul__(other, option='right')
     
     # Division
     def __div__(self, other):
-        if isinstance(other, Angle):
+        if isinstance(other, (Angle, AngleArray)):
             raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
         else:
-            return Angle.fromRadians(self.radians / other)
+            return self._wrap(self.radians / other)
     def __rdiv__(self, other):
-        if isinstance(other, Angle):
+        if isinstance(other, (Angle, AngleArray)):
             raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
         else:
-            return Angle.fromRadians(other / self.radians)
+            return self._wrap(other / self.radians)
     
     def __truediv__(self, other):
-        if isinstance(other, Angle):
+        if isinstance(other, (Angle, AngleArray)):
             raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
         else:
-            return Angle.fromRadians(self.radians / other)
+            return self._wrap(self.radians / other)
     def __rtruediv__(self, other):
-        if isinstance(other, Angle):
+        if isinstance(other, (Angle, AngleArray)):
             raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
         else:
-            return Angle.fromRadians(other / self.radians)
+            return self._wrap(other / self.radians)
 
     def __neg__(self):
-        return Angle.fromRadians(-self.radians)
+        return self._wrap(-self.radians)
 
 class RA(Angle):
     """ Represents a J2000 Right Ascension 
@@ -276,6 +347,8 @@ class RA(Angle):
     
     """
     
+    __slots__ = ()
+    
     def __init__(self, angle, units=None):
         # Default units for Righ Ascension are hours
         if units == None:
@@ -300,7 +373,7 @@ class RA(Angle):
         if not isinstance(lst, Angle):
             lst = Angle(lst, units)
         
-        return Angle(lst.radians - self.radians, units="radians")
+        return Angle(lst.radians - self.radians, units=convert.RADIANS)
     
     def lst(self, hourAngle, units="hours"):
         """ Given an Hour Angle, calculate the Local Sidereal Time (LST) for this RA
@@ -320,7 +393,7 @@ class RA(Angle):
         if not isinstance(ha, Angle):
             ha = Angle(ha, units)
             
-        return Angle(ha.radians + self.radians, units="radians")
+        return Angle(ha.radians + self.radians, units=convert.RADIANS)
     
     def string(self, **kwargs):
         """ Re-implements the default Angle.string() method to ensure
@@ -335,6 +408,8 @@ class RA(Angle):
 class Dec(Angle):
     """ Represents a J2000 Declination """
     
+    __slots__ = ()
+    
     def __init__(self, angle, units="degrees"):
         """ Accepts a Declination angle value. The angle parameter accepts degrees, 
             hours, or radians and the default units are hours.
@@ -403,10 +478,10 @@ class RADec(object):
         """ Returns a string formatted in the J2000 IAU standard:
             JHHMMSS.ss+DDMMSS.s
         """
-        if self.dec.degrees > 0: dec_sep = "+"
-        else: dec_sep = ""
+        dec = self.dec.string(sep="", precision=1, pad=True)
+        if not dec.startswith("-"): dec = "+" + dec
          
-        return "J{0}{2}{1}".format(self.ra.string(sep="", precision=2), self.dec.string(sep="", precision=1), dec_sep)
+        return "J{0}{1}".format(self.ra.string(sep="", precision=2, pad=True), dec)
          
     
     def subtends(self, other):
@@ -442,39 +517,707 @@ class RADec(object):
                 
         return Angle.fromRadians(ang)
     
-    def convertTo(self, new_coordinates_class):
-        raise NotImplementedError("This function has not been implemented yet.")
+    @classmethod
+    def fromFrame(cls, lon, lat, frame):
+        """ Create an `RADec` object from spherical coordinates in another frame.
+            
+            Parameters
+            ----------
+            lon : float, `Angle`
+                The longitude-like coordinate, in radians if not an `Angle`
+            lat : float, `Angle`
+                The latitude-like coordinate, in radians if not an `Angle`
+            frame : str
+                The name of a registered frame (see: `frames`), e.g. 'galactic'
+        """
+        import frames # imported here to avoid a circular import with convert
+        (ra, dec) = frames.transform(float(lon), float(lat), frame, "icrs")
+        return cls((RA.fromRadians(ra), Dec.fromRadians(dec)))
+    
+    def convertTo(self, frame):
+        """ Convert the RA and Dec to spherical coordinates in another frame.
+            
+            Parameters
+            ----------
+            frame : str
+                The name of a registered frame (see: `frames`), e.g. 'galactic'
+                or 'ecliptic'
+            
+            Returns a tuple of `Angle` objects (longitude, latitude), with the 
+            longitude in the range [0, 360) degrees.
+        """
+        import frames # imported here to avoid a circular import with convert
+        (lon, lat) = frames.transform(self.ra.radians, self.dec.radians, "icrs", frame)
+        return (Angle.fromRadians(lon), Angle.fromRadians(lat))
     
     def galactic(self):
         """ Convert the RA and Dec to Galactic latitude and longitude """
-        return convert.j2000ToGalactic(self.ra, self.dec)
+        return self.convertTo("galactic")
+    
+
+class AngleArray(object):
+    """ This class represents an array of angles.
+        
+        The values are stored internally as a single contiguous array of float64 
+        radians (`self.radians`), so conversions between units operate on the whole 
+        array at once. The units must be specified by the units parameter, and accept
+        the same values as `Angle`. Arrays of strings (e.g. '15:23:14.231') are also 
+        accepted (see: convert.parseHoursArray).
+        
+        Parameters
+        ----------
+        angles : array_like
+            The angle values
+        units : {'degrees', 'radians', 'hours'}
+        
+    """
+    
+    # The class of the objects returned when indexing with an integer
+    _scalarClass = Angle
+    
+    def __init__(self, angles, units):
+        # Validate the `units`, and look up the parsers and conversion for them
+        unit = convert.resolveUnits(units)
+        
+        if isinstance(angles, AngleArray):
+            self.radians = np.array(angles.radians, dtype=np.float64)
+            return
+        
+        values = np.asarray(angles)
+        
+        try:
+            if values.dtype.kind in "SU" and unit.parseArray is not None:
+                # strings are parsed with array operations where possible
+                values = unit.parseArray(values)
+            
+            elif values.dtype.kind in "SUO":
+                # Angle objects have to be parsed one at a time
+                values = np.array([unit.parse(x) for x in values.flat], dtype=np.float64).reshape(np.shape(angles))
+            
+            self.radians = unit.toRadiansArray(values)
+        except ValueError:
+            raise ValueError("{1}: the angle values given couldn't be parsed (was of type {0})".format(type(angles).__name__, type(self).__name__))
+        
+        self.radians = np.ascontiguousarray(self.radians)
+    
+    @classmethod
+    def fromDegrees(cls, val):
+        """ Create an `AngleArray` object with input units of Degrees """
+        return cls(val, units=convert.DEGREES)
+    
+    @classmethod
+    def fromHours(cls, val):
+        """ Create an `AngleArray` object with input units of Hours """
+        return cls(val, units=convert.HOURS)
+    
+    @classmethod
+    def fromRadians(cls, val):
+        """ Create an `AngleArray` object with input units of Radians """
+        return cls(val, units=convert.RADIANS)
+    
+    @classmethod
+    def fromAngles(cls, angles):
+        """ Create an `AngleArray` object from a sequence of `Angle` objects """
+        return cls(np.array([angle.radians for angle in angles], dtype=np.float64), units=convert.RADIANS)
+    
+    def __repr__(self):
+        return "<{0}: {1} degrees>".format(type(self).__name__, np.array_str(self.degrees))
+    
+    def __len__(self):
+        return len(self.radians)
+    
+    def __iter__(self):
+        for r in self.radians:
+            yield self._scalarClass.fromRadians(r)
+    
+    def __getitem__(self, key):
+        """ Integer indices return a scalar `Angle` (or subclass), slices and 
+            index arrays return a new `AngleArray` (or subclass).
+        """
+        value = self.radians[key]
+        if np.ndim(value) == 0:
+            return self._scalarClass.fromRadians(value)
+        return type(self).fromRadians(value)
+    
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.radians
+        return self.radians.astype(dtype)
+    
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _angleUfunc(self, ufunc, method, inputs, kwargs)
+    
+    @classmethod
+    def _wrap(cls, radians):
+        """ Returns a value in radians as an object of this class without copying it, 
+            or as the matching scalar class if it is a scalar.
+        """
+        if np.ndim(radians) == 0:
+            return cls._scalarClass.fromRadians(radians)
+        obj = cls.__new__(cls)
+        obj.radians = np.ascontiguousarray(radians, dtype=np.float64)
+        return obj
+    
+    @property
+    def shape(self):
+        """ Returns the shape of the underlying array (read-only property). """
+        return self.radians.shape
+    
+    @property
+    def degrees(self):
+        """ Returns the angles' values in degrees (read-only property). """
+        return np.degrees(self.radians)
+    
+    @property
+    def hours(self):
+        """ Returns the angles' values in hours (read-only property). """
+        return np.degrees(self.radians) / 15.
+    
+    @property
+    def hms(self):
+        """ Returns the angles' values in hours as an (h,m,s) tuple of arrays (read-only property). """
+        hours = self.hours
+        sign = np.copysign(1.0, hours)
+        
+        (hf, h) = np.modf(np.abs(hours)) # (hour fraction, hour)
+        (mf, m) = np.modf(hf * 60.) # (minute fraction, minute)
+        s = mf * 60.
+        
+        return ((sign*h).astype(int), m.astype(int), s)
+    
+    def string(self, units="degrees", decimal=False, sep=" ", precision=5, pad=False):
+        """ Returns a fixed-width NumPy string array representation of the angles.
+            The parameters are the same as for `Angle.string`.
+        """
+        unit = convert.resolveUnits(units)
+        
+        if unit is convert.DEGREES:
+            if decimal:
+                return np.char.mod("%0." + str(precision) + "f", self.degrees)
+            else:
+                return convert.degreesToStringArray(self.degrees, precision=precision, sep=sep, pad=pad)
+        
+        elif unit is convert.RADIANS:
+            return np.array([str(r) for r in self.radians.tolist()])
+        
+        else:
+            if decimal:
+                return np.char.mod("%0." + str(precision) + "f", self.hours)
+            else:
+                return convert.hoursToStringArray(self.hours, precision=precision, sep=sep, pad=pad)
+    
+    def normalize(self, bounds, units, inplace=False):
+        """ Normalize the angles to be within the bounds specified. If inplace==True, 
+            this wraps the internal array in place, otherwise it returns a new 
+            `AngleArray` object. See `Angle.normalize` and `convert.wrapRadians`.
+            
+            Parameters
+            ----------
+            bounds : tuple
+                A tuple with 2 values (low, hi) where this is the range you would like
+                to normalize the angles to.
+            units : str
+                The units of the bounds.
+        """
+        radianBounds = convert.resolveBounds(bounds, units)
+        
+        if inplace:
+            convert.wrapRadians(self.radians, radianBounds, out=self.radians)
+            return self
+        
+        return type(self).fromRadians(convert.wrapRadians(self.radians, radianBounds))
+    
+    def __radians__(self): return self.radians
+    def __degrees__(self): return self.degrees
+    
+    def _otherRadians(self, other, operation):
+        """ Returns the radians of another `Angle` or `AngleArray` object. """
+        if isinstance(other, (Angle, AngleArray)):
+            return other.radians
+        raise TypeError("Can't {2} an {1} object and a {0}!".format(other.__class__, type(self).__name__, operation))
+    
+    # Addition
+    def __add__(self, other):
+        return self._wrap(self.radians + self._otherRadians(other, "add"))
+    def __radd__(self, other):
+        return self._wrap(self._otherRadians(other, "add") + self.radians)
+    
+    # Subtraction
+    def __sub__(self, other):
+        return self._wrap(self.radians - self._otherRadians(other, "subtract"))
+    def __rsub__(self, other):
+        return self._wrap(self._otherRadians(other, "subtract") - self.radians)
+    
+    # Multiplication
+    def __mul__(self, other):
+        if isinstance(other, (Angle, AngleArray)):
+            raise TypeError("Multiplication is not supported between two {0} objects!".format(type(self).__name__))
+        return self._wrap(self.radians * other)
+    def __rmul__(self, other): return self.__mul__(other)
+    
+    # Division
+    def __div__(self, other):
+        if isinstance(other, (Angle, AngleArray)):
+            raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
+        return self._wrap(self.radians / other)
+    def __rdiv__(self, other):
+        if isinstance(other, (Angle, AngleArray)):
+            raise TypeError("Division is not supported between two {0} objects!".format(type(self).__name__))
+        return self._wrap(other / self.radians)
+    __truediv__ = __div__
+    __rtruediv__ = __rdiv__
+    
+    def __neg__(self):
+        return self._wrap(-self.radians)
+
+class RAArray(AngleArray):
+    """ Represents an array of J2000 Right Ascensions 
+    
+        Accepts an array of Right Ascension values. The default units are hours.
+        
+        Parameters
+        ----------
+        angles : array_like
+            The angle values
+        units : string
+            The units of the angle values
+    
+    """
+    
+    _scalarClass = RA
+    
+    def __init__(self, angles, units=None):
+        # Default units for Right Ascension are hours
+        if units == None:
+            units = "hours"
+        
+        super(RAArray, self).__init__(angles, units)
+    
+    def string(self, **kwargs):
+        """ Re-implements the default AngleArray.string() method to ensure
+            default units of hours
+        """
+        if "units" not in kwargs:
+            kwargs["units"] = "hours"
+        
+        return super(RAArray, self).string(**kwargs)
+
+class DecArray(AngleArray):
+    """ Represents an array of J2000 Declinations 
+    
+        Accepts an array of Declination values. The default units are degrees.
+        
+        Parameters
+        ----------
+        angles : array_like
+            The angle values
+        units : string
+            The units of the angle values
+    
+    """
+    
+    _scalarClass = Dec
+    
+    def __init__(self, angles, units=None):
+        # Default units for Declination are degrees
+        if units == None:
+            units = "degrees"
+        
+        super(DecArray, self).__init__(angles, units)
+    
+    def string(self, **kwargs):
+        """ Re-implements the default AngleArray.string() method to ensure
+            default units of degrees
+        """
+        if "units" not in kwargs:
+            kwargs["units"] = "degrees"
+        
+        return super(DecArray, self).string(**kwargs)
+
+# The array classes used for array-valued results of scalar arithmetic
+Angle._arrayClass = AngleArray
+RA._arrayClass = RAArray
+Dec._arrayClass = DecArray
+
+
+class RADecCatalog(object):
+    """ Represents a catalog of J2000 Equatorial coordinates. 
+    
+        The positions are stored as columns: an `RAArray` and a `DecArray`,
+        each backed by a single float64 radians array.
+        
+        Parameters
+        ----------
+        ra : array_like, `RAArray`
+            The Right Ascensions
+        dec : array_like, `DecArray`
+            The Declinations
+        ra_units : str
+            The units of `ra`, if not an `RAArray`
+        dec_units : str
+            The units of `dec`, if not a `DecArray`
+        
+    """
+    
+    def __init__(self, ra, dec, ra_units="hours", dec_units="degrees"):
+        if isinstance(ra, RAArray):
+            self.ra = ra
+        else:
+            self.ra = RAArray(ra, ra_units)
+        
+        if isinstance(dec, DecArray):
+            self.dec = dec
+        else:
+            self.dec = DecArray(dec, dec_units)
+        
+        if self.ra.shape != self.dec.shape:
+            raise ValueError("RADecCatalog: RA and Dec must have the same shape! ({0} != {1})".format(self.ra.shape, self.dec.shape))
+    
+    @classmethod
+    def fromRADecs(cls, radecs):
+        """ Create an `RADecCatalog` object from a sequence of `RADec` objects """
+        radecs = list(radecs)
+        ra = RAArray.fromAngles([radec.ra for radec in radecs])
+        dec = DecArray.fromAngles([radec.dec for radec in radecs])
+        return cls(ra, dec)
+    
+    @classmethod
+    def fromJstrings(cls, jstrings):
+        """ Create an `RADecCatalog` object from an array of J2000 IAU designations
+            (JHHMMSS.ss+DDMMSS.s), see `convert.parseJstringArray`.
+        """
+        (ra, dec) = convert.parseJstringArray(jstrings)
+        return cls(ra, dec, ra_units="hours", dec_units="degrees")
+    
+    @classmethod
+    def fromStrings(cls, radecs, returnMask=False):
+        """ Create an `RADecCatalog` object from an array or other iterable of strings
+            that each represent an RA and Dec, e.g. '03:14:15.9 +26:37:10.11' or 
+            'J141213.23+161252.1'. See `convert.parseRADecStringArray`. For a list
+            of `RADec` objects, call `toRADecs()` on the result.
+            
+            Parameters
+            ----------
+            radecs : iterable
+                The strings representing an RA and Dec
+            returnMask : bool
+                If True, rows that can't be parsed are set to NaN instead of raising
+                a ValueError, and a tuple (catalog, valid) is returned where valid is 
+                a boolean array that is True for the rows that were parsed.
+        """
+        parsed = convert.parseRADecStringArray(radecs, returnMask=returnMask)
+        catalog = cls(RAArray._wrap(parsed[0]), DecArray._wrap(parsed[1]))
+        
+        if returnMask:
+            return (catalog, parsed[2])
+        return catalog
+    
+    def toRADecs(self):
+        """ Returns a list of `RADec` objects """
+        return list(self)
+    
+    def __repr__(self):
+        return "<{0}: {1} positions>".format(type(self).__name__, len(self))
+    
+    def __len__(self):
+        return len(self.ra)
+    
+    def __iter__(self):
+        for ra, dec in zip(self.ra, self.dec):
+            yield RADec((ra, dec))
+    
+    def __getitem__(self, key):
+        """ Integer indices return an `RADec` object, slices and index
+            arrays return a new `RADecCatalog`.
+        """
+        ra = self.ra[key]
+        dec = self.dec[key]
+        if isinstance(ra, RA):
+            return RADec((ra, dec))
+        return type(self)(ra, dec)
+    
+    def Jstring(self):
+        """ Returns an array of strings formatted in the J2000 IAU standard:
+            JHHMMSS.ss+DDMMSS.s
+        """
+        return convert.raDecToJstringArray(self.ra.hours, self.dec.degrees)
+    
+    def subtends(self, other):
+        """ Calculate the angles subtended by the coordinates in this catalog and
+            another set of coordinates using Vincenty's formula.
+            
+            Parameters
+            ----------
+            other : `RADec`, `RADecCatalog`
+                If an `RADec`, the angle between that position and every position
+                in the catalog is computed (one-to-many). If an `RADecCatalog`, the
+                angles are computed element-wise.
+            
+            Returns an `AngleArray`.
+        """
+        if not isinstance(other, (RADec, RADecCatalog)):
+            raise ValueError("You must pass an RADec or RADecCatalog object into this function to calculate the angle subtended.")
+        
+        if isinstance(other, RADecCatalog) and len(other) != len(self):
+            raise ValueError("Element-wise subtends requires catalogs of the same length ({0} != {1}).".format(len(self), len(other)))
+        
+        (r1, d1) = (self.ra.radians, self.dec.radians)
+        (r2, d2) = (other.ra.radians, other.dec.radians)
+        dr = r1-r2
+        
+        (sin_d1, cos_d1) = (np.sin(d1), np.cos(d1))
+        (sin_d2, cos_d2) = (np.sin(d2), np.cos(d2))
+        cos_dr = np.cos(dr)
+        
+        X_nom = np.hypot(cos_d1*np.sin(dr), cos_d2*sin_d1 - sin_d2*cos_d1*cos_dr)
+        X_denom = sin_d2*sin_d1 + cos_d2*cos_d1*cos_dr
+        
+        return AngleArray._wrap(np.arctan2(X_nom, X_denom))
     
+    @classmethod
+    def fromFrame(cls, lon, lat, frame):
+        """ Create an `RADecCatalog` object from spherical coordinates in another frame.
+            
+            Parameters
+            ----------
+            lon : array_like, `AngleArray`
+                The longitude-like coordinates, in radians if not an `AngleArray`
+            lat : array_like, `AngleArray`
+                The latitude-like coordinates, in radians if not an `AngleArray`
+            frame : str
+                The name of a registered frame (see: `frames`), e.g. 'galactic'
+        """
+        import frames # imported here to avoid a circular import with convert
+        (ra, dec) = frames.transform(np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64), frame, "icrs")
+        return cls(RAArray._wrap(ra), DecArray._wrap(dec))
+    
+    def convertTo(self, frame):
+        """ Convert the RAs and Decs to spherical coordinates in another frame with
+            a single rotation of all of the positions.
+            
+            Parameters
+            ----------
+            frame : str
+                The name of a registered frame (see: `frames`), e.g. 'galactic'
+                or 'ecliptic'
+            
+            Returns a tuple of `AngleArray` objects (longitude, latitude), with 
+            the longitudes in the range [0, 360) degrees.
+        """
+        import frames # imported here to avoid a circular import with convert
+        (lon, lat) = frames.transform(self.ra.radians, self.dec.radians, "icrs", frame)
+        return (AngleArray._wrap(lon), AngleArray._wrap(lat))
+    
+    def galactic(self):
+        """ Convert the RAs and Decs to Galactic longitudes and latitudes. 
+            
+            Returns a tuple of `AngleArray` objects (l, b), with l in the 
+            range [0, 360) degrees.
+        """
+        return self.convertTo("galactic")
+    
+    def coordinate(self):
+        """ Returns the positions as a `SphericalCoordinate` in the ICRS frame that 
+            shares the RA and Dec radians arrays, for repeated separations, 
+            rotations and frame changes that reuse the same unit vectors.
+        """
+        return SphericalCoordinate(self.ra, self.dec, frame="icrs")
 
-''' This is all experimental 
 class Coordinate(object):
-    """ A generic coordinate system class. Support n > 0 dimensions. This class is an 'abtract' class,
-        and should really only be used in the below subclasses.
+    """ A generic array of positions on the unit sphere in a celestial frame. This
+        class is an 'abstract' class, and should really only be used through the 
+        subclasses below.
+        
+        The positions are stored both as spherical angles (longitude, latitude) in 
+        radians and as an (N,3) array of Cartesian unit vectors. Only the 
+        representation the object was created from is filled in at first -- the 
+        other is computed the first time it's needed and then cached, so separations,
+        rotations and frame changes of the same positions only convert once.
     """
-    def __init__(self, *args):
-        if len(args) == 0: raise ValueError("You must specify at least one coordinate!")
+    
+    def __init__(self):
+        raise TypeError("Coordinate is an abstract class: use SphericalCoordinate or CartesianCoordinate.")
+    
+    def _setup(self, lon, lat, xyz, frame):
+        """ Fill in the representations (either may be None) and frame of a new object """
+        import frames # imported here to avoid a circular import with convert
+        self._lon = lon
+        self._lat = lat
+        self._xyz = xyz
+        self.frame = frames._frameName(frame)
+    
+    @classmethod
+    def _new(cls, lon, lat, xyz, frame):
+        """ Create an object of this class from radians or unit vectors without copying """
+        coordinate = cls.__new__(cls)
+        coordinate._setup(lon, lat, xyz, frame)
+        return coordinate
+    
+    def _spherical(self):
+        """ Returns the cached (lon, lat) radians arrays, converting from the unit vectors if needed """
+        if self._lon is None:
+            (self._lon, self._lat) = convert.unitVectorsToSpherical(self._xyz)
+        return (self._lon, self._lat)
+    
+    @property
+    def xyz(self):
+        """ The Cartesian unit vectors, an array with shape (N,3) """
+        if self._xyz is None:
+            self._xyz = convert.sphericalToUnitVectors(self._lon, self._lat)
+        return self._xyz
+    
+    @property
+    def lon(self):
+        """ The longitude-like coordinates (e.g. RA, l) as an `AngleArray` """
+        return AngleArray._wrap(self._spherical()[0])
+    
+    @property
+    def lat(self):
+        """ The latitude-like coordinates (e.g. Dec, b) as an `AngleArray` """
+        return AngleArray._wrap(self._spherical()[1])
+    
+    def __repr__(self):
+        return "<{0}: {1} positions in the '{2}' frame>".format(type(self).__name__, len(self), self.frame)
+    
+    def __len__(self):
+        if self._xyz is not None:
+            return len(self._xyz)
+        return len(self._lon)
+    
+    def __getitem__(self, key):
+        """ Returns a new object with the selected positions, carrying along 
+            whichever representations have already been computed.
+        """
+        if isinstance(key, (int, long, np.integer)):
+            key = slice(key, key+1 or None)
+        
+        lon = lat = xyz = None
+        if self._lon is not None:
+            (lon, lat) = (self._lon[key], self._lat[key])
+        if self._xyz is not None:
+            xyz = self._xyz[key]
+        return self._new(lon, lat, xyz, self.frame)
+    
+    def separation(self, other):
+        """ Calculate the angles between these positions and another set of positions
+            from the cached unit vectors, as atan2(|a x b|, a . b), which is accurate
+            at all separations.
+            
+            Parameters
+            ----------
+            other : `Coordinate`
+                If it contains one position, the angle between that position and 
+                every position in this object is computed (one-to-many). Otherwise
+                the angles are computed element-wise. If `other` is in a different 
+                frame, it is rotated into this one first.
+            
+            Returns an `AngleArray`.
+        """
+        if not isinstance(other, Coordinate):
+            raise ValueError("You must pass a Coordinate object into this function to calculate the separation.")
+        
+        if other.frame != self.frame:
+            other = other.transformTo(self.frame)
+        
+        if len(other) != 1 and len(other) != len(self):
+            raise ValueError("Element-wise separation requires coordinates of the same length ({0} != {1}).".format(len(self), len(other)))
+        
+        (xyz1, xyz2) = (self.xyz, other.xyz)
+        cross = np.cross(xyz1, xyz2)
+        dot = np.sum(xyz1*xyz2, axis=-1)
+        return AngleArray._wrap(np.arctan2(np.sqrt(np.sum(cross*cross, axis=-1)), dot))
+    
+    def rotate(self, matrix, frame=None):
+        """ Apply a rotation to the cached unit vectors.
+            
+            Parameters
+            ----------
+            matrix : array_like
+                A 3x3 rotation matrix R, applied to each unit vector as R v
+            frame : str (optional)
+                The name of the frame of the result, the same frame if not specified
+            
+            Returns a `CartesianCoordinate`.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape != (3,3):
+            raise ValueError("Coordinate.rotate: the rotation matrix must have shape (3,3), not {0}.".format(matrix.shape))
         
-        self.coordinates = []
-        for angle in args:
-            if not isinstance(angle, Angle): raise ValueError("Input not a geometry.Angle() object!")
-            self.coordinates.append(angle)
+        if frame is None:
+            frame = self.frame
+        return CartesianCoordinate._new(None, None, np.dot(self.xyz, matrix.T), frame)
+    
+    def transformTo(self, frame):
+        """ Convert the positions to another frame with a single rotation of the
+            cached unit vectors (see: `frames`).
+            
+            Parameters
+            ----------
+            frame : str
+                The name of a registered frame, e.g. 'icrs', 'galactic' or 'ecliptic'
+            
+            Returns a `CartesianCoordinate` in the new frame.
+        """
+        import frames # imported here to avoid a circular import with convert
+        return self.rotate(frames.transformMatrix(self.frame, frame), frame=frame)
 
 class SphericalCoordinate(Coordinate):
-    pass
+    """ An array of positions on the unit sphere created from spherical angles, 
+        see `Coordinate`.
+        
+        Parameters
+        ----------
+        lon : array_like, `AngleArray`
+            The longitude-like coordinates (e.g. RA, l)
+        lat : array_like, `AngleArray`
+            The latitude-like coordinates (e.g. Dec, b)
+        units : str
+            The units of `lon` and `lat`, if not `AngleArray` objects
+        frame : str
+            The name of a registered frame (see: `frames`)
+    """
+    
+    def __init__(self, lon, lat, units="radians", frame="icrs"):
+        lon = lon.radians if isinstance(lon, AngleArray) else AngleArray(lon, units).radians
+        lat = lat.radians if isinstance(lat, AngleArray) else AngleArray(lat, units).radians
+        
+        if lon.shape != lat.shape:
+            raise ValueError("SphericalCoordinate: longitude and latitude must have the same shape! ({0} != {1})".format(lon.shape, lat.shape))
+        
+        self._setup(lon.ravel(), lat.ravel(), None, frame)
 
 class CartesianCoordinate(Coordinate):
-    pass
+    """ An array of positions on the unit sphere created from Cartesian vectors,
+        see `Coordinate`.
+        
+        Parameters
+        ----------
+        xyz : array_like
+            An array of vectors with shape (N,3) or (3,). The vectors are normalized 
+            to unit length.
+        frame : str
+            The name of a registered frame (see: `frames`)
+    """
+    
+    def __init__(self, xyz, frame="icrs"):
+        xyz = np.array(xyz, dtype=np.float64, ndmin=2)
+        if xyz.ndim != 2 or xyz.shape[1] != 3:
+            raise ValueError("CartesianCoordinate: the vectors must have shape (N,3), not {0}.".format(xyz.shape))
+        
+        xyz /= np.sqrt(np.einsum("ij,ij->i", xyz, xyz))[:,np.newaxis]
+        self._setup(None, None, xyz, frame)
 
 class GalacticSphericalCoordinate(SphericalCoordinate):
-    pass
+    """ A `SphericalCoordinate` of Galactic longitudes and latitudes (l, b) """
+    
+    def __init__(self, l, b, units="radians"):
+        super(GalacticSphericalCoordinate, self).__init__(l, b, units=units, frame="galactic")
 
 class GalacticCartesianCoordinate(CartesianCoordinate):
-    pass
-'''
+    """ A `CartesianCoordinate` of unit vectors in the Galactic frame """
+    
+    def __init__(self, xyz):
+        super(GalacticCartesianCoordinate, self).__init__(xyz, frame="galactic")
 
 # Standalone functions
 def subtends(a1,b1,a2,b2,units="radians"):
@@ -486,24 +1229,16 @@ def subtends(a1,b1,a2,b2,units="radians"):
         b1 : float, `Angle`
         a2 : float, `Angle`
         b2 : float, `Angle`
-        units : str
+        units : str, `convert.Unit`
             Specify the units for input / output. 
     """
     
-    if units.lower() == "degrees":
-        a1 = math.radians(a1)
-        b1 = math.radians(b1)
-        a2 = math.radians(a2)
-        b2 = math.radians(b2)
-    elif units.lower() == "radians":
-        pass
-    elif units.lower() == "hours":
-        a1 = math.radians(convert.parseHours(a1)*15.)
-        b1 = math.radians(convert.parseHours(b1)*15.)
-        a2 = math.radians(convert.parseHours(a2)*15.)
-        b2 = math.radians(convert.parseHours(b2)*15.)
-    else:
-        raise IllegalUnitsError("units must be 'radians', 'degrees', or 'hours' -- you entered: {0}".format(units))
+    unit = convert.resolveUnits(units)
+    if unit is convert.DEGREES:
+        (a1, b1, a2, b2) = (math.radians(a1), math.radians(b1), math.radians(a2), math.radians(b2))
+    elif unit is convert.HOURS:
+        (a1, b1, a2, b2) = (convert.hoursToRadians(convert.parseHours(a1)), convert.hoursToRadians(convert.parseHours(b1)), 
+                            convert.hoursToRadians(convert.parseHours(a2)), convert.hoursToRadians(convert.parseHours(b2)))
     
     x1 = math.cos(a1)*math.cos(b1)
     y1 = math.sin(a1)*math.cos(b1)
@@ -517,14 +1252,7 @@ def subtends(a1,b1,a2,b2,units="radians"):
     #           a standalone function, it should be the latter...
     #theta = Angle.fromDegrees(math.degrees(math.acos(x1*x2+y1*y2+z1*z2)))
     
-    if units.lower() == "degrees":
-        return math.degrees(math.acos(x1*x2+y1*y2+z1*z2))
-    elif units.lower() == "radians":
-        return math.acos(x1*x2+y1*y2+z1*z2)
-    elif units.lower() == "hours":
-        return math.degrees(math.acos(x1*x2+y1*y2+z1*z2))/15.
-    else:
-        raise IllegalUnitsError("units must be 'radians', 'degrees', or 'hours' -- you entered: {0}".format(units))
+    return unit.fromRadians(math.acos(x1*x2+y1*y2+z1*z2))
 
 def subtends_degrees(a1, b1, a2, b2):
     """ Calculate the angle subtended by 2 angular positions on the surface of a sphere.
@@ -635,5 +1363,352 @@ if __name__ == "__main__":
             boundsAngle.setBounds(0,360, units="degrees")
             boundsAngle.normalize()
             self.assertAlmostEqual(boundsAngle.degrees % 360, deg, 12)
+        
+        def test_units(self):
+            self.assertTrue(convert.resolveUnits("Degrees") is convert.DEGREES)
+            self.assertTrue(convert.resolveUnits(convert.HOURS) is convert.HOURS)
+            self.assertRaises(IllegalUnitsError, convert.resolveUnits, "arcseconds")
+            self.assertRaises(IllegalUnitsError, Angle, 1., "arcseconds")
+            
+            for units, value in [("degrees", deg), ("DEGREES", strDeg), ("hours", strHrs), ("Radians", rad)]:
+                unit = convert.resolveUnits(units)
+                self.assertEqual(Angle(value, unit).radians, Angle(value, units).radians)
+                self.assertEqual(AngleArray([value], unit).radians[0], Angle(value, units).radians)
+                self.assertEqual(Angle(value, unit).string(units=unit), Angle(value, units).string(units=units.lower()))
+            
+            self.assertEqual(subtends(1., 2., 3., 4., units=convert.HOURS), subtends(1., 2., 3., 4., units="hours"))
+            self.assertAlmostEqual(subtends(15., 30., 45., 60., units="degrees"), math.degrees(subtends(1., 2., 3., 4., units="hours")*15.*math.pi/180.), 10)
+        
+        def test_parseMalformed(self):
+            # Strings with the shape of the general grammars but malformed fields
+            for x in ["12:30:1.2.3", "12 30 45..5", "4...", "-10 20 3.4.5"]:
+                self.assertTrue(convert._parseHoursString(x) is None)
+                self.assertTrue(convert._parseDegreesString(x) is None)
+                self.assertRaises(ValueError, convert.parseHours, x)
+                self.assertRaises(ValueError, convert.parseDegrees, x)
+        
+        def test_slotsAndCache(self):
+            for angle in [Angle.fromDegrees(deg), RA(hrs), Dec(deg)]:
+                self.assertFalse(hasattr(angle, "__dict__"))
+            
+            angle = Angle.fromDegrees(deg)
+            self.assertTrue(angle.hms is angle.hms)
+            self.assertEqual(repr(angle), repr(copy.copy(angle)))
+            
+            angle.normalize((-180, 180), units="degrees", inplace=True)
+            self.assertAlmostEqual(angle.degrees, deg - 360., 12)
+            # Wrapping in radians can differ from the expected value in the last bit
+            expected = Angle.fromDegrees(deg - 360.).hms
+            self.assertEqual(angle.hms[:2], expected[:2])
+            self.assertAlmostEqual(angle.hms[2], expected[2], 9)
+            self.assertTrue("-143" in repr(angle))
+    
+    class TestAngleArray(unittest.TestCase):
+        
+        def test_unitsEqual(self):
+            arr = AngleArray.fromDegrees([deg, -deg, 0.])
+            self.assertEqual(arr.radians.dtype, np.float64)
+            
+            for fromUnits in [AngleArray.fromHours([hrs, -hrs, 0.]), AngleArray.fromRadians([rad, -rad, 0.]), AngleArray.fromHours(np.array([hrs, -hrs, 0.]).astype(str))]:
+                for ii in range(3):
+                    self.assertAlmostEqual(fromUnits.degrees[ii], arr.degrees[ii], 10)
+                    self.assertAlmostEqual(fromUnits.hours[ii], arr.hours[ii], 10)
+            
+            self.assertAlmostEqual(AngleArray.fromHours([strHrs])[0].degrees, deg, 10)
+            
+            h,m,s = arr.hms
+            self.assertEqual((h[0], m[0]), angleFromDeg.hms[:2])
+            self.assertAlmostEqual(s[0], angleFromDeg.hms[2], 8)
+        
+        def test_parseArrays(self):
+            hours = np.random.uniform(-23.9, 23.9, 1000)
+            strings = list(convert.hoursToStringArray(hours, precision=6, sep=":")) + [repr(x) for x in hours[:10]] + \
+                      ["12h34m56.7s", " 5:06:07.25 ", "25.", "not an hour", "1:2:3", "99:00:00.0", "-0:30:00.00"]
+            
+            (parsed, valid) = convert.parseHoursArray(np.array(strings), returnMask=True)
+            self.assertEqual(list(np.flatnonzero(~valid)), [len(strings)-5, len(strings)-4, len(strings)-3])
+            self.assertTrue(np.all(np.isnan(parsed[~valid])))
+            for x, value in zip(np.array(strings)[valid], parsed[valid]):
+                self.assertEqual(value, convert.parseHours(x))
+            
+            self.assertRaises(ValueError, convert.parseHoursArray, strings[-4:])
+            self.assertRaises(IllegalHourError, convert.parseHoursArray, strings)
+            self.assertRaises(IllegalHourError, convert.parseHoursArray, [1.5, 24.])
+            
+            (parsed, valid) = convert.parseDegreesArray(iter(["-00:30:00.0", "-120:30:00.5", "+12 30 00.5", "1e3", "inf", "1..5"]), returnMask=True)
+            self.assertEqual(list(valid), [True, True, True, True, False, False])
+            self.assertEqual(list(parsed[:4]), [convert.parseDegrees(x) for x in ["-00:30:00.0", "-120:30:00.5", "+12 30 00.5", "1e3"]])
+            self.assertEqual(parsed[0], -0.5)
+            
+            self.assertTrue(np.allclose(AngleArray(np.array(strings[:1000]), "hours").hours, convert.parseHoursArray(strings[:1000])))
+            
+            # Malformed rows are masked, not raised
+            malformed = ["12:30:1.2.3", "12 30 45..5", "4...", "-10 20 3.4.5", "12:30:45.5"]
+            for parseArray in [convert.parseHoursArray, convert.parseDegreesArray]:
+                (parsed, valid) = parseArray(malformed, returnMask=True)
+                self.assertEqual(list(valid), [False, False, False, False, True])
+                self.assertTrue(np.all(np.isnan(parsed[:4])))
+                self.assertRaises(ValueError, parseArray, malformed)
+            
+            # Non-ASCII rows are invalid, not an error for the whole array
+            for parseArray in [convert.parseHoursArray, convert.parseDegreesArray]:
+                (parsed, valid) = parseArray([u"12:00:00", u"12\xb030"], returnMask=True)
+                self.assertEqual(list(valid), [True, False])
+                self.assertEqual(parsed[0], 12.)
+                self.assertRaises(ValueError, parseArray, [u"12:00:00", u"12\xb030"])
+            (ra, dec, valid) = convert.parseRADecStringArray([u"J120000+100000", u"J12\xe9"], returnMask=True)
+            self.assertEqual(list(valid), [True, False])
+        
+        # The sign of sexagesimal hours applies to the whole value, as for degrees
+        def test_negativeHours(self):
+            strings = ["-0:30:00.00", "-12:30:00.00", "-12 30 00.00", "+1:30:00.0"]
+            (parsed, valid) = convert.parseHoursArray(strings, returnMask=True)
+            self.assertEqual(list(parsed), [-0.5, -12.5, -12.5, 1.5])
+            self.assertEqual([convert.parseHours(x) for x in strings], [-0.5, -12.5, -12.5, 1.5])
+            self.assertEqual(convert.parseHours(convert.hoursToString(-12.5, sep=":")), -12.5)
+        
+        def test_components(self):
+            hours = np.concatenate([np.random.uniform(-23.9, 23.9, 1000), [-0., 0., -0.2, -1E-12]])
+            hms = convert.hoursToHMSArray(hours)
+            for x, components in zip(hours, hms):
+                self.assertEqual((components["h"], components["m"], components["s"]), convert.hoursToHMS(x))
+            self.assertEqual(list(hms["sign"][-4:]), [-1, 1, -1, -1])
+            
+            radians = np.random.uniform(-7., 7., (10,10))
+            dms = convert.radiansToDMSArray(radians)
+            self.assertEqual(dms.shape, (10,10))
+            self.assertEqual(tuple(dms[3,4])[1:], convert.radiansToDMS(radians[3,4]))
+            self.assertEqual(tuple(convert.degreesToDMSArray([-0.2])[0]), (-1, 0, 12, convert.degreesToDMS(-0.2)[2]))
+            
+            self.assertRaises(IllegalHourError, convert.hoursToHMSArray, [1., 24.])
+            self.assertRaises(IllegalHourError, convert.radiansToHMSArray, [np.nan])
+            self.assertRaises(IllegalMinuteError, convert.degreesToDMSArray, [np.nan])
+        
+        def test_indexing(self):
+            ras = RAArray([1., 2., 3., 4.])
+            self.assertTrue(isinstance(ras[1], RA))
+            self.assertAlmostEqual(ras[1].hours, 2., 12)
+            self.assertTrue(isinstance(ras[1:3], RAArray))
+            self.assertEqual(len(ras[[0, 2, 3]]), 3)
+            self.assertAlmostEqual(ras[ras.hours > 2.5].hours[0], 3., 12)
+            self.assertAlmostEqual((ras + ras)[3].hours, 8., 12)
+            self.assertAlmostEqual((ras / 2.)[3].hours, 2., 12)
+        
+        def test_string(self):
+            values = [deg, -deg, -0.2, 59.99999999999, 0.]
+            arr = AngleArray.fromDegrees(values)
+            for kwargs in [dict(), dict(units="hours", sep=":", pad=True), dict(sep="dms", precision=2), dict(units="hours", decimal=True, precision=8)]:
+                strings = arr.string(**kwargs)
+                self.assertEqual(list(strings), [Angle.fromDegrees(x).string(**kwargs) for x in values])
+            
+            self.assertEqual(list(arr.string(sep=":", precision=1)), ["216:14:14.9", "-216:14:14.9", "-0:12:00.0", "60:00:00.0", "0:00:00.0"])
+            self.assertEqual(RAArray([12.5]).string(sep=":", precision=0)[0], "12:30:000")
+            
+            out = np.zeros(len(values), dtype="S32")
+            convert.degreesToStringArray(values, out=out)
+            self.assertEqual(list(out), list(arr.string(sep=":")))
+        
+        def test_ufuncs(self):
+            ra = RA(hrs)
+            self.assertEqual(np.sin(ra), math.sin(ra.radians))
+            self.assertTrue(isinstance(ra + ra, RA))
+            self.assertTrue(isinstance(np.subtract(ra, ra), RA))
+            self.assertTrue(isinstance(np.arange(3.) * ra, RAArray))
+            self.assertTrue(isinstance(ra * np.arange(3.), RAArray))
+            
+            arr = np.array([ra, Dec(deg)])
+            self.assertEqual(arr.dtype, np.float64)
+            self.assertEqual((arr * 2).dtype, np.float64)
+            
+            decs = DecArray([deg, -deg])
+            self.assertTrue(np.all(np.cos(decs) == np.cos(decs.radians)))
+            self.assertTrue(isinstance(decs / 2., DecArray))
+            self.assertTrue(isinstance(np.negative(decs), DecArray))
+            self.assertRaises(TypeError, np.add, decs, 1.)
+            
+            # Arrays of numbers and of Angles both convert to Cartesian coordinates
+            (a, b) = (np.array([10., 200.]), np.array([-30., 45.]))
+            expected = convert.sphericalToUnitVectors(np.radians(a), np.radians(b))
+            for (x, y) in [(a, b), (list(a), list(b)), ([Angle(v, units="degrees") for v in a], [Angle(v, units="degrees") for v in b]), 
+                           (np.array([Angle(v, units="degrees") for v in a], dtype=object), np.array([Angle(v, units="degrees") for v in b], dtype=object))]:
+                self.assertTrue(np.allclose(convert.sphericalAnglesToCartesian(x, y, units="degrees"), expected.T, rtol=0., atol=1E-15))
+        
+        def test_normalize(self):
+            values = np.array([-721., -540., -180., -0.5, 0., 179.9, 180., 359.99, 360., 752.1834])
+            arr = AngleArray.fromDegrees(values)
+            
+            wrapped = arr.normalize((-180, 180), units="degrees")
+            self.assertTrue(isinstance(wrapped, AngleArray))
+            for ii, value in enumerate(values):
+                self.assertAlmostEqual(wrapped.degrees[ii], Angle.fromDegrees(value).normalize((-180, 180), units="degrees").degrees, 10)
+            
+            ras = RAArray.fromDegrees(values)
+            radians = ras.radians
+            self.assertTrue(ras.normalize(("0:0:0.0", 360), units="degrees", inplace=True) is ras)
+            self.assertTrue(ras.radians is radians)
+            self.assertTrue(np.all((ras.degrees >= 0.) & (ras.degrees < 360.)))
+            self.assertTrue(np.allclose(ras.degrees, values % 360.))
+            
+            # Tiny negative angles round up to the upper bound, which is excluded
+            twoPi = 2*math.pi
+            self.assertEqual(convert.wrapRadians(-1E-17, (0, twoPi)), 0.)
+            self.assertEqual(list(convert.wrapRadians(np.array([-1E-17, twoPi]), (0, twoPi))), [0., 0.])
+            self.assertEqual(convert.wrapRadians(np.float64(-1E-17), (0, twoPi), out=None), 0.)
+            self.assertEqual(list(convert.wrapRadians(np.array([-math.pi - 1E-16]), (-math.pi, math.pi))), [-math.pi])
+            self.assertEqual(list(RAArray.fromRadians([-1E-17]).normalize((0, 360), units="degrees").degrees), [0.])
+    
+    class TestRADecCatalog(unittest.TestCase):
+        
+        def test_vectorizedMethods(self):
+            radecs = [RADec((ra, dec)) for ra, dec in [("14:24:56.99", "-41:08:15.16"), (3.5, 12.25), (23.9, 89.1)]]
+            catalog = RADecCatalog.fromRADecs(radecs)
+            self.assertEqual(len(catalog), 3)
+            self.assertTrue(isinstance(catalog[1], RADec))
+            self.assertTrue(isinstance(catalog[:2], RADecCatalog))
+            
+            for radec, roundTrip in zip(radecs, catalog.toRADecs()):
+                self.assertAlmostEqual(radec.ra.radians, roundTrip.ra.radians, 15)
+                self.assertAlmostEqual(radec.dec.radians, roundTrip.dec.radians, 15)
+            
+            oneToMany = catalog.subtends(radecs[0])
+            elementWise = catalog.subtends(RADecCatalog.fromRADecs(radecs[::-1]))
+            l, b = catalog.galactic()
+            for ii, radec in enumerate(radecs):
+                self.assertAlmostEqual(oneToMany[ii].radians, radec.subtends(radecs[0]).radians, 12)
+                self.assertAlmostEqual(elementWise[ii].radians, radec.subtends(radecs[::-1][ii]).radians, 12)
+                
+                gl, gb = convert.j2000ToGalactic(radec.ra.radians, radec.dec.radians)
+                self.assertAlmostEqual(l[ii].degrees, gl.degrees % 360., 8)
+                self.assertAlmostEqual(b[ii].degrees, gb.degrees, 8)
+            
+            self.assertEqual(list(catalog.Jstring()), [radec.Jstring() for radec in radecs])
+        
+        def test_Jstrings(self):
+            ra = np.random.uniform(0., 24., 1000)
+            dec = np.concatenate([np.random.uniform(-90., 90., 996), [-0.2, 0., 89.99999, -1E-9]])
+            catalog = RADecCatalog(ra, dec)
+            
+            jstrings = catalog.Jstring()
+            self.assertEqual(list(jstrings), [radec.Jstring() for radec in catalog])
+            self.assertEqual(list(jstrings[-4:]), ["J{0}-001200.0".format(jstrings[-4][1:10]), "J{0}+000000.0".format(jstrings[-3][1:10]),
+                                                   "J{0}+900000.0".format(jstrings[-2][1:10]), "J{0}-000000.0".format(jstrings[-1][1:10])])
+            
+            parsed = RADecCatalog.fromJstrings(list(jstrings) + ["J01:02:03.04 -05:06:07.8"])
+            for ii, jstring in enumerate(list(jstrings) + ["J01:02:03.04 -05:06:07.8"]):
+                radec = RADec(jstring)
+                self.assertEqual(parsed.ra.radians[ii], radec.ra.radians)
+                self.assertEqual(parsed.dec.radians[ii], radec.dec.radians)
+            
+            self.assertRaises(ValueError, RADecCatalog.fromJstrings, ["J123456.78+12:AB"])
+        
+        def test_frames(self):
+            ra = np.random.uniform(0., 24., 100)
+            dec = np.random.uniform(-90., 90., 100)
+            catalog = RADecCatalog(ra, dec)
+            
+            (l, b) = catalog.convertTo("galactic")
+            (lam, beta) = catalog.convertTo("ecliptic")
+            for ii in range(len(catalog)):
+                (gl, gb) = convert.j2000ToGalactic(catalog.ra.radians[ii], catalog.dec.radians[ii])
+                self.assertAlmostEqual(l.degrees[ii], gl.degrees % 360., 8)
+                self.assertAlmostEqual(b.degrees[ii], gb.degrees, 8)
+                
+                (elon, elat) = convert.raDec2EclipticLatLon(ra[ii]*15., dec[ii])
+                self.assertAlmostEqual(lam.degrees[ii], elon, 8)
+                self.assertAlmostEqual(beta.degrees[ii], elat, 8)
+                
+                radec = catalog[ii]
+                self.assertAlmostEqual(radec.convertTo("ecliptic")[0].radians, lam.radians[ii], 12)
+            
+            # Two hops, through ICRS
+            roundTrip = RADecCatalog.fromFrame(*catalog.convertTo("galactic"), frame="galactic")
+            self.assertTrue(np.allclose(roundTrip.subtends(catalog).radians, 0., atol=1E-12))
+            (l2, b2) = frames.transform(lam.radians, beta.radians, "ecliptic", "galactic")
+            self.assertTrue(np.allclose(l2, l.radians) and np.allclose(b2, b.radians))
+            self.assertRaises(ValueError, catalog.convertTo, "unknown")
+        
+        def test_fromStrings(self):
+            strings = ["03:14:15.9 +26:37:10.11", "J141213.23+161252.1", "12h04m12.1s -00d12m03.5s", "not a position", "23 59 59.99 -89 59 59.9"]
+            
+            catalog, valid = RADecCatalog.fromStrings(iter(strings), returnMask=True)
+            self.assertEqual(list(valid), [True, True, True, False, True])
+            self.assertTrue(np.isnan(catalog.ra.radians[3]) and np.isnan(catalog.dec.radians[3]))
+            for ii in np.flatnonzero(valid):
+                radec = RADec(strings[ii])
+                self.assertEqual(catalog.ra.radians[ii], radec.ra.radians)
+                self.assertEqual(catalog.dec.radians[ii], radec.dec.radians)
+            
+            self.assertRaises(ValueError, RADecCatalog.fromStrings, strings)
+            self.assertEqual(len(RADecCatalog.fromStrings(np.array(strings[:3])).toRADecs()), 3)
+    
+    class TestUserFrame(unittest.TestCase):
+        
+        def setUp(self):
+            # A user-defined frame, rotated 90 degrees about the z axis from Galactic,
+            #   so x' = y and y' = -x, i.e. the longitudes are 90 degrees smaller
+            self.rotation = np.array([[0., 1., 0.], [-1., 0., 0.], [0., 0., 1.]])
+            frames.registerTransform("galactic", "rotated", self.rotation)
+        
+        def tearDown(self):
+            frames._unregisterFrame("rotated")
+        
+        def test_convertTo(self):
+            expected = np.dot(self.rotation, frames.transformMatrix("icrs", "galactic"))
+            self.assertTrue(np.allclose(frames.transformMatrix("icrs", "rotated"), expected, rtol=0., atol=1E-15))
+            
+            catalog = RADecCatalog(np.random.uniform(0., 24., 100), np.random.uniform(-90., 90., 100))
+            (l, b) = catalog.convertTo("galactic")
+            (lr, br) = catalog.convertTo("rotated")
+            self.assertTrue(np.allclose((lr.degrees - l.degrees + 90. + 180.) % 360. - 180., 0., atol=1E-9))
+            self.assertTrue(np.allclose(br.radians, b.radians))
+    
+    class TestCoordinate(unittest.TestCase):
+        
+        def test_cachedRepresentations(self):
+            ra = np.random.uniform(0., 2*np.pi, 100)
+            dec = np.random.uniform(-np.pi/2, np.pi/2, 100)
+            
+            spherical = SphericalCoordinate(ra, dec)
+            self.assertTrue(spherical._xyz is None)
+            xyz = spherical.xyz
+            self.assertTrue(spherical.xyz is xyz)
+            self.assertTrue(np.allclose(xyz, convert.sphericalToUnitVectors(ra, dec)))
+            
+            cartesian = CartesianCoordinate(xyz*3.)
+            self.assertTrue(cartesian._lon is None)
+            self.assertTrue(np.allclose(cartesian.lon.radians, ra) and np.allclose(cartesian.lat.radians, dec))
+            self.assertTrue(cartesian._lon is not None)
+            
+            self.assertEqual(len(spherical[5:10]), 5)
+            self.assertEqual(len(spherical[-1]), 1)
+            self.assertTrue(spherical[3:4]._xyz is not None)
+            self.assertRaises(ValueError, CartesianCoordinate, [1., 2.])
+            self.assertRaises(TypeError, Coordinate)
+        
+        def test_separationAndFrames(self):
+            ra = np.random.uniform(0., 24., 100)
+            dec = np.random.uniform(-90., 90., 100)
+            catalog = RADecCatalog(ra, dec)
+            coordinate = catalog.coordinate()
+            
+            self.assertTrue(np.allclose(coordinate.separation(coordinate[0]).radians, catalog.subtends(catalog[0]).radians, atol=1E-12))
+            self.assertTrue(np.allclose(coordinate.separation(coordinate[::-1]).radians, catalog.subtends(catalog[::-1]).radians, atol=1E-12))
+            
+            galactic = coordinate.transformTo("galactic")
+            (l, b) = catalog.galactic()
+            self.assertEqual(galactic.frame, "galactic")
+            self.assertTrue(np.allclose(galactic.lon.radians, l.radians) and np.allclose(galactic.lat.radians, b.radians))
+            self.assertTrue(np.allclose(GalacticSphericalCoordinate(l, b).xyz, galactic.xyz))
+            
+            # Separations are the same in any frame
+            self.assertTrue(np.allclose(galactic.separation(coordinate[0]).radians, coordinate.separation(coordinate[0]).radians))
+            
+            # x' = -y and y' = x, so the longitudes are 90 degrees larger
+            rotated = coordinate.rotate([[0., -1., 0.], [1., 0., 0.], [0., 0., 1.]])
+            self.assertTrue(np.allclose(np.cos(rotated.lon.radians - coordinate.lon.radians), 0.))
+            self.assertTrue(np.allclose(np.sin(rotated.lon.radians - coordinate.lon.radians), 1.))
+            self.assertTrue(np.allclose(rotated.xyz[:,0], -coordinate.xyz[:,1]) and np.allclose(rotated.xyz[:,1], coordinate.xyz[:,0]))
+            self.assertTrue(np.allclose(rotated.lat.radians, coordinate.lat.radians))
     
+    import frames
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+
+""" apwlib
+    ------
+    
+    Copyright (C) 2012 Adrian Price-Whelan
+    
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+    
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+################################################################################
+# observing.py - Sidereal time and hour angles at an observatory.
+#
+#   An ObservingSite parses its longitude and latitude once, and its methods take
+#   arrays of targets and arrays of times. The result for M targets and N times
+#   is an (M, N) grid (in general the shape of the targets followed by the shape
+#   of the times), and the sidereal time is only computed once for each time.
+#
+
+__author__ = 'Adrian Price-Whelan <adrn@astro.columbia.edu>'
+__all__ = ["ObservingSite"]
+
+# Third-party
+import numpy as np
+
+# Project Dependencies
+import convert
+import geometry as g
+from astrodatetime import AstroTimeArray
+
+def _targetsByTimes(targets, times):
+    """ Reshapes an array of targets so it broadcasts against the times to give a
+        grid with the shape of the targets followed by the shape of the times.
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    return targets.reshape(targets.shape + (1,) * len(convert._timeShape(times)))
+
+class ObservingSite(object):
+    """ An observatory at a longitude and latitude, which answers sidereal time and
+        hour angle questions for arrays of targets and times.
+        
+        Times can be given as an AstroTimeArray, a datetime object (that knows its
+        time zone) or a sequence of them, a numpy datetime64 array in UTC, Julian
+        Dates, or a two-part JD (see: convert.twoPartJD).
+    """
+    
+    def __init__(self, longitude, latitude, longitudeDirection="w", units="degrees", name=None):
+        """ Parameters
+            ----------
+            longitude : float, int, `Angle`, str
+                The longitude of the site in the specified units
+            latitude : float, int, `Angle`, str
+                The latitude of the site in the specified units
+            longitudeDirection : str, {'W', 'E'}
+                The direction from Greenwich that the longitude is measured in.
+                Can be "E" or "W" (east or west), but by default is WEST ("W")
+            units : str
+                Can be 'degrees', 'radians', or 'hours', default is "degrees"
+            name : str
+        """
+        self.name = name
+        
+        eastHours = convert._eastLongitudeHours(longitude, longitudeDirection, units)
+        self.longitude = g.Angle.fromHours(eastHours)
+        self.latitude = g.Angle(latitude, units=units)
+        if abs(self.latitude.degrees) > 90.:
+            raise ValueError("ObservingSite: latitude must be in the range [-90,90] degrees ({0}).".format(self.latitude.degrees))
+        
+        self._eastLongitudeHours = float(eastHours)
+    
+    def __repr__(self):
+        name = "" if self.name is None else "'{0}' ".format(self.name)
+        return "<ObservingSite {0}longitude={1:.6f}E latitude={2:.6f} (degrees)>".format(name, self.longitude.degrees, self.latitude.degrees)
+    
+    def lst(self, times, out=None):
+        """ Compute the Local Sidereal Times in hours, see: convert.jdToLST
+            
+            Parameters
+            ----------
+            times
+                The times, see: ObservingSite
+            out : `numpy.ndarray`
+                An optional float64 array with the shape of the times to write the
+                result into
+        """
+        return convert.jdToLST(convert._timeToJD(times), self._eastLongitudeHours, longitudeDirection="e", longitudeUnits="hours", out=out)
+    
+    def hourAngle(self, ra, times, raUnits="hours", out=None):
+        """ Compute the hour angles in hours, in the range [-12,12), of Right
+            Ascensions at times.
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in raUnits
+            times
+                The times, see: ObservingSite
+            raUnits : str
+                Can be 'hours', 'degrees', or 'radians', default is "hours"
+            out : `numpy.ndarray`
+                An optional float64 array with the shape of the targets followed
+                by the shape of the times to write the result into
+        """
+        jd = convert._timeToJD(times)
+        raHours = _targetsByTimes(convert._anglesToHours(ra, raUnits), jd)
+        
+        ha = np.subtract(self.lst(jd), raHours, out=out)
+        ha = np.add(ha, 12.0, out=out)
+        ha = np.remainder(ha, 24.0, out=out)
+        return np.subtract(ha, 12.0, out=out)
+    
+    def ra(self, ha, times, raUnits="hours", out=None):
+        """ Compute the Right Ascensions at hour angles (in hours) at times,
+            in the range [0,24) hours or [0,360) degrees.
+            
+            Parameters
+            ----------
+            ha : float, array_like
+                The hour angles in hours
+            times
+                The times, see: ObservingSite
+            raUnits : str, {'hours', 'degrees'}
+                The units of the result, default is "hours"
+            out : `numpy.ndarray`
+                An optional float64 array with the shape of the hour angles
+                followed by the shape of the times to write the result into
+        """
+        jd = convert._timeToJD(times)
+        ra = np.subtract(self.lst(jd), _targetsByTimes(ha, jd), out=out)
+        ra = np.remainder(ra, 24.0, out=out)
+        
+        unit = convert.resolveUnits(raUnits)
+        if unit is convert.DEGREES:
+            ra = np.multiply(ra, 15.0, out=out)
+        elif unit is not convert.HOURS:
+            raise AssertionError('raUnits must be either HOURS or DEGREES')
+        return ra
+    
+    def altAz(self, ra, dec, times, units="degrees", out=None, maxMemory=convert._gridMemory, airmassFormula=None, parallacticAngle=False):
+        """ Compute the altitudes and azimuths (east of north) of targets at times,
+            and optionally their airmass and parallactic angles in the same pass, 
+            see: convert.raDec2AltAzGrid
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in units
+            dec : float, array_like
+                The declinations of the targets in units
+            times
+                The times, see: ObservingSite
+            units : str
+                The units of the positions and the results, 'degrees' (default) or
+                'radians'
+            out : tuple
+                An optional tuple of C-contiguous float64 arrays, one for each 
+                result, with the shape of the targets followed by the shape of the
+                times to write the results into
+            maxMemory : int
+                The most memory in bytes to use for temporary arrays
+            airmassFormula : str
+                If given, also return the airmass from this formula, see: airmass
+            parallacticAngle : bool
+                If True, also return the parallactic angles
+            
+            Returns a tuple (alt, az), followed by the airmass and parallactic 
+            angles if they were asked for, of arrays with the shape of the targets
+            followed by the shape of the times.
+        """
+        return convert._raDec2AltAzGrid(ra, dec, times, self.latitude.radians, self._eastLongitudeHours, 
+                                        convert.resolveUnits(units), out, maxMemory, 
+                                        airmassFormula=airmassFormula, parallacticAngle=parallacticAngle)
+    
+    def airmass(self, ra, dec, times, formula="plane-parallel", units="degrees", out=None, maxMemory=convert._gridMemory):
+        """ Compute the airmass of targets at times, see: convert.airmass
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in units
+            dec : float, array_like
+                The declinations of the targets in units
+            times
+                The times, see: ObservingSite
+            formula : str
+                'plane-parallel' (default) or 'kasten-young'
+            units : str
+                The units of the positions, 'degrees' (default) or 'radians'
+            out : `numpy.ndarray`
+                An optional C-contiguous float64 array with the shape of the 
+                targets followed by the shape of the times to write the result into
+            maxMemory : int
+                The most memory in bytes to use for temporary arrays
+            
+            Returns an array with the shape of the targets followed by the shape 
+            of the times, which is NaN where a target is below the horizon.
+        """
+        return convert._raDecGrid(ra, dec, times, self.latitude.radians, self._eastLongitudeHours, convert.resolveUnits(units), 
+                                  ["airmass"], None if out is None else (out,), maxMemory, airmassFormula=formula)[0]
+    
+    def parallacticAngle(self, ra, dec, times, units="degrees", out=None, maxMemory=convert._gridMemory):
+        """ Compute the parallactic angles of targets at times, positive west of 
+            the meridian, see: convert.raDec2AltAzGrid
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in units
+            dec : float, array_like
+                The declinations of the targets in units
+            times
+                The times, see: ObservingSite
+            units : str
+                The units of the positions and the results, 'degrees' (default) or
+                'radians'
+            out : `numpy.ndarray`
+                An optional C-contiguous float64 array with the shape of the 
+                targets followed by the shape of the times to write the result into
+            maxMemory : int
+                The most memory in bytes to use for temporary arrays
+        """
+        return convert._raDecGrid(ra, dec, times, self.latitude.radians, self._eastLongitudeHours, convert.resolveUnits(units), 
+                                  ["parallacticAngle"], None if out is None else (out,), maxMemory)[0]
+    
+    def transitTime(self, ra, times, raUnits="hours"):
+        """ Find the first transits of Right Ascensions at or after times, see:
+            convert.ra2transitTime
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in raUnits
+            times
+                The times to start from, e.g. the start of each night, see:
+                ObservingSite
+            raUnits : str
+                Can be 'hours', 'degrees', or 'radians', default is "hours"
+            
+            Returns an AstroTimeArray with the shape of the targets followed by the
+            shape of the times.
+        """
+        jd = convert._timeToJD(times)
+        raHours = _targetsByTimes(convert._anglesToHours(ra, raUnits), jd)
+        return AstroTimeArray.fromJD(convert._nextTransitJD(raHours, jd, self._eastLongitudeHours))
+
+    def riseTransitSet(self, ra, dec, times, altitude=0., units="degrees"):
+        """ Find the times that targets rise above an altitude, transit, and set 
+            below it, around the transit nearest to each time, see: 
+            convert.raDec2RiseTransitSet
+            
+            Parameters
+            ----------
+            ra : float, array_like
+                The right ascensions of the targets in units
+            dec : float, array_like
+                The declinations of the targets in units
+            times
+                The times, e.g. local midnight on each night, see: ObservingSite
+            altitude : float
+                The altitude of the horizon in units, default is 0
+            units : str
+                The units of the positions and the altitude, 'degrees' (default)
+                or 'radians'
+            
+            Returns a tuple (rise, transit, set, circumpolar, neverRises) of three
+            AstroTimeArrays with the shape of the targets followed by the shape of
+            the times, and two boolean arrays with the shape of the targets. The 
+            rise and set times of circumpolar and never rising targets are NaT.
+        """
+        return convert._raDec2RiseTransitSet(ra, dec, times, self.latitude.radians, self._eastLongitudeHours, 
+                                             convert.resolveUnits(units), altitude)
+
+if __name__ == "__main__":
+    import unittest, math
+    from astrodatetime import astrodatetime, gmt
+
+    class TestObservingSite(unittest.TestCase):
+        
+        def setUp(self):
+            np.random.seed(42)
+            self.site = ObservingSite(70.7366, -30.2407, name="CTIO")
+            self.times = AstroTimeArray.fromJD(2455893.66045 + np.arange(5) / 24.)
+            self.ra = np.array([0., 5.5, 12.25, 23.9])
+        
+        def test_lst(self):
+            lst = self.site.lst(self.times)
+            self.assertEqual(lst.shape, (5,))
+            for ii in range(5):
+                self.assertEqual(lst[ii], self.times[ii].lst(70.7366))
+            self.assertTrue(np.all(self.site.lst(self.times.twoPartJD) == lst))
+            
+            east = ObservingSite("-70:44:11.76", "-30:14:26.52", longitudeDirection="e")
+            self.assertTrue(np.allclose(east.lst(self.times), lst))
+            self.assertRaises(ValueError, ObservingSite, 0., 91.)
+        
+        def test_hourAngle(self):
+            ha = self.site.hourAngle(self.ra, self.times)
+            self.assertEqual(ha.shape, (4, 5))
+            self.assertTrue(np.all((ha >= -12.) & (ha < 12.)))
+            
+            lst = self.site.lst(self.times)
+            for ii in range(4):
+                for jj in range(5):
+                    expected = convert.raUTC2ha(self.ra[ii], self.times[jj], 70.7366)
+                    self.assertAlmostEqual(ha[ii,jj], (expected + 12.) % 24. - 12., 10)
+            
+            out = np.empty((4, 5))
+            self.site.hourAngle(self.ra * 15., self.times, raUnits="degrees", out=out)
+            self.assertTrue(np.allclose(out, ha))
+            
+            ra = self.site.ra(ha[:,:1], self.times[:1])
+            self.assertEqual(ra.shape, (4, 1, 1))
+            self.assertTrue(np.allclose((ra.reshape(-1) - self.ra + 12.) % 24. - 12., 0.))
+            ra = convert.haUTC2ra(ha[:,0], self.times[0], 70.7366)
+            self.assertTrue(np.allclose((ra - self.ra + 12.) % 24. - 12., 0.))
+        
+        def test_transitTime(self):
+            transits = self.site.transitTime(self.ra, self.times[:2])
+            self.assertEqual(transits.shape, (4, 2))
+            
+            ha = self.site.hourAngle(self.ra, transits.datetime64.reshape(-1))
+            diagonal = ha.reshape(4, 4, 2)[range(4), range(4)]
+            self.assertTrue(np.all(np.abs(diagonal) < 1E-6))
+            
+            days = convert.jdDifference(transits.twoPartJD, self.times[:2].twoPartJD)
+            self.assertTrue(np.all((days >= 0) & (days < 1)))
+            
+            transit = convert.ra2transitTime(5.5, self.times[0], 70.7366)
+            self.assertTrue(isinstance(transit, astrodatetime))
+            self.assertEqual(transit, transits[1][0])
+            
+            # A scalar RA at an array of times gives a transit for each time
+            transits = convert.ra2transitTime(5.5, self.times[:3], 70.7366)
+            self.assertEqual(transits.shape, (3,))
+            self.assertTrue(np.all(transits.datetime64 == self.site.transitTime(5.5, self.times[:3]).datetime64))
+    
+        def test_altAz(self):
+            ra = np.random.uniform(0., 360., 50)
+            dec = np.random.uniform(-90., 90., 50)
+            times = AstroTimeArray.fromJD(2455893.5 + np.arange(30) / 48.)
+            (alt, az) = self.site.altAz(ra, dec, times)
+            self.assertEqual(alt.shape, (50, 30))
+            self.assertTrue(np.all((az >= 0.) & (az < 360.)))
+            
+            # The previous formulae, with the azimuth from acos
+            lat = np.radians(self.site.latitude.degrees)
+            ha = np.radians(self.site.hourAngle(ra, times, raUnits="degrees") * 15.)
+            sinDec = np.sin(np.radians(dec))[:,np.newaxis]
+            cosDec = np.cos(np.radians(dec))[:,np.newaxis]
+            expectedAlt = np.arcsin(sinDec*np.sin(lat) + cosDec*np.cos(lat)*np.cos(ha))
+            expectedAz = np.degrees(np.arccos((sinDec - np.sin(expectedAlt)*np.sin(lat)) / (np.cos(expectedAlt)*np.cos(lat))))
+            expectedAz = np.where(np.sin(ha) < 0, expectedAz, 360. - expectedAz)
+            self.assertTrue(np.allclose(alt, np.degrees(expectedAlt), atol=1E-9))
+            self.assertTrue(np.allclose(az, expectedAz, atol=1E-6))
+            
+            # Small blocks and a preallocated output give the same grid
+            out = (np.empty((50, 30)), np.empty((50, 30)))
+            self.site.altAz(np.radians(ra), np.radians(dec), times, units="radians", out=out, maxMemory=16*7)
+            self.assertTrue(np.allclose(np.degrees(out[0]), alt, rtol=0., atol=1E-12))
+            self.assertTrue(np.allclose(np.degrees(out[1]), az, rtol=0., atol=1E-12))
+            
+            (alt1, az1) = convert.raDec2AltAz(ra[3], dec[3], -30.2407, 70.7366, times[7])
+            self.assertAlmostEqual(alt1, alt[3,7], 9)
+            self.assertAlmostEqual(az1, az[3,7], 9)
+            (grid, azGrid) = convert.raDec2AltAzGrid(ra, dec, times.datetime64, -30.2407, 70.7366)
+            self.assertTrue(np.allclose(grid, alt, rtol=0., atol=1E-12))
+            
+            # At a pole the azimuth stays in [0,360)
+            (alt, az) = ObservingSite(0., 0.).altAz([10.], [90.], times)
+            self.assertTrue(np.all((az >= 0.) & (az < 360.)))
+            (alt, az) = ObservingSite(0., 0.).altAz([np.radians(10.)], [np.pi/2], times, units="radians")
+            self.assertTrue(np.all((az >= 0.) & (az < 2*np.pi)))
+        
+        def test_altAz2RaDec(self):
+            ra = np.random.uniform(0., 360., 200)
+            dec = np.random.uniform(-89., 89., 200)
+            times = AstroTimeArray.fromJD(2455893.5 + np.random.uniform(0., 1., 200))
+            (alt, az) = self.site.altAz(ra, dec, times)
+            (alt, az) = (alt[range(200), range(200)], az[range(200), range(200)])
+            
+            (ra2, dec2) = convert.altAz2RaDec(alt, az, -30.2407, 70.7366, times)
+            self.assertTrue(np.allclose((ra2 - ra + 180.) % 360. - 180., 0., rtol=0., atol=1E-8))
+            self.assertTrue(np.allclose(dec2, dec, rtol=0., atol=1E-8))
+            
+            (ra1, dec1) = convert.altAz2RaDec(np.radians(alt[0]), np.radians(az[0]), np.radians(-30.2407), 
+                                              np.radians(70.7366), times[0], units="radians")
+            self.assertAlmostEqual(math.degrees(dec1), dec[0], 8)
+    
+        def test_airmassAndParallacticAngle(self):
+            ra = np.random.uniform(0., 360., 40)
+            dec = np.random.uniform(-90., 30., 40)
+            times = AstroTimeArray.fromJD(2455893.5 + np.arange(25) / 48.)
+            (alt, az, X, q) = self.site.altAz(ra, dec, times, airmassFormula="kasten-young", parallacticAngle=True, maxMemory=16*9)
+            self.assertEqual(X.shape, (40, 25))
+            
+            up = alt >= 0.
+            self.assertTrue(np.all(np.isnan(X[~up])))
+            self.assertTrue(np.allclose(X[up], convert.airmass(alt[up], formula="kasten-young"), rtol=1E-12))
+            self.assertTrue(np.all(X[up] <= 1. / np.sin(np.radians(alt[up]))))
+            self.assertAlmostEqual(convert.airmass(30.), 2., 12)
+            self.assertAlmostEqual(convert.airmass(math.pi / 2, formula="kasten-young", units="radians"), 1., 3)
+            self.assertRaises(ValueError, convert.airmass, 30., formula="bad")
+            
+            X2 = np.empty((40, 25))
+            self.site.airmass(ra, dec, times, out=X2)
+            self.assertTrue(np.allclose(X2[up], 1. / np.sin(np.radians(alt[up])), rtol=1E-12))
+            
+            # The parallactic angle from the hour angle
+            lat = np.radians(self.site.latitude.degrees)
+            ha = np.radians(self.site.hourAngle(ra, times, raUnits="degrees") * 15.)
+            decRad = np.radians(dec)[:,np.newaxis]
+            expected = np.degrees(np.arctan2(np.sin(ha), np.tan(lat)*np.cos(decRad) - np.sin(decRad)*np.cos(ha)))
+            self.assertTrue(np.allclose(q, expected, rtol=0., atol=1E-9))
+            self.assertTrue(np.all(np.sign(q) == np.sign(ha)))
+            q2 = self.site.parallacticAngle(np.radians(ra), np.radians(dec), times, units="radians")
+            self.assertTrue(np.allclose(np.degrees(q2), q, rtol=0., atol=1E-12))
+        
+        def test_riseTransitSet(self):
+            ra = np.array([10., 200., 120., 300.])
+            dec = np.array([-20., 15., -80., 70.])
+            midnights = AstroTimeArray.fromJD(2455893.5 + np.arange(3) + 70.7366 / 360.)
+            (rise, transit, set, circumpolar, neverRises) = self.site.riseTransitSet(ra, dec, midnights, altitude=10.)
+            self.assertEqual(rise.shape, (4, 3))
+            self.assertEqual(list(circumpolar), [False, False, True, False])
+            self.assertEqual(list(neverRises), [False, False, False, True])
+            
+            ha = self.site.hourAngle(ra, transit.datetime64.reshape(-1), raUnits="degrees").reshape(4, 4, 3)
+            self.assertTrue(np.all(np.abs(ha[range(4), range(4)]) < 1E-6))
+            self.assertTrue(np.all(np.abs(convert.jdDifference(transit.twoPartJD, midnights.twoPartJD)) <= 0.5))
+            
+            for times in (rise, set):
+                alt = self.site.altAz(ra[:2], dec[:2], times[:2].datetime64.reshape(-1))[0].reshape(2, 2, 3)
+                self.assertTrue(np.allclose(alt[range(2), range(2)], 10., rtol=0., atol=1E-6))
+                self.assertTrue(np.all(np.isnat(times.datetime64[2:])))
+                self.assertTrue(times[2,0] is None)
+            self.assertTrue(np.all(rise.datetime64[:2] < transit.datetime64[:2]))
+            self.assertTrue(np.all(set.datetime64[:2] > transit.datetime64[:2]))
+            
+            (rise1, transit1, set1, circumpolar1, neverRises1) = convert.raDec2RiseTransitSet(ra[1], dec[1], midnights[0], 
+                                                                                              -30.2407, 70.7366, altitude=10.)
+            self.assertEqual(transit1[0], transit[1,0])
+            self.assertEqual(set1[0], set[1,0])
+    
+    unittest.main()
@@ -0,0 +1,475 @@
+# -*- coding: utf-8 -*-
+
+""" apwlib
+    ------
+    
+    Copyright (C) 2012 Adrian Price-Whelan
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+################################################################################
+# readers.py - Streaming readers for text files of coordinates.
+#
+#   Files are read in blocks of a fixed number of lines, and each block is parsed
+#   with the array parsers in convert, so memory use doesn't grow with the size of
+#   the file and the caller can start working on the first block right away.
+#   readRADecFile instead parses a whole file at once by splitting it into byte
+#   ranges that are parsed in parallel by a pool of worker processes.
+#
+
+__author__ = 'Adrian Price-Whelan <adrn@astro.columbia.edu>'
+__all__ = ["iterRADecFile", "readRADecFile"]
+
+# Standard library dependencies
+import os, math
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+from itertools import islice
+
+# Third-party
+import numpy as np
+
+# Project Dependencies
+import convert
+from custom_errors import *
+
+# Each worker process gets this many byte ranges of a file on average, so one slow
+#   range doesn't leave the other workers idle at the end
+_shardsPerProcess = 4
+
+# The (ra, dec, valid) arrays that the workers of readRADecFile write into when 
+#   the output is in shared memory, set in each worker by _setSharedOutput
+_sharedOutput = None
+
+def _columnStrings(fields, column):
+    """ Returns the string in `column` of a list of fields, joining the fields with 
+        colons if `column` is a sequence of columns (e.g. h, m and s in separate 
+        columns), or None if the line is too short.
+    """
+    try:
+        if isinstance(column, int):
+            return fields[column]
+        return ":".join([fields[ii] for ii in column])
+    except IndexError:
+        return None
+
+def _parseColumn(strings, units):
+    """ Parses an array of strings in 'hours' or 'degrees' into radians, 
+        returning (radians, valid).
+    """
+    unit = convert.resolveUnits(units)
+    if unit.parseArray is None:
+        raise IllegalUnitsError(units)
+    
+    (values, valid) = unit.parseArray(strings, returnMask=True)
+    return (unit.toRadiansArray(values), valid)
+
+def _splitLine(line, comments, delimiter):
+    """ Strips the comment from a line and splits it into fields, returning None 
+        if nothing is left.
+    """
+    if comments:
+        line = line.split(comments, 1)[0]
+    fields = line.split(delimiter)
+    if len(fields) == 0 or (len(fields) == 1 and not fields[0].strip()):
+        return None
+    
+    if delimiter is not None:
+        fields = [field.strip() for field in fields]
+    return fields
+
+def _parseLines(block, lineNumber, raColumn, decColumn, delimiter, comments, raUnits, decUnits):
+    """ Parses a list of lines, the first of which follows line number `lineNumber`, 
+        returning (ra, dec, valid, lineNumbers) with the invalid rows set to NaN, 
+        or None if the lines hold no data.
+    """
+    raStrings = []
+    decStrings = []
+    lineNumbers = []
+    for line in block:
+        lineNumber += 1
+        fields = _splitLine(line, comments, delimiter)
+        if fields is None:
+            continue
+        
+        raStrings.append(_columnStrings(fields, raColumn))
+        if decColumn is not None:
+            decStrings.append(_columnStrings(fields, decColumn))
+        lineNumbers.append(lineNumber)
+    
+    if len(lineNumbers) == 0:
+        return None
+    
+    # Lines that are too short are parsed as empty strings, which are invalid
+    raStrings = convert._asStringArray([x if x is not None else "" for x in raStrings])[0]
+    if decColumn is None:
+        (ra, dec, valid) = convert.parseRADecStringArray(raStrings, returnMask=True)
+    else:
+        decStrings = convert._asStringArray([x if x is not None else "" for x in decStrings])[0]
+        (ra, raValid) = _parseColumn(raStrings, raUnits)
+        (dec, decValid) = _parseColumn(decStrings, decUnits)
+        valid = raValid & decValid
+        ra[~valid] = np.nan
+        dec[~valid] = np.nan
+    
+    return (ra, dec, valid, lineNumbers)
+
+def iterRADecFile(f, raColumn=0, decColumn=1, delimiter=None, comments="#", chunkSize=100000, 
+                  raUnits="hours", decUnits="degrees", returnMask=False):
+    """ Reads a whitespace or delimiter separated text file of RA and Dec values 
+        (e.g. '03:14:15.9 +26:37:10.11' or '03 14 15.9 +26 37 10.11') in blocks 
+        of at most `chunkSize` lines, yielding arrays of RA and Dec in radians for
+        each block.
+        
+        The values are parsed as by `convert.parseHours` and `convert.parseDegrees` 
+        (or `convert.parseRADecString` if `decColumn` is None), see: 
+        convert.parseHoursArray.
+        
+        Parameters
+        ----------
+        f : str, file
+            The name of the file, or an open file or other iterable of lines
+        raColumn : int, tuple
+            The index of the column of RA values. If a tuple of indices, the columns
+            are joined with colons, e.g. (0,1,2) for hours, minutes and seconds in 
+            separate columns. If `decColumn` is None, this column holds strings 
+            with both the RA and Dec, e.g. J2000 IAU designations.
+        decColumn : int, tuple, None
+            The index or indices of the column of Dec values, see `raColumn`
+        delimiter : str
+            The string that separates columns, e.g. ','. If None (default), columns 
+            are separated by any whitespace. Quoted fields are not supported.
+        comments : str
+            Everything after this string on a line is ignored, and lines that are
+            then empty are skipped.
+        chunkSize : int
+            The number of lines read and parsed at a time
+        raUnits : {'hours', 'degrees'}
+        decUnits : {'hours', 'degrees'}
+            The units of the RA and Dec values, if they are numbers
+        returnMask : bool
+            If False (default), a ValueError is raised for the first line that
+            can't be parsed. If True, those rows are set to NaN instead and a 
+            boolean array that is True for the rows that were parsed is yielded as
+            a third element.
+        
+        Yields tuples (ra, dec) (or (ra, dec, valid)) of float64 arrays in radians.
+    """
+    if isinstance(f, basestring):
+        with open(f) as fileObj:
+            for block in iterRADecFile(fileObj, raColumn, decColumn, delimiter, comments, chunkSize, raUnits, decUnits, returnMask):
+                yield block
+        return
+    
+    if chunkSize < 1:
+        raise ValueError("iterRADecFile: chunkSize must be positive ({0}).".format(chunkSize))
+    
+    lines = iter(f)
+    lineNumber = 0
+    while True:
+        block = list(islice(lines, chunkSize))
+        if len(block) == 0:
+            return
+        
+        parsed = _parseLines(block, lineNumber, raColumn, decColumn, delimiter, comments, raUnits, decUnits)
+        lineNumber += len(block)
+        if parsed is None:
+            continue
+        
+        (ra, dec, valid, lineNumbers) = parsed
+        if returnMask:
+            yield (ra, dec, valid)
+        else:
+            if not np.all(valid):
+                raise ValueError("iterRADecFile: couldn't parse an RA and Dec on line {0}.".format(lineNumbers[np.argmin(valid)]))
+            yield (ra, dec)
+
+def _shardRanges(filename, shards):
+    """ Splits a file into at most `shards` byte ranges (start, stop) of about the 
+        same size, each starting at the beginning of a line.
+    """
+    size = os.path.getsize(filename)
+    starts = [0]
+    with open(filename, "rb") as f:
+        for ii in range(1, shards):
+            offset = size * ii // shards
+            if offset <= starts[-1]:
+                continue
+            
+            # Skip to the end of the line that the byte before the offset is on
+            f.seek(offset - 1)
+            f.readline()
+            if starts[-1] < f.tell() < size:
+                starts.append(f.tell())
+    
+    return zip(starts, starts[1:] + [size])
+
+def _readShard(filename, start, stop):
+    """ Returns the lines in a byte range of a file, and the number of newlines. """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    return (data.split("\n"), data.count("\n"))
+
+def _countShard(shard):
+    """ Returns the number of lines with data in a byte range of a file. """
+    (filename, start, stop, chunkSize, options) = shard
+    (lines, lineCount) = _readShard(filename, start, stop)
+    return sum([1 for line in lines if _splitLine(line, options["comments"], options["delimiter"]) is not None])
+
+def _parseShard(shard):
+    """ Parses a byte range of a file, returning (ra, dec, valid, badLine, lineCount)
+        where `badLine` is the first line that couldn't be parsed (counting from the
+        start of the range) or 0 if there isn't one.
+    """
+    (filename, start, stop, chunkSize, options) = shard
+    (lines, lineCount) = _readShard(filename, start, stop)
+    
+    blocks = []
+    for first in range(0, len(lines), chunkSize):
+        parsed = _parseLines(lines[first:first+chunkSize], first, **options)
+        if parsed is not None:
+            blocks.append(parsed)
+    
+    if len(blocks) == 0:
+        return (np.empty(0), np.empty(0), np.empty(0, dtype=bool), 0, lineCount)
+    
+    (ra, dec, valid, lineNumbers) = [np.concatenate(x) for x in zip(*blocks)]
+    badLine = 0 if np.all(valid) else lineNumbers[np.argmin(valid)]
+    return (ra, dec, valid, badLine, lineCount)
+
+def _parseShardShared(args):
+    """ Parses a byte range of a file into the shared output arrays starting at 
+        row `offset`, returning (badLine, lineCount), see: _parseShard.
+    """
+    (offset, shard) = args
+    (ra, dec, valid, badLine, lineCount) = _parseShard(shard)
+    
+    (sharedRA, sharedDec, sharedValid) = _sharedOutput
+    sharedRA[offset:offset+len(ra)] = ra
+    sharedDec[offset:offset+len(ra)] = dec
+    sharedValid[offset:offset+len(ra)] = valid
+    return (badLine, lineCount)
+
+def _sharedArrays(buffers):
+    """ Returns float64, float64 and boolean array views of (ra, dec, valid) buffers. """
+    (ra, dec, valid) = buffers
+    if len(ra) == 0:
+        return (np.empty(0), np.empty(0), np.empty(0, dtype=bool))
+    return (np.frombuffer(ra, dtype=np.float64), np.frombuffer(dec, dtype=np.float64), 
+            np.frombuffer(valid, dtype=np.bool_))
+
+def _setSharedOutput(buffers):
+    """ Sets (or clears, if None) the shared output arrays of this process. """
+    global _sharedOutput
+    _sharedOutput = None if buffers is None else _sharedArrays(buffers)
+
+def _mapShards(function, shards, processes, sharedOutput=None):
+    """ Maps `function` over a list of shards in order in a pool of `processes` 
+        worker processes, which can write into the buffers `sharedOutput`.
+    """
+    if processes == 1:
+        _setSharedOutput(sharedOutput)
+        try:
+            return map(function, shards)
+        finally:
+            _setSharedOutput(None)
+    
+    pool = multiprocessing.Pool(processes, _setSharedOutput, (sharedOutput,))
+    try:
+        return pool.map(function, shards, chunksize=1)
+    finally:
+        pool.terminate()
+        pool.join()
+
+def readRADecFile(filename, raColumn=0, decColumn=1, delimiter=None, comments="#", processes=None, 
+                  sharedMemory=False, raUnits="hours", decUnits="degrees", returnMask=False, chunkSize=100000):
+    """ Reads a whole text file of RA and Dec values in parallel, returning arrays 
+        of RA and Dec in radians for all of the lines with data, in file order.
+        
+        The file is split into byte ranges that start at the beginning of a line, 
+        and each range is parsed by a pool of worker processes as by 
+        `iterRADecFile`, so the time to parse a large file scales down with the 
+        number of cores. The results are copied into preallocated output arrays 
+        in order.
+        
+        Parameters
+        ----------
+        filename : str
+            The name of the file. Unlike iterRADecFile, this can't be a file object
+            because each worker opens the file and seeks to its range.
+        raColumn, decColumn, delimiter, comments, raUnits, decUnits, returnMask
+            See: iterRADecFile
+        processes : int
+            The number of worker processes, by default the number of cores. If 1, 
+            the file is parsed in this process.
+        sharedMemory : bool
+            If True, the rows with data are first counted so the output arrays can 
+            be allocated in shared memory, and the workers write their rows into 
+            them directly rather than sending them back to this process. The 
+            returned arrays are views of `multiprocessing.RawArray`s, so they can 
+            be handed to other worker processes without being copied.
+        chunkSize : int
+            The number of lines each worker parses at a time
+        
+        Returns a tuple (ra, dec) (or (ra, dec, valid)) of float64 arrays in radians.
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if processes < 1:
+        raise ValueError("readRADecFile: processes must be positive ({0}).".format(processes))
+    if chunkSize < 1:
+        raise ValueError("readRADecFile: chunkSize must be positive ({0}).".format(chunkSize))
+    
+    # Check the units here so the error isn't raised in a worker
+    if decColumn is not None:
+        for units in (raUnits, decUnits):
+            if convert.resolveUnits(units).parseArray is None:
+                raise IllegalUnitsError(units)
+    
+    options = dict(raColumn=raColumn, decColumn=decColumn, delimiter=delimiter, comments=comments, 
+                   raUnits=raUnits, decUnits=decUnits)
+    shards = [(filename, start, stop, chunkSize, options) 
+              for (start, stop) in _shardRanges(filename, processes*_shardsPerProcess)]
+    
+    if sharedMemory:
+        offsets = [0]
+        for count in _mapShards(_countShard, shards, processes):
+            offsets.append(offsets[-1] + count)
+        
+        buffers = (RawArray("d", offsets[-1]), RawArray("d", offsets[-1]), RawArray("b", offsets[-1]))
+        badLines = _mapShards(_parseShardShared, zip(offsets[:-1], shards), processes, buffers)
+        (ra, dec, valid) = _sharedArrays(buffers)
+    else:
+        results = _mapShards(_parseShard, shards, processes)
+        total = sum([len(result[0]) for result in results])
+        ra = np.empty(total)
+        dec = np.empty(total)
+        valid = np.empty(total, dtype=bool)
+        
+        offset = 0
+        badLines = []
+        for result in results:
+            (shardRA, shardDec, shardValid, badLine, lineCount) = result
+            ra[offset:offset+len(shardRA)] = shardRA
+            dec[offset:offset+len(shardRA)] = shardDec
+            valid[offset:offset+len(shardRA)] = shardValid
+            offset += len(shardRA)
+            badLines.append((badLine, lineCount))
+        del results
+    
+    if returnMask:
+        return (ra, dec, valid)
+    
+    lineOffset = 0
+    for (badLine, lineCount) in badLines:
+        if badLine:
+            raise ValueError("readRADecFile: couldn't parse an RA and Dec on line {0}.".format(lineOffset + badLine))
+        lineOffset += lineCount
+    
+    return (ra, dec)
+
+if __name__ == "__main__":
+    import unittest
+    import tempfile
+    from StringIO import StringIO
+    
+    class TestIterRADecFile(unittest.TestCase):
+        
+        def test_blocks(self):
+            ra = np.random.uniform(0., 24., 250)
+            dec = np.random.uniform(-90., 90., 250)
+            raStrings = convert.hoursToStringArray(ra, precision=4, sep=":")
+            decStrings = convert.degreesToStringArray(dec, precision=3, sep=":")
+            
+            lines = ["# RA Dec", ""] + ["{0} {1} # comment".format(r, d) for r, d in zip(raStrings, decStrings)]
+            blocks = list(iterRADecFile(StringIO("\n".join(lines)), chunkSize=100))
+            self.assertEqual([len(r) for r, d in blocks], [98, 100, 52])
+            
+            parsedRA = np.concatenate([r for r, d in blocks])
+            parsedDec = np.concatenate([d for r, d in blocks])
+            for ii in range(len(ra)):
+                self.assertEqual(parsedRA[ii], convert.hoursToRadians(convert.parseHours(raStrings[ii])))
+                self.assertEqual(parsedDec[ii], convert.degreesToRadians(convert.parseDegrees(decStrings[ii])))
+        
+        def test_columns(self):
+            lines = ["id,h,m,s,dec,mag", "a,03,14,15.9,+26:37:10.11,12.", "b,12,04,12.1,-00:12:03.5,13.",
+                     "c,23,59,59.99,bad,14.", "d,01,02"]
+            
+            (ra, dec, valid) = list(iterRADecFile(lines[1:], raColumn=(1,2,3), decColumn=4, delimiter=",", returnMask=True))[0]
+            self.assertEqual(list(valid), [True, True, False, False])
+            self.assertEqual(ra[1], convert.hoursToRadians(convert.parseHours("12:04:12.1")))
+            self.assertAlmostEqual(dec[1], math.radians(-(12/60. + 3.5/3600.)), 15)
+            self.assertTrue(np.isnan(ra[2]) and np.isnan(dec[3]))
+            
+            self.assertRaises(ValueError, list, iterRADecFile(lines[1:], raColumn=(1,2,3), decColumn=4, delimiter=","))
+            
+            malformed = ["03:14:15.9,+26:37:10.11", "12:30:1.2.3,+26:37:10.11", "12:30:45.5,-10 20 3.4.5"]
+            (ra, dec, valid) = list(iterRADecFile(malformed, delimiter=",", returnMask=True))[0]
+            self.assertEqual(list(valid), [True, False, False])
+            self.assertRaisesRegexp(ValueError, "line 2", list, iterRADecFile(malformed, delimiter=","))
+            
+            (ra, dec, valid) = list(iterRADecFile([u"12:00:00 +10:00:00", u"12\xb030 +10:00:00", u"J12\xe9"], returnMask=True))[0]
+            self.assertEqual(list(valid), [True, False, False])
+            
+            (ra, dec) = list(iterRADecFile(["J031415.90+263710.1 5.", "J120412.10-001203.5 6."], decColumn=None))[0]
+            (ra2, dec2) = convert.parseRADecStringArray(["J031415.90+263710.1", "J120412.10-001203.5"])
+            self.assertTrue(np.all(ra == ra2) and np.all(dec == dec2))
+            
+            (ra, dec) = list(iterRADecFile(["53.566 26.6195", "181.05 -0.2"], raUnits="degrees"))[0]
+            self.assertTrue(np.allclose(np.degrees(ra), [53.566, 181.05]))
+
+    class TestReadRADecFile(unittest.TestCase):
+
+        def setUp(self):
+            ra = np.random.uniform(0., 24., 1000)
+            dec = np.random.uniform(-90., 90., 1000)
+            lines = ["{0} {1}".format(r, d) for r, d in zip(convert.hoursToStringArray(ra, precision=4, sep=":"),
+                                                             convert.degreesToStringArray(dec, precision=3, sep=":"))]
+            lines[10] = "# comment"
+            lines[500] = ""
+
+            (fd, self.filename) = tempfile.mkstemp()
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines))
+
+        def tearDown(self):
+            os.remove(self.filename)
+
+        def test_order(self):
+            (ra, dec) = [np.concatenate(x) for x in zip(*iterRADecFile(self.filename, chunkSize=300))]
+            self.assertEqual(len(ra), 998)
+
+            for processes in [1, 3]:
+                for sharedMemory in [False, True]:
+                    (parsedRA, parsedDec) = readRADecFile(self.filename, processes=processes, sharedMemory=sharedMemory, chunkSize=100)
+                    self.assertTrue(np.all(parsedRA == ra) and np.all(parsedDec == dec))
+
+        def test_errors(self):
+            with open(self.filename, "a") as f:
+                f.write("\n12:00:00 bad\n01:00:00 +10:00:00\n")
+
+            for sharedMemory in [False, True]:
+                try:
+                    readRADecFile(self.filename, processes=2, sharedMemory=sharedMemory)
+                    self.fail("readRADecFile didn't raise a ValueError")
+                except ValueError as e:
+                    self.assertTrue("line 1001" in str(e))
+
+                (ra, dec, valid) = readRADecFile(self.filename, processes=2, sharedMemory=sharedMemory, returnMask=True)
+                self.assertEqual(len(valid), 1000)
+                self.assertEqual(list(np.where(~valid)[0]), [998])
+
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""
+Compares computing the airmass and parallactic angle of a (targets, times) grid
+in separate passes (the altitudes from raDec2AltAzGrid, then convert.airmass,
+then the parallactic angle from the hour angles) against computing them in the
+same pass as the altitudes and azimuths with raDec2AltAzGrid.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+nTargets = 5000
+nTimes = 600
+ra = np.random.uniform(0., 360., nTargets)
+dec = np.random.uniform(-90., 90., nTargets)
+jd = 2455893.5 + np.arange(nTimes) / 1440.
+latitude = -30.2407
+longitude = 70.7366
+
+def separatePasses(formula):
+    (alt, az) = convert.raDec2AltAzGrid(ra, dec, jd, latitude, longitude)
+    X = convert.airmass(alt, formula=formula)
+
+    ha = np.radians(convert.jdToLST(jd, longitude) * 15.) - np.radians(ra)[:,np.newaxis]
+    lat = np.radians(latitude)
+    decRad = np.radians(dec)[:,np.newaxis]
+    q = np.degrees(np.arctan2(np.sin(ha), np.tan(lat)*np.cos(decRad) - np.sin(decRad)*np.cos(ha)))
+    return (alt, az, X, q)
+
+print "Alt/Az, airmass and parallactic angle for {0} targets x {1} times, per cell (nanoseconds):".format(nTargets, nTimes)
+out = tuple(np.empty((nTargets, nTimes)) for ii in range(4))
+for formula in ["plane-parallel", "kasten-young"]:
+    expected = separatePasses(formula)
+    result = convert.raDec2AltAzGrid(ra, dec, jd, latitude, longitude, out=out, airmassFormula=formula, parallacticAngle=True)
+    assert np.allclose(result[2], expected[2], rtol=1E-12, equal_nan=True)
+    assert np.allclose(result[3], expected[3], rtol=0., atol=1E-9)
+
+    baseline = best(lambda: separatePasses(formula)) / (nTargets * nTimes)
+    t = best(lambda: convert.raDec2AltAzGrid(ra, dec, jd, latitude, longitude, out=out, airmassFormula=formula,
+                                             parallacticAngle=True)) / (nTargets * nTimes)
+    print "\t{0}, separate passes: {1:0.1f}".format(formula, baseline * 1E9)
+    print "\t{0}, raDec2AltAzGrid: {1:0.1f} ({2:0.1f}x faster)".format(formula, t * 1E9, baseline / t)
+
+t = best(lambda: convert.raDec2AltAzGrid(ra, dec, jd, latitude, longitude, out=out[:2])) / (nTargets * nTimes)
+print "\tAlt/Az alone: {0:0.1f}".format(t * 1E9)
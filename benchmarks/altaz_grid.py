@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Compares computing altitudes and azimuths one target and time at a time with the
+scalar formulae against convert.raDec2AltAzGrid on a (targets, times) grid, with
+a few limits on the memory used for temporary arrays.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import math
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+def scalarAltAz(ra, dec, latitude, lst):
+    """ The formulae of the previous scalar raDec2AltAz, in degrees """
+    ha = lst - ra
+    alt = math.asin(math.sin(math.radians(dec))*math.sin(math.radians(latitude)) + \
+        math.cos(math.radians(dec))*math.cos(math.radians(latitude))*math.cos(math.radians(ha)))
+    cosAz = (math.sin(math.radians(dec)) - math.sin(alt)*math.sin(math.radians(latitude))) / \
+        (math.cos(alt) * math.cos(math.radians(latitude)))
+    az = math.degrees(math.acos(max(-1., min(1., cosAz))))
+    if math.sin(math.radians(ha)) < 0:
+        return math.degrees(alt), az
+    return math.degrees(alt), 360. - az
+
+nTargets = 5000
+nTimes = 600
+ra = np.random.uniform(0., 360., nTargets)
+dec = np.random.uniform(-90., 90., nTargets)
+jd = 2455893.5 + np.arange(nTimes) / 1440.
+latitude = -30.2407
+longitude = 70.7366
+
+lst = convert.jdToLST(jd, longitude) * 15.
+N = 20000
+baseline = best(lambda: [scalarAltAz(ra[ii % nTargets], dec[ii % nTargets], latitude, lst[ii % nTimes]) for ii in range(N)], repeat=1) / N
+
+print "Alt/Az for {0} targets x {1} times, per cell (nanoseconds):".format(nTargets, nTimes)
+print "\tscalar formulae: {0:0.1f}".format(baseline * 1E9)
+out = (np.empty((nTargets, nTimes)), np.empty((nTargets, nTimes)))
+for maxMemory in [2**20, 2**24, 2**27]:
+    t = best(lambda: convert.raDec2AltAzGrid(ra, dec, jd, latitude, longitude, out=out, maxMemory=maxMemory)) / (nTargets * nTimes)
+    print "\traDec2AltAzGrid, maxMemory={0} MB: {1:0.1f} ({2:0.0f}x faster)".format(maxMemory / 2**20, t * 1E9, baseline / t)
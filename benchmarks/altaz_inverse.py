@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of convert.altAz2RaDec on a log of Alt/Az samples, each 
+with its own time, against the same formulae evaluated one sample at a time, and
+the round-trip error through convert.raDec2AltAzGrid.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import math
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+def scalarRaDec(alt, az, latitude, lst):
+    """ The inverse formulae one sample at a time, in degrees """
+    (alt, az, latitude) = (math.radians(alt), math.radians(az), math.radians(latitude))
+    dec = math.asin(math.sin(alt)*math.sin(latitude) + math.cos(alt)*math.cos(latitude)*math.cos(az))
+    ha = math.atan2(-math.cos(alt)*math.sin(az), math.sin(alt)*math.cos(latitude) - math.cos(alt)*math.sin(latitude)*math.cos(az))
+    return ((lst - math.degrees(ha)) % 360., math.degrees(dec))
+
+N = 1000000
+latitude = -30.2407
+longitude = 70.7366
+alt = np.random.uniform(10., 90., N)
+az = np.random.uniform(0., 360., N)
+jd = 2455893.5 + np.sort(np.random.uniform(0., 0.5, N))
+
+lst = convert.jdToLST(jd, longitude) * 15.
+M = 20000
+baseline = best(lambda: [scalarRaDec(alt[ii], az[ii], latitude, lst[ii]) for ii in range(M)], repeat=1) / M
+
+print "altAz2RaDec on {0} samples, per sample (nanoseconds):".format(N)
+print "\tscalar formulae: {0:0.1f}".format(baseline * 1E9)
+t = best(lambda: convert.altAz2RaDec(alt, az, latitude, longitude, jd)) / N
+print "\taltAz2RaDec: {0:0.1f} ({1:0.0f}x faster, {2:0.1f} million samples per second)".format(t * 1E9, baseline / t, 1E-6 / t)
+
+(ra, dec) = convert.altAz2RaDec(alt, az, latitude, longitude, jd)
+K = 2000
+(alt2, az2) = convert.raDec2AltAzGrid(ra[:K], dec[:K], jd[:K], latitude, longitude)
+(alt2, az2) = (alt2[range(K), range(K)], az2[range(K), range(K)])
+print "Round trip through raDec2AltAzGrid on {0} samples, largest error (arcseconds):".format(K)
+print "\talt: {0:0.2e}, az * cos(alt): {1:0.2e}".format(np.max(np.abs(alt2 - alt[:K])) * 3600, 
+                                                         np.max(np.abs((az2 - az[:K] + 180.) % 360. - 180.) * np.cos(np.radians(alt[:K]))) * 3600)
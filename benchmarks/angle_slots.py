@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+Compares the memory footprint and property access speed of the slotted, caching
+geometry.Angle against a dict-backed Angle that recomputes its derived values on
+every access (the previous implementation).
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import math
+import timeit
+
+from apwlib import convert
+from apwlib.geometry import Angle
+
+class DictAngle(object):
+    """ The dict-backed Angle, stripped down to the attributes being compared. """
+    def __init__(self, angle, units):
+        if units.lower() == "radians":
+            self.radians = float(angle)
+    
+    def __repr__(self):
+        return "<{2}: {0} degrees ({1})>".format(math.degrees(self.radians), convert.degreesToString(self.degrees), type(self).__name__)
+    
+    @property
+    def degrees(self):
+        return math.degrees(self.radians)
+    
+    @property
+    def hours(self):
+        return convert.radiansToHours(self.radians)
+    
+    @property
+    def hms(self):
+        return convert.hoursToHMS(convert.radiansToHours(self.radians))
+
+def sizeof(obj):
+    """ Bytes held by an instance, including its __dict__ if it has one. """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+N = 100000
+number = 5
+
+angle = Angle.fromRadians(1.2345)
+dictAngle = DictAngle(1.2345, units="radians")
+
+print "Bytes per instance (excluding the float value):"
+print "\tdict-backed Angle: {0}".format(sizeof(dictAngle))
+print "\tslotted Angle: {0}".format(sizeof(angle))
+print
+
+print "Construction of {0} instances (seconds):".format(N)
+print "\tdict-backed Angle: {0:0.4f}".format(min(timeit.repeat(lambda: [DictAngle(x, units="radians") for x in xrange(N)], number=1, repeat=number)))
+print "\tslotted Angle: {0:0.4f}".format(min(timeit.repeat(lambda: [Angle.fromRadians(x) for x in xrange(N)], number=1, repeat=number)))
+print
+
+for attr in ["degrees", "hours", "hms"]:
+    print "Repeated access of .{0} ({1} calls, seconds):".format(attr, N)
+    print "\tdict-backed Angle: {0:0.4f}".format(min(timeit.repeat(lambda: getattr(dictAngle, attr), number=N, repeat=number)))
+    print "\tslotted Angle: {0:0.4f}".format(min(timeit.repeat(lambda: getattr(angle, attr), number=N, repeat=number)))
+    print
+
+print "Repeated repr() ({0} calls, seconds):".format(N)
+print "\tdict-backed Angle: {0:0.4f}".format(min(timeit.repeat(lambda: repr(dictAngle), number=N, repeat=number)))
+print "\tslotted Angle: {0:0.4f}".format(min(timeit.repeat(lambda: repr(angle), number=N, repeat=number)))
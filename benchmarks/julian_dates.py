@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+"""
+Compares converting calendar dates to Julian Dates and Julian Dates back to
+datetimes one at a time with convert.ymdToJD and convert.jdToDatetime, against
+the array versions convert.ymdToJDArray and convert.jdToDatetimeArray.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+N = 100000
+years = np.random.randint(1900, 2100, N)
+months = np.random.randint(1, 13, N)
+days = np.random.uniform(1., 29., N)
+jds = convert.ymdToJDArray(years, months, days)
+
+scalarYears = [int(x) for x in years]
+scalarMonths = [int(x) for x in months]
+scalarDays = [float(x) for x in days]
+scalarJDs = [float(x) for x in jds]
+
+assert np.all(jds == [convert.ymdToJD(*x) for x in zip(scalarYears, scalarMonths, scalarDays)])
+
+print "Converting {0} dates, per value (microseconds):".format(N)
+baseline = best(lambda: [convert.ymdToJD(*x) for x in zip(scalarYears, scalarMonths, scalarDays)])
+t = best(lambda: convert.ymdToJDArray(years, months, days))
+print "\tymdToJD: {0:0.3f}".format(baseline / N * 1E6)
+print "\tymdToJDArray: {0:0.3f} ({1:0.1f}x faster)".format(t / N * 1E6, baseline / t)
+
+baseline = best(lambda: [convert.jdToDatetime(x) for x in scalarJDs], repeat=1)
+t = best(lambda: convert.jdToDatetimeArray(jds))
+print "\tjdToDatetime: {0:0.3f}".format(baseline / N * 1E6)
+print "\tjdToDatetimeArray: {0:0.3f} ({1:0.1f}x faster)".format(t / N * 1E6, baseline / t)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Times reading a large text file of RA and Dec strings with readers.iterRADecFile
+in this process, and with readers.readRADecFile using 1, 2, 4, ... worker
+processes (up to the number of cores), with the output returned through the
+pool and in shared memory.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+from apwlib import convert
+from apwlib.readers import iterRADecFile, readRADecFile
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+N = 1000000
+ra = convert.hoursToStringArray(np.random.uniform(0., 24., N), precision=4, sep=":")
+dec = convert.degreesToStringArray(np.random.uniform(-90., 90., N), precision=3, sep=":")
+
+(fd, filename) = tempfile.mkstemp()
+with os.fdopen(fd, "w") as f:
+    for ii in range(N):
+        f.write("{0} {1}\n".format(ra[ii], dec[ii]))
+
+try:
+    (expectedRA, expectedDec) = [np.concatenate(x) for x in zip(*iterRADecFile(filename))]
+    for sharedMemory in [False, True]:
+        (parsedRA, parsedDec) = readRADecFile(filename, processes=2, sharedMemory=sharedMemory)
+        assert np.all(parsedRA == expectedRA) and np.all(parsedDec == expectedDec)
+
+    print "Reading {0} lines of RA and Dec, total (seconds):".format(N)
+    baseline = best(lambda: [block for block in iterRADecFile(filename)])
+    print "\titerRADecFile: {0:0.2f}".format(baseline)
+
+    processes = 1
+    while processes <= multiprocessing.cpu_count():
+        for sharedMemory in [False, True]:
+            t = best(lambda: readRADecFile(filename, processes=processes, sharedMemory=sharedMemory))
+            print "\treadRADecFile, processes={0}, sharedMemory={1}: {2:0.2f} ({3:0.1f}x faster)".format(processes, sharedMemory, t, baseline / t)
+        processes *= 2
+finally:
+    os.remove(filename)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+Compares the per-call latency of convert.parseHours and convert.parseDegrees on 
+strings against the previous implementations, which rebuilt their regular expressions
+on every call and tried float() first, catching the ValueError. The outputs of both
+are checked to be identical first.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import re
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+def legacyParseHours(x, outputHMS=False):
+    """ The string branch of the previous convert.parseHours """
+    x = x.strip()
+    
+    try:
+        parsedHours = float(x)
+        parsedHMS = convert.hoursToHMS(parsedHours)
+    except ValueError:
+        string_parsed = False
+        div = '[:|/|\t|\-|\sHhMmSs]{1,2}'
+        pattr = '^([+-]{0,1}\d{1,2})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$'
+        
+        try:
+            elems = re.search(pattr, x).groups()
+            string_parsed = True
+        except:
+            pass
+        
+        if string_parsed:
+            parsedHours = convert.hmsToHours(elems[0], elems[1], elems[2])
+            parsedHMS = (int(elems[0]), int(elems[1]), float(elems[2]))
+        else:
+            pattr = '^([+-]{0,1}\d{1,2})' + div + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$'
+            try:
+                elems = re.search(pattr, x).groups()
+            except:
+                raise ValueError("convert.parseHours: Invalid input string, can't parse to HMS. ({0})".format(x))
+            
+            m = float(elems[1])
+            s = 60.0 * (int(m) - m)
+            parsedHours = convert.hmsToHours(elems[0], int(m), s)
+            parsedHMS = (int(elems[0]), int(m), s)
+    
+    if outputHMS:
+        return parsedHMS
+    return parsedHours
+
+def legacyParseDegrees(x, outputDMS=False):
+    """ The string branch of the previous convert.parseDegrees """
+    x = x.strip()
+    
+    try:
+        parsedDegrees = float(x)
+        parsedDMS = convert.degreesToDMS(parsedDegrees)
+    except ValueError:
+        string_parsed = False
+        div = '[:|/|\t|\-|\sDdMmSs]{1,2}'
+        pattr = '^([+-]{0,1}\d{1,3})' + div + '(\d{1,2})' + div + '(\d{1,2}[\.0-9]+)' + '[Ss]{0,1}' + '$'
+        
+        try:
+            elems = re.search(pattr, x).groups()
+            string_parsed = True
+        except:
+            pass
+        
+        if string_parsed:
+            parsedDMS = (int(elems[0]), int(elems[1]), float(elems[2]))
+            parsedDegrees = convert.dmsToDegrees(int(elems[0]), int(elems[1]), float(elems[2]))
+        else:
+            pattr = '^([+-]{0,1}\d{1,3})' + div + '(\d{1,2}[\.0-9]*)' + '[Mm]{0,1}' + '$'
+            try:
+                elems = re.search(pattr, x).groups()
+            except:
+                raise ValueError("convert.parseDegrees: Invalid input string! ('{0}')".format(x))
+            
+            m = float(elems[1])
+            s = 60.0 * (int(m) - m)
+            parsedDMS = (int(elems[0]), int(m), s)
+            parsedDegrees = convert.dmsToDegrees(int(elems[0]), int(m), s)
+    
+    if outputDMS:
+        return parsedDMS
+    return parsedDegrees
+
+N = 100000
+hours = np.random.uniform(0., 24., N)
+degrees = np.random.uniform(-90., 90., N)
+
+inputs = dict()
+inputs["hours"] = {"HH:MM:SS.sss" : list(convert.hoursToStringArray(hours, precision=3, sep=":", pad=True)),
+                   "HHhMMmSS.ssss" : list(convert.hoursToStringArray(hours, precision=3, pad=True)),
+                   "HH.dddd" : [str(h) for h in hours]}
+inputs["degrees"] = {"DD:MM:SS.sss" : list(convert.degreesToStringArray(degrees, precision=3, sep=":", pad=True)),
+                     "DD MM SS.sss" : list(convert.degreesToStringArray(degrees, precision=3, sep=" ", pad=True)),
+                     "DD.dddd" : [str(d) for d in degrees]}
+
+def best(func, repeat=3):
+    """ Returns the fastest of `repeat` calls to `func`, in seconds """
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+for name, legacy, current in [("hours", legacyParseHours, convert.parseHours), 
+                              ("degrees", legacyParseDegrees, convert.parseDegrees)]:
+    for shape, strings in sorted(inputs[name].items()):
+        # The previous parser dropped the sign of degrees with a whole part of -0
+        expected = [-legacy(x) if name == "degrees" and re.match("-0+[: ]", x) else legacy(x) for x in strings]
+        assert expected == [current(x) for x in strings]
+        assert [legacy(x, True) for x in strings] == [current(x, True) for x in strings]
+        
+        legacyTime = best(lambda: [legacy(x) for x in strings])
+        currentTime = best(lambda: [current(x) for x in strings])
+        
+        print "Parsing {0} {1} strings ({2}), per call (microseconds):".format(N, name, shape)
+        print "\tprevious: {0:0.2f}".format(legacyTime / N * 1E6)
+        print "\tcurrent: {0:0.2f} ({1:0.1f}x faster)".format(currentTime / N * 1E6, legacyTime / currentTime)
+        print
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""
+Compares finding rise, transit and set times by sampling the altitude of one
+target at a time over a night (at one minute steps, then interpolating) against
+the closed-form ObservingSite.riseTransitSet for many targets and nights at once.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import time
+
+import numpy as np
+
+from apwlib import convert
+from apwlib.observing import ObservingSite
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+site = ObservingSite(70.7366, -30.2407, name="CTIO")
+altitude = 10.
+
+def sampledRiseTransitSet(ra, dec, midnight):
+    """ The rise, transit and set JDs of one target in the day around a midnight,
+        from its altitude every minute.
+    """
+    jd = midnight + np.arange(-720, 721) / 1440.
+    alt = site.altAz(ra, dec, jd)[0]
+    transit = jd[np.argmax(alt)]
+    above = alt >= altitude
+    crossings = np.flatnonzero(above[1:] != above[:-1])
+    (rise, set) = (None, None)
+    for ii in crossings:
+        crossing = jd[ii] + (altitude - alt[ii]) / (alt[ii+1] - alt[ii]) / 1440.
+        if above[ii+1] and crossing < transit:
+            rise = crossing
+        elif not above[ii+1] and crossing > transit and set is None:
+            set = crossing
+    return (rise, transit, set)
+
+nTargets = 2000
+nNights = 365
+ra = np.random.uniform(0., 360., nTargets)
+dec = np.random.uniform(-90., 60., nTargets)
+midnights = 2455893.5 + np.arange(nNights) + 70.7366 / 360.
+
+(rise, transit, set, circumpolar, neverRises) = site.riseTransitSet(ra, dec, midnights, altitude=altitude)
+
+# The closed-form times agree with the sampled ones to the interpolation error
+errors = []
+for ii in np.flatnonzero(~circumpolar & ~neverRises)[:50]:
+    (sampledRise, sampledTransit, sampledSet) = sampledRiseTransitSet(ra[ii], dec[ii], midnights[0])
+    if sampledRise is not None and sampledSet is not None:
+        errors.append(abs(sampledRise - rise[ii:ii+1,:1].jd[0,0]) * 86400)
+        errors.append(abs(sampledSet - set[ii:ii+1,:1].jd[0,0]) * 86400)
+
+N = 200
+baseline = best(lambda: [sampledRiseTransitSet(ra[ii], dec[ii], midnights[0]) for ii in range(N)], repeat=1) / N
+
+print "Rise, transit and set for {0} targets x {1} nights, per target-night (microseconds):".format(nTargets, nNights)
+print "\tsampled altitude: {0:0.1f}".format(baseline * 1E6)
+t = best(lambda: site.riseTransitSet(ra, dec, midnights, altitude=altitude)) / (nTargets * nNights)
+print "\triseTransitSet: {0:0.3f} ({1:0.0f}x faster)".format(t * 1E6, baseline / t)
+print "Largest difference from the sampled rise and set times: {0:0.2f} seconds".format(max(errors))
+print "Circumpolar targets: {0}, never rising targets: {1}".format(circumpolar.sum(), neverRises.sum())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+"""
+Compares formatting an array of angles as sexagesimal strings one value at a time
+(convert.hoursToString / convert.degreesToString) against the bulk formatters
+(convert.hoursToStringArray / convert.degreesToStringArray).
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import time
+
+import numpy as np
+
+from apwlib import convert
+
+N = 200000
+hours = np.random.uniform(0., 24., N)
+degrees = np.random.uniform(-90., 90., N)
+
+def best(func, repeat=3):
+    """ Returns the fastest of `repeat` calls to `func`, in seconds """
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+for name, values, scalar, bulk in [("hours", hours, convert.hoursToString, convert.hoursToStringArray), 
+                                   ("degrees", degrees, convert.degreesToString, convert.degreesToStringArray)]:
+    scalarTime = best(lambda: [scalar(x, precision=3, sep=":", pad=True) for x in values])
+    bulkTime = best(lambda: bulk(values, precision=3, sep=":", pad=True))
+    
+    print "Formatting {0} values in {1} (seconds):".format(N, name)
+    print "\tscalar: {0:0.4f}".format(scalarTime)
+    print "\tbulk: {0:0.4f} ({1:0.1f}x faster)".format(bulkTime, scalarTime / bulkTime)
+    print
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+"""
+Compares computing sidereal times one at a time with astrodatetime.lst against
+convert.jdToGMST and convert.jdToLST on an array of Julian Dates, with and without
+a preallocated output array.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import time
+
+import numpy as np
+
+from apwlib import convert
+from apwlib.astrodatetime import AstroTimeArray
+
+def best(func, repeat=3):
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+N = 10000
+M = 86400 * 30
+jds = 2455893.5 + np.arange(M) / 86400.
+scalarTimes = AstroTimeArray.fromJD(jds[:N])
+scalarTimes = [scalarTimes[ii] for ii in range(N)]
+
+print "Local sidereal time, per value (microseconds):"
+baseline = best(lambda: [dt.lst(-70.5) for dt in scalarTimes], repeat=1)
+print "\tastrodatetime.lst on {0} times: {1:0.3f}".format(N, baseline / N * 1E6)
+
+out = np.empty(M)
+for label, func in [("jdToGMST", lambda: convert.jdToGMST(jds)), 
+                    ("jdToGMST, out=", lambda: convert.jdToGMST(jds, out=out)),
+                    ("jdToLST", lambda: convert.jdToLST(jds, -70.5)),
+                    ("jdToLST, out=", lambda: convert.jdToLST(jds, -70.5, out=out))]:
+    t = best(func) / M
+    print "\t{0} on {1} times: {2:0.3f} ({3:0.0f}x faster)".format(label, M, t * 1E6, baseline / N / t)
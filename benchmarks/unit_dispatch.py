@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""
+Compares creating Angle objects from floats and computing geometry.subtends with
+units given as strings (resolved through the unit registry in convert) and as 
+pre-resolved convert.Unit objects, against the previous string comparison 
+branching.
+"""
+
+import os, sys
+sys.path.append(os.path.join(sys.path[0], ".."))
+
+import math
+import time
+
+import numpy as np
+
+from apwlib import convert
+from apwlib.geometry import Angle, subtends
+
+def previousParseDegrees(x):
+    """ parseDegrees used to split every float into degrees, arcminutes, arcseconds """
+    convert.degreesToDMS(x)
+    return convert.parseDegrees(x)
+
+def previousParseHours(x):
+    """ parseHours used to split every float into hours, minutes, seconds """
+    convert.hoursToHMS(x)
+    return convert.parseHours(x)
+
+class BranchingAngle(Angle):
+    """ An Angle that resolves its units as the previous Angle.__init__ did """
+    
+    __slots__ = ()
+    
+    def __init__(self, angle, units):
+        lowUnits = units.lower()
+        
+        if lowUnits == "degrees":
+            self.radians = math.radians(previousParseDegrees(angle))
+        elif lowUnits == "radians":
+            self.radians = float(angle)
+        elif lowUnits == "hours":
+            self.radians = convert.hoursToRadians(previousParseHours(angle))
+        else:
+            raise ValueError(units)
+
+def branchingSubtends(a1, b1, a2, b2, units="radians"):
+    """ The unit handling of the previous geometry.subtends """
+    if units.lower() == "degrees":
+        (a1, b1, a2, b2) = (math.radians(a1), math.radians(b1), math.radians(a2), math.radians(b2))
+    elif units.lower() == "radians":
+        pass
+    elif units.lower() == "hours":
+        (a1, b1, a2, b2) = [math.radians(previousParseHours(x)*15.) for x in (a1, b1, a2, b2)]
+    
+    x1 = math.cos(a1)*math.cos(b1)
+    y1 = math.sin(a1)*math.cos(b1)
+    z1 = math.sin(b1)
+    x2 = math.cos(a2)*math.cos(b2)
+    y2 = math.sin(a2)*math.cos(b2)
+    z2 = math.sin(b2)
+    
+    if units.lower() == "degrees":
+        return math.degrees(math.acos(x1*x2+y1*y2+z1*z2))
+    elif units.lower() == "radians":
+        return math.acos(x1*x2+y1*y2+z1*z2)
+    elif units.lower() == "hours":
+        return math.degrees(math.acos(x1*x2+y1*y2+z1*z2))/15.
+
+N = 100000
+values = np.random.uniform(0., 90., N).tolist()
+
+def best(func, repeat=3):
+    """ Returns the fastest of `repeat` calls to `func`, in seconds """
+    times = []
+    for ii in range(repeat):
+        t1 = time.time()
+        func()
+        times.append(time.time() - t1)
+    return min(times)
+
+print "Creating {0} Angle objects from floats, per call (microseconds):".format(N)
+baseline = best(lambda: [BranchingAngle(x, "degrees") for x in values])
+print "\tprevious, units='degrees': {0:0.2f}".format(baseline / N * 1E6)
+for label, units in [("units='degrees'", "degrees"), ("units='DEGREES'", "DEGREES"), ("units=convert.DEGREES", convert.DEGREES)]:
+    t = best(lambda: [Angle(x, units) for x in values])
+    print "\t{0}: {1:0.2f} ({2:0.1f}x faster)".format(label, t / N * 1E6, baseline / t)
+print
+
+print "geometry.subtends on {0} pairs of positions, per call (microseconds):".format(N/4)
+for units in ["degrees", "hours"]:
+    v = [x / 15. for x in values] if units == "hours" else values
+    baseline = best(lambda: [branchingSubtends(v[ii], v[ii+1], v[ii+2], v[ii+3], units) for ii in range(0, N, 4)])
+    t = best(lambda: [subtends(v[ii], v[ii+1], v[ii+2], v[ii+3], units) for ii in range(0, N, 4)])
+    unit = convert.resolveUnits(units)
+    tUnit = best(lambda: [subtends(v[ii], v[ii+1], v[ii+2], v[ii+3], unit) for ii in range(0, N, 4)])
+    print "\tprevious, units='{0}': {1:0.2f}".format(units, baseline / N * 4E6)
+    print "\tunits='{0}': {1:0.2f} ({2:0.1f}x faster)".format(units, t / N * 4E6, baseline / t)
+    print "\tunits=convert.{0}: {1:0.2f} ({2:0.1f}x faster)".format(units.upper(), tUnit / N * 4E6, baseline / tUnit)